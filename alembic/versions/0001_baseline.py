@@ -0,0 +1,157 @@
+"""baseline schema
+
+Esquema `gac` tal como lo creaban los modelos antes de introducir
+migraciones (equivalente a `Base.metadata.create_all`). Las tablas e índices
+se crean con `IF NOT EXISTS`, así que en una base existente sin
+`alembic_version` esta revisión no cambia nada y `alembic upgrade head`
+aplica encima el resto de revisiones.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _uuid_pk(name: str) -> sa.Column:
+    return sa.Column(
+        name,
+        postgresql.UUID(as_uuid=True),
+        primary_key=True,
+        server_default=sa.text("gen_random_uuid()"),
+    )
+
+
+def _timestamp(name: str) -> sa.Column:
+    return sa.Column(name, sa.DateTime(), server_default=sa.text("now()"))
+
+
+def _tables() -> list[sa.Table]:
+    # Index names follow SQLAlchemy's default for index=True (ix_gac_<table>_<col>)
+    metadata = sa.MetaData(schema="gac")
+    uuid = postgresql.UUID(as_uuid=True)
+    return [
+        sa.Table(
+            "users",
+            metadata,
+            _uuid_pk("user_id"),
+            sa.Column("email", sa.String(255), nullable=False, unique=True),
+            sa.Column("password_hash", sa.Text(), nullable=False),
+            sa.Column("full_name", sa.String(255)),
+            sa.Column("is_active", sa.Boolean()),
+            _timestamp("created_at"),
+            sa.Column("last_login_at", sa.DateTime()),
+        ),
+        sa.Table(
+            "roles",
+            metadata,
+            _uuid_pk("role_id"),
+            sa.Column("name", sa.String(50), nullable=False, unique=True),
+        ),
+        sa.Table(
+            "user_roles",
+            metadata,
+            sa.Column(
+                "user_id",
+                uuid,
+                sa.ForeignKey("gac.users.user_id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column(
+                "role_id",
+                uuid,
+                sa.ForeignKey("gac.roles.role_id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+        ),
+        sa.Table(
+            "orders",
+            metadata,
+            _uuid_pk("order_id"),
+            sa.Column("client_id", uuid, nullable=False, index=True),
+            sa.Column("created_by", uuid, sa.ForeignKey("gac.users.user_id")),
+            sa.Column("status", sa.String(50), nullable=False),
+            sa.Column("total_amount", sa.Numeric(12, 2)),
+            sa.Column("notes", sa.Text()),
+            _timestamp("created_at"),
+            _timestamp("updated_at"),
+        ),
+        sa.Table(
+            "order_items",
+            metadata,
+            _uuid_pk("item_id"),
+            sa.Column(
+                "order_id",
+                uuid,
+                sa.ForeignKey("gac.orders.order_id", ondelete="CASCADE"),
+                nullable=False,
+                index=True,
+            ),
+            sa.Column("device_id", uuid),
+            sa.Column("product_key", sa.String(50)),
+            sa.Column("quantity", sa.Integer(), nullable=False),
+            sa.Column("unit_price", sa.Numeric(12, 2), nullable=False),
+            _timestamp("created_at"),
+        ),
+        sa.Table(
+            "payments",
+            metadata,
+            _uuid_pk("payment_id"),
+            sa.Column(
+                "order_id", uuid, sa.ForeignKey("gac.orders.order_id"), index=True
+            ),
+            sa.Column("client_id", uuid, nullable=False, index=True),
+            sa.Column("amount", sa.Numeric(12, 2), nullable=False),
+            sa.Column("method", sa.String(50), nullable=False),
+            sa.Column("status", sa.String(50), nullable=False),
+            sa.Column("transaction_ref", sa.String(255)),
+            sa.Column("paid_at", sa.DateTime()),
+            _timestamp("created_at"),
+        ),
+        sa.Table(
+            "shipments",
+            metadata,
+            _uuid_pk("shipment_id"),
+            sa.Column(
+                "order_id",
+                uuid,
+                sa.ForeignKey("gac.orders.order_id"),
+                nullable=False,
+                index=True,
+            ),
+            sa.Column("client_id", uuid, nullable=False),
+            sa.Column("shipping_carrier", sa.String(100)),
+            sa.Column("tracking_number", sa.String(255)),
+            sa.Column("status", sa.String(50)),
+            sa.Column("address", postgresql.JSONB()),
+            _timestamp("created_at"),
+            _timestamp("updated_at"),
+        ),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SCHEMA IF NOT EXISTS gac")
+    for table in _tables():
+        op.execute(sa.schema.CreateTable(table, if_not_exists=True))
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            op.execute(sa.schema.CreateIndex(index, if_not_exists=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(_tables()):
+        op.drop_table(table.name, schema="gac")
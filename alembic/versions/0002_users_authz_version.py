@@ -0,0 +1,38 @@
+"""users authz_version
+
+Versión de autorización por usuario para los tokens de acceso stateless
+(`STATELESS_ACCESS_TOKENS`). El modelo la mapea siempre, así que la columna
+debe existir aunque la opción esté desactivada.
+
+Con un default constante, Postgres agrega la columna sin reescribir la tabla.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "users",
+        sa.Column("authz_version", sa.Integer(), nullable=False, server_default="0"),
+        schema="gac",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "authz_version", schema="gac")
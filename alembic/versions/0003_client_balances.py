@@ -0,0 +1,80 @@
+"""client balances
+
+Agregados por cliente que `BalanceService` mantiene al crear órdenes y
+pagos. La tabla se llena aquí con los totales actuales (la misma consulta
+que `BalanceService.rebuild`), así que no hace falta un rebuild manual tras
+migrar. El `LOCK` evita que una escritura concurrente quede fuera del
+cálculo si la migración corre con la aplicación levantada.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BACKFILL = """
+    WITH order_totals AS (
+        SELECT client_id, count(*) AS orders_count, sum(total_amount) AS orders_total
+        FROM gac.orders
+        GROUP BY client_id
+    ),
+    payment_totals AS (
+        SELECT
+            client_id,
+            sum(amount) FILTER (WHERE status = 'pending') AS payments_pending,
+            sum(amount) FILTER (WHERE status = 'confirmed') AS payments_confirmed
+        FROM gac.payments
+        GROUP BY client_id
+    )
+    INSERT INTO gac.client_balances (
+        client_id, orders_count, orders_total, payments_pending, payments_confirmed
+    )
+    SELECT
+        client_id,
+        coalesce(o.orders_count, 0),
+        coalesce(o.orders_total, 0),
+        coalesce(p.payments_pending, 0),
+        coalesce(p.payments_confirmed, 0)
+    FROM order_totals o
+    FULL OUTER JOIN payment_totals p USING (client_id)
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "client_balances",
+        sa.Column("client_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("orders_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "orders_total", sa.Numeric(14, 2), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "payments_pending", sa.Numeric(14, 2), nullable=False, server_default="0"
+        ),
+        sa.Column(
+            "payments_confirmed", sa.Numeric(14, 2), nullable=False, server_default="0"
+        ),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.text("now()")),
+        schema="gac",
+    )
+    op.execute("LOCK TABLE gac.orders, gac.payments IN SHARE MODE")
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("client_balances", schema="gac")
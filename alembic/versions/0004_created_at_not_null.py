@@ -0,0 +1,54 @@
+"""created_at not null
+
+La paginación por keyset ordena y filtra por `(created_at, id)`: una fila
+con `created_at` NULL nunca cumple `(created_at, id) < cursor` y no puede
+codificarse en un cursor. Las filas sin fecha reciben la de la migración,
+una cota superior de su creación real.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("users", "orders", "payments", "shipments")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.execute(
+            f"UPDATE gac.{table} SET created_at = now() WHERE created_at IS NULL"
+        )
+        op.alter_column(
+            table,
+            "created_at",
+            existing_type=sa.DateTime(),
+            existing_server_default=sa.text("now()"),
+            nullable=False,
+            schema="gac",
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.alter_column(
+            table,
+            "created_at",
+            existing_type=sa.DateTime(),
+            existing_server_default=sa.text("now()"),
+            nullable=True,
+            schema="gac",
+        )
@@ -0,0 +1,110 @@
+"""service indexes
+
+Índices que usan las consultas de `app/services/` (ver
+`scripts/check_query_plans.py`):
+
+- keyset de `/users` y de los listados por cliente, `(created_at, id)` para
+  exportaciones por rango de fechas y `(order_id, created_at)` en items;
+  reemplazan a los índices simples por `client_id` y `order_id`
+- `tracking_number` en envíos, `(client_id, transaction_ref)` parcial en
+  pagos y `role_id` en `user_roles`
+- `lower(email)` único en usuarios en lugar de `unique(email)`: el login y
+  `ON CONFLICT (lower(email))` comparan sin distinguir mayúsculas
+
+Se crean con `CONCURRENTLY` para no bloquear escrituras en una base en uso.
+Un build `CONCURRENTLY` que falla deja el índice marcado como inválido; antes
+de crear cada índice se elimina si quedó así, de modo que reintentar la
+migración lo reconstruye. Si ya hay correos que solo difieren en mayúsculas,
+el índice único falla y hay que resolver esos duplicados antes de reintentar;
+`unique(email)` solo se elimina una vez que `ix_users_email_lower` es válido.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_INDEXES = {
+    "ix_users_created": "gac.users (created_at, user_id)",
+    "ix_users_email_lower": "gac.users (lower(email))",
+    "ix_user_roles_role_id": "gac.user_roles (role_id)",
+    "ix_orders_client_created": "gac.orders (client_id, created_at, order_id)",
+    "ix_orders_created": "gac.orders (created_at, order_id)",
+    "ix_order_items_order_created": "gac.order_items (order_id, created_at)",
+    "ix_payments_client_created": "gac.payments (client_id, created_at, payment_id)",
+    "ix_payments_created": "gac.payments (created_at, payment_id)",
+    "ix_payments_client_transaction_ref": (
+        "gac.payments (client_id, transaction_ref) WHERE transaction_ref IS NOT NULL"
+    ),
+    "ix_shipments_client_created": (
+        "gac.shipments (client_id, created_at, shipment_id)"
+    ),
+    "ix_shipments_created": "gac.shipments (created_at, shipment_id)",
+    "ix_gac_shipments_tracking_number": "gac.shipments (tracking_number)",
+}
+UNIQUE_INDEXES = {"ix_users_email_lower"}
+
+# Covered by the leading columns of the composite indexes above
+REPLACED_INDEXES = {
+    "ix_gac_orders_client_id": "gac.orders (client_id)",
+    "ix_gac_order_items_order_id": "gac.order_items (order_id)",
+    "ix_gac_payments_client_id": "gac.payments (client_id)",
+}
+
+
+def _index_exists(name: str, valid: bool) -> str:
+    return (
+        "EXISTS (SELECT 1 FROM pg_index i"
+        " JOIN pg_class c ON c.oid = i.indexrelid"
+        " JOIN pg_namespace n ON n.oid = c.relnamespace"
+        f" WHERE n.nspname = 'gac' AND c.relname = '{name}'"
+        f" AND i.indisvalid = {str(valid).lower()})"
+    )
+
+
+def _create(name: str, target: str) -> None:
+    # IF NOT EXISTS would keep an INVALID index left by a failed earlier build
+    op.execute(
+        "DO $$ BEGIN "
+        f"IF {_index_exists(name, valid=False)} THEN DROP INDEX gac.{name}; END IF; "
+        "END $$"
+    )
+    unique = "UNIQUE " if name in UNIQUE_INDEXES else ""
+    op.execute(f"CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {target}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, target in NEW_INDEXES.items():
+            _create(name, target)
+        for name in REPLACED_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS gac.{name}")
+    # Never leave users without a valid email uniqueness guarantee
+    op.execute(
+        "DO $$ BEGIN "
+        f"IF NOT {_index_exists('ix_users_email_lower', valid=True)} THEN "
+        "RAISE EXCEPTION 'gac.ix_users_email_lower is missing or invalid'; END IF; "
+        "ALTER TABLE gac.users DROP CONSTRAINT IF EXISTS users_email_key; "
+        "END $$"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE gac.users ADD CONSTRAINT users_email_key UNIQUE (email)")
+    with op.get_context().autocommit_block():
+        for name, target in REPLACED_INDEXES.items():
+            _create(name, target)
+        for name in NEW_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS gac.{name}")
@@ -0,0 +1,62 @@
+"""role permissions
+
+Tablas `permissions` y `role_permissions`. Las filas de `permissions` las
+inserta la aplicación al arrancar desde el registro de
+`app/core/permissions.py`, que también define el bit de cada permiso.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "permissions",
+        sa.Column(
+            "permission_id",
+            postgresql.UUID(as_uuid=True),
+            primary_key=True,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+        sa.Column("description", sa.Text()),
+        schema="gac",
+    )
+
+    op.create_table(
+        "role_permissions",
+        sa.Column(
+            "role_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("gac.roles.role_id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column(
+            "permission_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("gac.permissions.permission_id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        schema="gac",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("role_permissions", schema="gac")
+    op.drop_table("permissions", schema="gac")
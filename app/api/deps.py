@@ -1,28 +1,46 @@
-from typing import Annotated, List
-from fastapi import Depends, HTTPException, status
+from typing import Annotated, List, Optional
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 
+from app.core.authz_versions import authz_versions
 from app.core.config import settings
 from app.core.database import get_db
-from app.models.users import User
+from app.core.pagination import InvalidCursor, decode_cursor
+from app.core.paseto import PASETO_LOCAL_PREFIX, decode_service_token
+from app.core.permissions import permission_mask, permission_table
+from app.core.principal_cache import Principal, ServicePrincipal, principal_cache
+from app.core.security import decode_jwt
+from app.models.users import Role, User, UserRole
 from app.schemas.auth import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
+async def _load_principal(db: AsyncSession, user_id) -> Principal | None:
+    stmt = (
+        select(User.is_active, Role.name)
+        .outerjoin(UserRole, UserRole.user_id == User.user_id)
+        .outerjoin(Role, Role.role_id == UserRole.role_id)
+        .where(User.user_id == user_id)
+    )
+    rows = (await db.execute(stmt)).all()
+    if not rows:
+        return None
+
+    roles = [role_name for _, role_name in rows if role_name is not None]
+    return Principal(user_id=user_id, is_active=bool(rows[0][0]), roles=roles)
+
+
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
+) -> Principal:
     try:
-        payload = jwt.decode(
-            token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-        )
+        payload = decode_jwt(token)
         token_data = TokenPayload(**payload)
     except (JWTError, ValidationError):
         raise HTTPException(
@@ -30,29 +48,160 @@ async def get_current_user(
             detail="Could not validate credentials",
         )
 
-    stmt = (
-        select(User)
-        .options(selectinload(User.roles))
-        .where(User.user_id == token_data.sub)
-    )
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    if (
+        settings.STATELESS_ACCESS_TOKENS
+        and token_data.type == "access"
+        and token_data.ver is not None
+        and token_data.roles is not None
+    ):
+        is_current = authz_versions.check(token_data.sub, token_data.ver)
+        if is_current:
+            return Principal(
+                user_id=token_data.sub, is_active=True, roles=token_data.roles
+            )
+        if is_current is False:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        # Unknown user version: fall back to the database
+
+    subject = str(token_data.sub)
+    principal = principal_cache.get(subject)
+    if principal is None:
+        principal = await _load_principal(db, token_data.sub)
+        if not principal:
+            raise HTTPException(status_code=404, detail="User not found")
+        principal_cache.set(subject, principal)
 
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    if not user.is_active:
+    if not principal.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
 
-    return user
+    return principal
+
 
+def require_permissions(permissions: List[str]):
+    """
+    Usuarios cuyos roles otorgan todos los `permissions`.
 
-def require_roles(allowed_roles: List[str]):
-    async def role_checker(current_user: Annotated[User, Depends(get_current_user)]):
-        user_roles = [role.name for role in current_user.roles]
-        if not any(role in user_roles for role in allowed_roles):
+    La máscara requerida se compila al declarar la ruta (un nombre no
+    registrado falla al importar); por petición solo se obtiene la máscara
+    cacheada de los roles del principal y se compara con un AND.
+    """
+    required = permission_mask(permissions)
+
+    async def permission_checker(
+        current_user: Annotated[Principal, Depends(get_current_user)],
+    ) -> Principal:
+        if not permission_table.has(current_user.roles, required):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
             )
         return current_user
 
-    return role_checker
+    return permission_checker
+
+
+def _resolve_service_token(
+    token: str,
+    required_service: str | None,
+    required_role: str | None,
+    required_scope: str | None,
+) -> ServicePrincipal:
+    payload = None
+    if token.startswith(PASETO_LOCAL_PREFIX):
+        payload = decode_service_token(
+            token,
+            required_service=required_service,
+            required_role=required_role,
+            required_scope=required_scope,
+        )
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Could not validate service credentials",
+        )
+    return ServicePrincipal(payload)
+
+
+def user_or_service(
+    required_service: str | None = None,
+    required_role: str | None = None,
+    required_scope: str | None = None,
+):
+    """
+    Acepta tanto el JWT de un usuario como un token PASETO de servicio.
+    Los tokens `v4.local.` se validan sin BD; el resto sigue el flujo de
+    `get_current_user`.
+    """
+
+    async def principal_resolver(
+        token: Annotated[str, Depends(oauth2_scheme)],
+        db: Annotated[AsyncSession, Depends(get_db)],
+    ) -> Principal:
+        if token.startswith(PASETO_LOCAL_PREFIX):
+            return _resolve_service_token(
+                token, required_service, required_role, required_scope
+            )
+        return await get_current_user(token, db)
+
+    return principal_resolver
+
+
+get_current_principal = user_or_service(
+    required_service=settings.SERVICE_TOKEN_REQUIRED_SERVICE or None,
+    required_role=settings.SERVICE_TOKEN_REQUIRED_ROLE or None,
+    required_scope=settings.SERVICE_TOKEN_REQUIRED_SCOPE or None,
+)
+
+
+def require_permissions_or_service(
+    permissions: List[str],
+    required_service: str | None = None,
+    required_role: str | None = None,
+    required_scope: str | None = None,
+):
+    """
+    Usuarios con todos los permisos indicados, o un token de servicio que
+    cumpla `required_service`, `required_role` y `required_scope`.
+    """
+    required = permission_mask(permissions)
+    resolver = user_or_service(required_service, required_role, required_scope)
+
+    async def permission_or_service_checker(
+        principal: Annotated[Principal, Depends(resolver)],
+    ) -> Principal:
+        if not principal.is_service and not permission_table.has(
+            principal.roles, required
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions"
+            )
+        return principal
+
+    return permission_or_service_checker
+
+
+class PageParams:
+    """Parámetros de paginación por cursor ya validados."""
+
+    __slots__ = ("limit", "cursor")
+
+    def __init__(self, limit: int, cursor: Optional[str]):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def get_page_params(
+    limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+    cursor: Optional[str] = Query(
+        None, description="Valor `next_cursor` de la página anterior"
+    ),
+) -> PageParams:
+    if cursor:
+        try:
+            decode_cursor(cursor)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return PageParams(limit, cursor)
@@ -1,11 +1,13 @@
+import math
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.api.deps import get_current_user
-from app.models.users import User
+from app.core.principal_cache import Principal
+from app.core.rate_limit import login_limiter
 from app.schemas.common import ResponseModel
 from app.schemas.auth import Token, UserResponse, PasswordUpdate
 from app.services.auth_service import AuthService
@@ -16,17 +18,30 @@ router = APIRouter()
 
 @router.post("/auth/login", response_model=ResponseModel[Token])
 async def login(
+    request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
+    # Shed over-limit attempts before the DB lookup and argon2 verification
+    client_ip = request.client.host if request.client else None
+    retry_after = await login_limiter.check(form_data.username, client_ip)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
     service = AuthService(db)
     token = await service.authenticate_user(form_data.username, form_data.password)
     if not token:
+        await login_limiter.record_failure(form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    await login_limiter.record_success(form_data.username)
     return ResponseModel(message="Login successful", data=token)
 
 
@@ -52,15 +67,22 @@ async def refresh_token(
 
 
 @router.get("/auth/me", response_model=ResponseModel[UserResponse])
-async def read_users_me(current_user: Annotated[User, Depends(get_current_user)]):
-    # Convert SQLAlchemy model to Pydantic schema manually or rely on from_attributes
+async def read_users_me(
+    current_user: Annotated[Principal, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    # The cached principal only carries id/roles, load the full profile here
+    user = await UserService(db).get_user(current_user.user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
     # UserResponse expects roles as list of strings
-    roles = [role.name for role in current_user.roles]
+    roles = [role.name for role in user.roles]
     user_response = UserResponse(
-        user_id=current_user.user_id,
-        email=current_user.email,
-        full_name=current_user.full_name,
-        is_active=current_user.is_active,
+        user_id=user.user_id,
+        email=user.email,
+        full_name=user.full_name,
+        is_active=user.is_active,
         roles=roles,
     )
     return ResponseModel(message="User profile retrieved", data=user_response)
@@ -69,7 +91,7 @@ async def read_users_me(current_user: Annotated[User, Depends(get_current_user)]
 @router.patch("/auth/password", response_model=ResponseModel[bool])
 async def change_my_password(
     password_in: PasswordUpdate,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[Principal, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """
@@ -0,0 +1,24 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_read_db
+from app.schemas.clients import ClientSummary
+from app.schemas.common import ResponseModel
+from app.services.balance_service import BalanceService
+
+from app.api.deps import get_current_principal
+from app.core.principal_cache import Principal
+
+router = APIRouter()
+
+
+@router.get("/clients/{client_id}/summary", response_model=ResponseModel[ClientSummary])
+async def get_client_summary(
+    client_id: UUID,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    service = BalanceService(db)
+    summary = await service.get_summary(client_id)
+    return ResponseModel(message="Client summary retrieved successfully", data=summary)
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+from uuid import UUID
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import require_permissions_or_service
+from app.core.config import settings
+from app.core.database import read_sessionmaker
+from app.services.export_service import stream_export
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+require_export = require_permissions_or_service(
+    ["exports:read"],
+    required_service=settings.SERVICE_TOKEN_REQUIRED_SERVICE or None,
+    required_role=settings.SERVICE_TOKEN_REQUIRED_ROLE or None,
+    required_scope=settings.EXPORT_TOKEN_REQUIRED_SCOPE or None,
+)
+
+
+@router.get(
+    "/exports/{kind}",
+    dependencies=[Depends(require_export)],
+    response_class=StreamingResponse,
+)
+async def export_data(
+    kind: Literal["orders", "payments", "shipments"],
+    request: Request,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    gzip: bool = False,
+    client_id: Optional[UUID] = None,
+    created_from: Optional[datetime] = Query(None, description="Inclusive"),
+    created_to: Optional[datetime] = Query(None, description="Exclusive"),
+):
+    filename = f"{kind}-{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}.{format}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    body = stream_export(
+        read_sessionmaker(request),
+        kind,
+        format,
+        gzip,
+        client_id=client_id,
+        created_from=created_from,
+        created_to=created_to,
+    )
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -1,11 +1,32 @@
-from typing import Annotated
+from typing import Annotated, List
 
 from fastapi import APIRouter, Depends, HTTPException
 
-from app.api.deps import require_roles
-from app.core.paseto import create_app_token, refresh_app_token
-from app.models.users import User
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import require_permissions, require_permissions_or_service
+from app.core.authz_versions import authz_versions
+from app.core.database import (
+    engine,
+    get_db,
+    get_pool_stats,
+    replica_engine,
+    replica_router,
+)
+from app.core.introspection import introspect_tokens
+from app.core.last_login import last_login_buffer
+from app.core.paseto import (
+    create_app_token,
+    get_token_cache_stats,
+    refresh_app_token,
+)
+from app.core.permissions import permission_names, permission_table
+from app.core.principal_cache import Principal, principal_cache
+from app.core.rate_limit import login_limiter
+from app.core.role_map import role_map
+from app.schemas.auth import TokenIntrospection, TokenIntrospectRequest
 from app.schemas.common import ResponseModel
+from app.services.user_service import UserService
 
 router = APIRouter()
 
@@ -13,14 +34,16 @@ router = APIRouter()
 @router.post(
     "/internal/tokens/app",
     response_model=ResponseModel[str],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["internal:tokens"]))],
 )
 async def generate_app_token(
-    current_user: Annotated[User, Depends(require_roles(["admin"]))],
+    current_user: Annotated[
+        Principal, Depends(require_permissions(["internal:tokens"]))
+    ],
 ):
     """
     Genera un token PASETO para comunicación interna de aplicaciones.
-    Solo accesible por usuarios con rol admin.
+    Requiere el permiso `internal:tokens`.
 
     El token expira en 5 minutos y contiene:
     - internal_id: UUID del usuario
@@ -35,15 +58,17 @@ async def generate_app_token(
 @router.post(
     "/internal/tokens/refresh",
     response_model=ResponseModel[str],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["internal:tokens"]))],
 )
 async def refresh_app_token_endpoint(
     token: str,
-    current_user: Annotated[User, Depends(require_roles(["admin"]))],
+    current_user: Annotated[
+        Principal, Depends(require_permissions(["internal:tokens"]))
+    ],
 ):
     """
     Refresca un token PASETO existente generando uno nuevo.
-    Solo accesible por usuarios con rol admin.
+    Requiere el permiso `internal:tokens`.
 
     Args:
         token: Token PASETO existente a refrescar
@@ -58,25 +83,94 @@ async def refresh_app_token_endpoint(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post(
+    "/internal/tokens/introspect",
+    response_model=ResponseModel[List[TokenIntrospection]],
+    dependencies=[Depends(require_permissions_or_service(["internal:tokens"]))],
+)
+async def introspect_tokens_endpoint(
+    body: TokenIntrospectRequest, db: Annotated[AsyncSession, Depends(get_db)]
+):
+    """
+    Valida un lote de tokens (PASETO v4.local y JWT de GAC) en una sola llamada.
+    Accesible por usuarios con el permiso `internal:tokens` o servicios con
+    token PASETO válido.
+
+    Retorna, en el mismo orden de entrada, si cada token es válido, sus claims
+    y los segundos restantes antes de expirar. Un JWT de un usuario
+    desactivado o con la versión de autorización revocada no está activo.
+    """
+    results = await introspect_tokens(db, body.tokens)
+    return ResponseModel(message="Tokens introspected", data=results)
+
+
 @router.get(
     "/internal/debug/user",
     response_model=ResponseModel[dict],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["internal:read"]))],
 )
 async def debug_current_user(
-    current_user: Annotated[User, Depends(require_roles(["admin"]))],
+    current_user: Annotated[Principal, Depends(require_permissions(["internal:read"]))],
+    db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """
     Endpoint de debugging para verificar información del usuario actual.
-    Solo accesible por usuarios con rol admin.
+    Requiere el permiso `internal:read`.
     """
-    roles = [role.name for role in current_user.roles]
+    user = await UserService(db).get_user(current_user.user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    roles = [role.name for role in user.roles]
     user_info = {
-        "user_id": str(current_user.user_id),
-        "email": current_user.email,
-        "full_name": current_user.full_name,
-        "is_active": current_user.is_active,
+        "user_id": str(user.user_id),
+        "email": user.email,
+        "full_name": user.full_name,
+        "is_active": user.is_active,
         "roles": roles,
         "has_admin_role": "admin" in roles,
+        "permissions": permission_names(permission_table.mask_of(current_user.roles)),
     }
     return ResponseModel(message="User debug info", data=user_info)
+
+
+@router.get(
+    "/internal/metrics",
+    response_model=ResponseModel[dict],
+    dependencies=[Depends(require_permissions(["internal:read"]))],
+)
+async def get_internal_metrics():
+    """
+    Métricas internas del proceso (caches de autenticación, buffers de escritura).
+    Requiere el permiso `internal:read`.
+
+    Los valores son por worker: cada proceso de uvicorn reporta sus propios contadores.
+    """
+    metrics = {
+        "principal_cache": principal_cache.stats(),
+        "authz_versions": authz_versions.stats(),
+        "paseto_token_cache": get_token_cache_stats(),
+        "last_login_buffer": last_login_buffer.stats(),
+        "login_rate_limiter": login_limiter.stats(),
+        "role_map": role_map.stats(),
+        "permission_table": permission_table.stats(),
+    }
+    return ResponseModel(message="Internal metrics", data=metrics)
+
+
+@router.get(
+    "/internal/pool",
+    response_model=ResponseModel[dict],
+    dependencies=[Depends(require_permissions(["internal:read"]))],
+)
+async def get_db_pool_stats():
+    """
+    Estado del pool de conexiones a la base de datos de este worker:
+    conexiones en uso, overflow, histograma de espera por conexión,
+    timeouts y errores de conexión, y estado del enrutamiento al replica.
+    """
+    data = {"primary": get_pool_stats(engine)}
+    if replica_engine is not None:
+        data["replica"] = get_pool_stats(replica_engine)
+    data["replica_routing"] = replica_router.stats()
+    return ResponseModel(message="Pool stats", data=data)
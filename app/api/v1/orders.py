@@ -3,13 +3,18 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.schemas.common import ResponseModel
-from app.schemas.orders import OrderCreate, OrderResponse
+from app.core.database import get_db, get_read_db
+from app.schemas.common import ResponseModel, raw_response
+from app.schemas.orders import (
+    OrderBulkCreate,
+    OrderBulkResult,
+    OrderCreate,
+    OrderResponse,
+)
 from app.services.order_service import OrderService
 
-from app.api.deps import get_current_user
-from app.models.users import User
+from app.api.deps import PageParams, get_current_principal, get_page_params
+from app.core.principal_cache import Principal
 
 router = APIRouter()
 
@@ -22,7 +27,7 @@ router = APIRouter()
 async def create_order(
     order_in: OrderCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     service = OrderService(db)
     created_by = current_user.user_id
@@ -30,17 +35,35 @@ async def create_order(
     return ResponseModel(message="Order created successfully", data=order)
 
 
+@router.post(
+    "/orders/bulk",
+    response_model=ResponseModel[OrderBulkResult],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_orders_bulk(
+    bulk_in: OrderBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    service = OrderService(db)
+    result = await service.create_orders_bulk(bulk_in.orders, current_user.user_id)
+    message = "Orders created successfully"
+    if result.errors:
+        message = f"{result.created} orders created, {len(result.errors)} failed"
+    return ResponseModel(message=message, data=result)
+
+
 @router.get("/orders/{order_id}", response_model=ResponseModel[OrderResponse])
 async def get_order(
     order_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     service = OrderService(db)
-    order = await service.get_order(order_id)
+    order = await service.get_order_json(order_id)
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
-    return ResponseModel(message="Order retrieved successfully", data=order)
+    return raw_response("Order retrieved successfully", order)
 
 
 @router.get(
@@ -48,9 +71,12 @@ async def get_order(
 )
 async def get_client_orders(
     client_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    page: PageParams = Depends(get_page_params),
+    current_user: Principal = Depends(get_current_principal),
 ):
     service = OrderService(db)
-    orders = await service.get_orders_by_client(client_id)
-    return ResponseModel(message="Orders retrieved successfully", data=orders)
+    orders, next_cursor = await service.get_orders_by_client_json(
+        client_id, page.limit, page.cursor
+    )
+    return raw_response("Orders retrieved successfully", orders, next_cursor)
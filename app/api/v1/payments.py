@@ -1,18 +1,30 @@
 from uuid import UUID
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.schemas.common import ResponseModel
-from app.schemas.payments import PaymentCreate, PaymentResponse
+from app.schemas.payments import (
+    PaymentCreate,
+    PaymentImportResult,
+    PaymentResponse,
+)
+from app.services.payment_import_service import PaymentImportService
 from app.services.payment_service import PaymentService
 
-from app.api.deps import get_current_user
-from app.models.users import User
+from app.api.deps import PageParams, get_current_principal, get_page_params
+from app.core.principal_cache import Principal
 
 router = APIRouter()
 
+IMPORT_CONTENT_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+}
+
 
 @router.post(
     "/payments",
@@ -22,18 +34,55 @@ router = APIRouter()
 async def create_payment(
     payment_in: PaymentCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     service = PaymentService(db)
     payment = await service.create_payment(payment_in)
     return ResponseModel(message="Payment created successfully", data=payment)
 
 
+@router.post(
+    "/payments/import",
+    response_model=ResponseModel[PaymentImportResult],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            }
+        }
+    },
+)
+async def import_payments(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    fmt = format or IMPORT_CONTENT_TYPES.get(content_type.lower())
+    if fmt is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Send Content-Type application/x-ndjson or text/csv, or ?format=",
+        )
+
+    service = PaymentImportService(db)
+    try:
+        result = await service.import_stream(request.stream(), fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ResponseModel(
+        message=f"{result.imported} payments imported, {result.failed} rejected",
+        data=result,
+    )
+
+
 @router.get("/payments/{payment_id}", response_model=ResponseModel[PaymentResponse])
 async def get_payment(
     payment_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
     service = PaymentService(db)
     payment = await service.get_payment(payment_id)
@@ -47,9 +96,16 @@ async def get_payment(
 )
 async def get_client_payments(
     client_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    page: PageParams = Depends(get_page_params),
+    current_user: Principal = Depends(get_current_principal),
 ):
     service = PaymentService(db)
-    payments = await service.get_payments_by_client(client_id)
-    return ResponseModel(message="Payments retrieved successfully", data=payments)
+    payments, next_cursor = await service.get_payments_by_client(
+        client_id, page.limit, page.cursor
+    )
+    return ResponseModel(
+        message="Payments retrieved successfully",
+        data=payments,
+        next_cursor=next_cursor,
+    )
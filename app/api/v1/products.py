@@ -4,7 +4,7 @@ from pydantic import BaseModel
 
 from app.schemas.common import ResponseModel
 from app.api.deps import get_current_user
-from app.models.users import User
+from app.core.principal_cache import Principal
 
 router = APIRouter()
 
@@ -22,13 +22,13 @@ products_db: List[Product] = [
 
 
 @router.get("/products", response_model=ResponseModel[List[Product]])
-async def get_products(current_user: User = Depends(get_current_user)):
+async def get_products(current_user: Principal = Depends(get_current_user)):
     return ResponseModel(message="Products retrieved successfully", data=products_db)
 
 
 @router.post("/products", response_model=ResponseModel[Product])
 async def create_product(
-    product: Product, current_user: User = Depends(get_current_user)
+    product: Product, current_user: Principal = Depends(get_current_user)
 ):
     # Check if key already exists
     if any(p.key == product.key for p in products_db):
@@ -3,20 +3,26 @@ from typing import List, Annotated
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.api.deps import require_roles
+from app.core.database import get_db, get_read_db
+from app.api.deps import require_permissions
 from app.schemas.common import ResponseModel
-from app.schemas.roles import RoleCreate, RoleResponse
+from app.schemas.roles import (
+    PermissionResponse,
+    RoleBulkAssignment,
+    RoleBulkAssignmentResult,
+    RoleCreate,
+    RolePermissionsUpdate,
+    RoleResponse,
+)
 from app.services.role_service import RoleService
 
 router = APIRouter()
 
 
-# Only admins can manage roles
 @router.post(
     "/roles",
     response_model=ResponseModel[RoleResponse],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["roles:write"]))],
 )
 async def create_role(
     role_in: RoleCreate, db: Annotated[AsyncSession, Depends(get_db)]
@@ -32,9 +38,9 @@ async def create_role(
 @router.get(
     "/roles",
     response_model=ResponseModel[List[RoleResponse]],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["roles:read"]))],
 )
-async def get_roles(db: Annotated[AsyncSession, Depends(get_db)]):
+async def get_roles(db: Annotated[AsyncSession, Depends(get_read_db)]):
     service = RoleService(db)
     roles = await service.get_roles()
     return ResponseModel(message="Roles retrieved successfully", data=roles)
@@ -43,7 +49,7 @@ async def get_roles(db: Annotated[AsyncSession, Depends(get_db)]):
 @router.post(
     "/users/{user_id}/roles/{role_id}",
     response_model=ResponseModel[bool],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["roles:write"]))],
 )
 async def assign_role(
     user_id: UUID, role_id: UUID, db: Annotated[AsyncSession, Depends(get_db)]
@@ -58,7 +64,7 @@ async def assign_role(
 @router.delete(
     "/users/{user_id}/roles/{role_id}",
     response_model=ResponseModel[bool],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["roles:write"]))],
 )
 async def revoke_role(
     user_id: UUID, role_id: UUID, db: Annotated[AsyncSession, Depends(get_db)]
@@ -68,3 +74,93 @@ async def revoke_role(
     if not success:
         raise HTTPException(status_code=404, detail="Role assignment not found")
     return ResponseModel(message="Role revoked successfully", data=True)
+
+
+@router.post(
+    "/roles/{role_id}/users:grant",
+    response_model=ResponseModel[RoleBulkAssignmentResult],
+    dependencies=[Depends(require_permissions(["roles:write"]))],
+)
+async def grant_role_bulk(
+    role_id: UUID,
+    assignment: RoleBulkAssignment,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    service = RoleService(db)
+    changed = await service.grant_role_to_users(role_id, assignment.user_ids)
+    if changed is None:
+        raise HTTPException(status_code=404, detail="Role not found")
+    return ResponseModel(
+        message="Role granted successfully",
+        data=RoleBulkAssignmentResult(changed=len(changed), user_ids=changed),
+    )
+
+
+@router.post(
+    "/roles/{role_id}/users:revoke",
+    response_model=ResponseModel[RoleBulkAssignmentResult],
+    dependencies=[Depends(require_permissions(["roles:write"]))],
+)
+async def revoke_role_bulk(
+    role_id: UUID,
+    assignment: RoleBulkAssignment,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    service = RoleService(db)
+    changed = await service.revoke_role_from_users(role_id, assignment.user_ids)
+    if changed is None:
+        raise HTTPException(status_code=404, detail="Role not found")
+    return ResponseModel(
+        message="Role revoked successfully",
+        data=RoleBulkAssignmentResult(changed=len(changed), user_ids=changed),
+    )
+
+
+@router.get(
+    "/permissions",
+    response_model=ResponseModel[List[PermissionResponse]],
+    dependencies=[Depends(require_permissions(["roles:read"]))],
+)
+async def get_permissions(db: Annotated[AsyncSession, Depends(get_read_db)]):
+    service = RoleService(db)
+    permissions = await service.get_permissions()
+    return ResponseModel(message="Permissions retrieved successfully", data=permissions)
+
+
+@router.get(
+    "/roles/{role_id}/permissions",
+    response_model=ResponseModel[List[str]],
+    dependencies=[Depends(require_permissions(["roles:read"]))],
+)
+async def get_role_permissions(
+    role_id: UUID, db: Annotated[AsyncSession, Depends(get_read_db)]
+):
+    service = RoleService(db)
+    permissions = await service.get_role_permissions(role_id)
+    if permissions is None:
+        raise HTTPException(status_code=404, detail="Role not found")
+    return ResponseModel(
+        message="Role permissions retrieved successfully", data=permissions
+    )
+
+
+@router.put(
+    "/roles/{role_id}/permissions",
+    response_model=ResponseModel[List[str]],
+    dependencies=[Depends(require_permissions(["roles:write"]))],
+)
+async def set_role_permissions(
+    role_id: UUID,
+    update: RolePermissionsUpdate,
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    service = RoleService(db)
+    try:
+        permissions = await service.set_role_permissions(role_id, update.permissions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if permissions is None:
+        raise HTTPException(status_code=404, detail="Role not found")
+    return ResponseModel(
+        message="Role permissions updated successfully", data=permissions
+    )
@@ -3,13 +3,19 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.schemas.common import ResponseModel
-from app.schemas.shipments import ShipmentCreate, ShipmentResponse, ShipmentUpdateStatus
-from app.services.shipment_service import ShipmentService
+from app.schemas.shipments import (
+    ShipmentBulkStatusResult,
+    ShipmentBulkStatusUpdate,
+    ShipmentCreate,
+    ShipmentResponse,
+    ShipmentUpdateStatus,
+)
+from app.services.shipment_service import InvalidStatusTransition, ShipmentService
 
-from app.api.deps import get_current_user
-from app.models.users import User
+from app.api.deps import PageParams, get_current_principal, get_page_params
+from app.core.principal_cache import Principal
 
 router = APIRouter()
 
@@ -22,13 +28,26 @@ router = APIRouter()
 async def create_shipment(
     shipment_in: ShipmentCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     service = ShipmentService(db)
     shipment = await service.create_shipment(shipment_in)
     return ResponseModel(message="Shipment created successfully", data=shipment)
 
 
+@router.patch(
+    "/shipments/status:bulk", response_model=ResponseModel[ShipmentBulkStatusResult]
+)
+async def bulk_update_shipment_status(
+    bulk_in: ShipmentBulkStatusUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    service = ShipmentService(db)
+    result = await service.bulk_update_status(bulk_in.updates)
+    return ResponseModel(message="Shipment statuses updated successfully", data=result)
+
+
 @router.patch(
     "/shipments/{shipment_id}/status", response_model=ResponseModel[ShipmentResponse]
 )
@@ -36,10 +55,15 @@ async def update_shipment_status(
     shipment_id: UUID,
     status_in: ShipmentUpdateStatus,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     service = ShipmentService(db)
-    shipment = await service.update_status(shipment_id, status_in.status)
+    try:
+        shipment = await service.update_status(
+            shipment_id, status_in.status, status_in.expected_status
+        )
+    except InvalidStatusTransition as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     if not shipment:
         raise HTTPException(status_code=404, detail="Shipment not found")
     return ResponseModel(message="Shipment status updated successfully", data=shipment)
@@ -51,9 +75,16 @@ async def update_shipment_status(
 )
 async def get_client_shipments(
     client_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    page: PageParams = Depends(get_page_params),
+    current_user: Principal = Depends(get_current_principal),
 ):
     service = ShipmentService(db)
-    shipments = await service.get_shipments_by_client(client_id)
-    return ResponseModel(message="Shipments retrieved successfully", data=shipments)
+    shipments, next_cursor = await service.get_shipments_by_client(
+        client_id, page.limit, page.cursor
+    )
+    return ResponseModel(
+        message="Shipments retrieved successfully",
+        data=shipments,
+        next_cursor=next_cursor,
+    )
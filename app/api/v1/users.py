@@ -1,12 +1,18 @@
 from uuid import UUID
 from typing import List, Annotated
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.api.deps import require_roles
+from app.core.database import get_db, get_read_db
+from app.api.deps import PageParams, get_page_params, require_permissions
 from app.schemas.common import ResponseModel
-from app.schemas.users import UserCreate, UserUpdate, UserResponse
+from app.schemas.users import (
+    UserBulkCreate,
+    UserBulkResult,
+    UserCreate,
+    UserResponse,
+    UserUpdate,
+)
 from app.schemas.auth import PasswordUpdate
 from app.services.user_service import UserService
 
@@ -17,7 +23,7 @@ router = APIRouter()
     "/users",
     response_model=ResponseModel[UserResponse],
     status_code=status.HTTP_201_CREATED,
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["users:write"]))],
 )
 async def create_user(
     user_in: UserCreate, db: Annotated[AsyncSession, Depends(get_db)]
@@ -40,18 +46,34 @@ async def create_user(
     return ResponseModel(message="User created successfully", data=response)
 
 
+@router.post(
+    "/users/bulk",
+    response_model=ResponseModel[UserBulkResult],
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(require_permissions(["users:write"]))],
+)
+async def create_users_bulk(
+    bulk_in: UserBulkCreate, db: Annotated[AsyncSession, Depends(get_db)]
+):
+    service = UserService(db)
+    result = await service.create_users_bulk(bulk_in.users)
+    message = "Users created successfully"
+    if result.skipped:
+        message = f"{result.created} users created, {result.skipped} skipped"
+    return ResponseModel(message=message, data=result)
+
+
 @router.get(
     "/users",
     response_model=ResponseModel[List[UserResponse]],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["users:read"]))],
 )
 async def get_users(
-    db: Annotated[AsyncSession, Depends(get_db)],
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1),
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    page: Annotated[PageParams, Depends(get_page_params)],
 ):
     service = UserService(db)
-    users = await service.get_users(skip, limit)
+    users, next_cursor = await service.get_users(page.limit, page.cursor)
 
     response_data = []
     for user in users:
@@ -66,15 +88,19 @@ async def get_users(
             )
         )
 
-    return ResponseModel(message="Users retrieved successfully", data=response_data)
+    return ResponseModel(
+        message="Users retrieved successfully",
+        data=response_data,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get(
     "/users/{user_id}",
     response_model=ResponseModel[UserResponse],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["users:read"]))],
 )
-async def get_user(user_id: UUID, db: Annotated[AsyncSession, Depends(get_db)]):
+async def get_user(user_id: UUID, db: Annotated[AsyncSession, Depends(get_read_db)]):
     service = UserService(db)
     user = await service.get_user(user_id)
     if not user:
@@ -94,7 +120,7 @@ async def get_user(user_id: UUID, db: Annotated[AsyncSession, Depends(get_db)]):
 @router.patch(
     "/users/{user_id}",
     response_model=ResponseModel[UserResponse],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["users:write"]))],
 )
 async def update_user(
     user_id: UUID, user_in: UserUpdate, db: Annotated[AsyncSession, Depends(get_db)]
@@ -118,7 +144,7 @@ async def update_user(
 @router.delete(
     "/users/{user_id}",
     response_model=ResponseModel[bool],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["users:write"]))],
 )
 async def delete_user(user_id: UUID, db: Annotated[AsyncSession, Depends(get_db)]):
     service = UserService(db)
@@ -131,7 +157,7 @@ async def delete_user(user_id: UUID, db: Annotated[AsyncSession, Depends(get_db)
 @router.patch(
     "/users/{user_id}/password",
     response_model=ResponseModel[bool],
-    dependencies=[Depends(require_roles(["admin"]))],
+    dependencies=[Depends(require_permissions(["users:write"]))],
 )
 async def reset_user_password(
     user_id: UUID,
@@ -139,7 +165,7 @@ async def reset_user_password(
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """
-    Resetea la contraseña de un usuario (solo admin).
+    Resetea la contraseña de un usuario (requiere `users:write`).
     No requiere la contraseña actual del usuario.
     """
     service = UserService(db)
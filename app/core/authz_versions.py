@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.users import User
+
+logger = logging.getLogger(__name__)
+
+
+class AuthzVersionTable:
+    """
+    Tabla en memoria `user_id -> (authz_version, is_active)`.
+
+    Permite validar tokens de acceso stateless sin consultar la base de datos:
+    un token es válido mientras su claim `ver` no sea menor que la versión
+    conocida del usuario y el usuario siga activo. Se refresca periódicamente
+    desde la BD y se actualiza localmente al cambiar roles o desactivar usuarios.
+    """
+
+    def __init__(self):
+        self._versions: dict[str, tuple[int, bool]] = {}
+        self.loaded = False
+
+    def check(self, user_id: UUID | str, token_version: int) -> Optional[bool]:
+        """
+        Retorna True si el token está vigente, False si está revocado y
+        None si el usuario no es conocido (el llamador debe ir a la BD).
+        """
+        entry = self._versions.get(str(user_id))
+        if entry is None:
+            return None
+        version, is_active = entry
+        return is_active and token_version >= version
+
+    def record(self, user_id: UUID | str, version: int, is_active: bool) -> None:
+        key = str(user_id)
+        current = self._versions.get(key)
+        if current is None or version >= current[0]:
+            self._versions[key] = (version, is_active)
+
+    async def refresh(self, db: AsyncSession) -> None:
+        result = await db.execute(
+            select(User.user_id, User.authz_version, User.is_active)
+        )
+        loaded = {
+            str(user_id): (version, bool(is_active))
+            for user_id, version, is_active in result
+        }
+        # Un bump local puede ser más reciente que la lectura que acaba de terminar
+        for key, entry in self._versions.items():
+            if key in loaded and entry[0] > loaded[key][0]:
+                loaded[key] = entry
+        self._versions = loaded
+        self.loaded = True
+
+    async def run_refresher(self) -> None:
+        while True:
+            try:
+                async with AsyncSessionLocal() as session:
+                    await self.refresh(session)
+            except Exception:
+                logger.exception("Failed to refresh authz version table")
+            await asyncio.sleep(settings.AUTHZ_VERSION_REFRESH_SECONDS)
+
+    def stats(self) -> dict:
+        return {"loaded": self.loaded, "size": len(self._versions)}
+
+
+authz_versions = AuthzVersionTable()
+
+
+async def bump_authz_version(
+    db: AsyncSession, user_id: UUID
+) -> Optional[tuple[int, bool]]:
+    """
+    Incrementa `authz_version` del usuario dentro de la transacción actual.
+    Retorna `(version, is_active)` para registrarlo con `authz_versions.record`
+    una vez confirmado el commit.
+    """
+    stmt = (
+        update(User)
+        .where(User.user_id == user_id)
+        .values(authz_version=User.authz_version + 1)
+        .returning(User.authz_version, User.is_active)
+    )
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        return None
+    return row[0], bool(row[1])
+
+
+def bump_authz_versions_from(changed):
+    """
+    `UPDATE` que incrementa `authz_version` de cada `user_id` de `changed`
+    (típicamente el CTE de un `INSERT`/`DELETE ... RETURNING user_id` sobre
+    `user_roles`), para aplicar el cambio de roles y el bump en una sentencia.
+    Retorna filas `(user_id, authz_version, is_active)` para `authz_versions.record`.
+    """
+    users = User.__table__
+    return (
+        update(users)
+        .where(users.c.user_id == changed.c.user_id)
+        .values(authz_version=users.c.authz_version + 1)
+        .returning(users.c.user_id, users.c.authz_version, users.c.is_active)
+    )
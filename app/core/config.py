@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,16 +11,91 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_SCHEME: str = "public"
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 5.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = False
+    DB_CONNECT_TIMEOUT: float = 10.0
+    DB_COMMAND_TIMEOUT: Optional[float] = None
+    # 0 disables prepared statement caching (required behind pgbouncer)
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
+    # Optional read replica; unset fields default to the primary's values
+    DB_REPLICA_HOST: Optional[str] = None
+    DB_REPLICA_PORT: Optional[int] = None
+    DB_REPLICA_USER: Optional[str] = None
+    DB_REPLICA_PASSWORD: Optional[str] = None
+    DB_REPLICA_NAME: Optional[str] = None
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DB_REPLICA_HEALTH_INTERVAL_SECONDS: float = 5.0
+    DB_REPLICA_PIN_SECONDS: float = 5.0
+
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRES_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRES_DAYS: int = 7
+    STATELESS_ACCESS_TOKENS: bool = False
+    AUTHZ_VERSION_REFRESH_SECONDS: float = 30.0
 
     PASETO_SECRET_KEY: str
+    PASETO_KEY_ID: str = ""
+    PASETO_PREVIOUS_KEYS: str = ""
+    PASETO_DECODE_CACHE_SIZE: int = 4096
+    # Service tokens accepted on orders/payments/shipments; defaults to the
+    # ones GAC issues itself (POST /internal/tokens/app). Empty disables a check.
+    SERVICE_TOKEN_REQUIRED_SERVICE: str = "gac"
+    SERVICE_TOKEN_REQUIRED_ROLE: str = "GAC_ADMIN"
+    SERVICE_TOKEN_REQUIRED_SCOPE: str = "internal-gac-admin"
+    # Exports read whole tables: services also need this narrower scope
+    EXPORT_TOKEN_REQUIRED_SCOPE: str = "internal-gac-export"
+
+    PASSWORD_HASH_WORKERS: int = 2
+    ARGON2_TIME_COST: Optional[int] = None
+    ARGON2_MEMORY_COST: Optional[int] = None
+    ARGON2_PARALLELISM: Optional[int] = None
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_RATE_EMAIL_BURST: int = 5
+    LOGIN_RATE_EMAIL_PER_MINUTE: float = 5.0
+    LOGIN_RATE_IP_BURST: int = 20
+    LOGIN_RATE_IP_PER_MINUTE: float = 60.0
+    LOGIN_LOCKOUT_THRESHOLD: int = 5
+    LOGIN_LOCKOUT_BASE_SECONDS: float = 30.0
+    LOGIN_LOCKOUT_MAX_SECONDS: float = 900.0
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100000
+
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    ROLE_MAP_TTL_SECONDS: float = 300.0
+    PERMISSION_REFRESH_SECONDS: float = 60.0
+
+    LAST_LOGIN_FLUSH_INTERVAL_SECONDS: float = 5.0
+    LAST_LOGIN_BUFFER_MAX_SIZE: int = 5000
+
+    PAGE_SIZE_DEFAULT: int = 50
+    PAGE_SIZE_MAX: int = 200
 
     @property
     def DATABASE_URL(self) -> str:
-        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        return (
+            f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+            f"?prepared_statement_cache_size={self.DB_STATEMENT_CACHE_SIZE}"
+        )
+
+    @property
+    def DATABASE_REPLICA_URL(self) -> Optional[str]:
+        if not self.DB_REPLICA_HOST:
+            return None
+        user = self.DB_REPLICA_USER or self.DB_USER
+        password = self.DB_REPLICA_PASSWORD or self.DB_PASSWORD
+        port = self.DB_REPLICA_PORT or self.DB_PORT
+        name = self.DB_REPLICA_NAME or self.DB_NAME
+        return (
+            f"postgresql+asyncpg://{user}:{password}@{self.DB_REPLICA_HOST}:{port}/{name}"
+            f"?prepared_statement_cache_size={self.DB_STATEMENT_CACHE_SIZE}"
+        )
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
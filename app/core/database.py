@@ -1,23 +1,314 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.orm import DeclarativeBase
-from typing import AsyncGenerator
+import asyncio
+import bisect
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from fastapi import Request
+from sqlalchemy import event, exc as sa_exc, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    create_async_engine,
+    async_sessionmaker,
+    AsyncSession,
+)
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import AsyncGenerator, AsyncIterator
 from app.core.config import settings
 
-# Configurar el engine con el esquema especificado en DB_SCHEME
-connect_args = {"server_settings": {"search_path": settings.DB_SCHEME}}
-engine = create_async_engine(
-    settings.DATABASE_URL, echo=False, connect_args=connect_args
-)
+logger = logging.getLogger(__name__)
+
+# Límites superiores (ms) de los buckets del histograma de espera por conexión
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connect_errors = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe_wait(self, wait_ms: float) -> None:
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        self.wait_histogram[bisect.bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Pool asyncio que mide el tiempo de espera por conexión (incluye crear la
+    conexión y el pre-ping) y cuenta timeouts y errores de conexión.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except sa_exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        except Exception:
+            self.stats.connect_errors += 1
+            raise
+        finally:
+            self.stats.observe_wait((time.perf_counter() - start) * 1000)
+        self.stats.checkouts += 1
+        return connection
+
+
+def create_engine_for(url: str) -> AsyncEngine:
+    # Configurar el engine con el esquema especificado en DB_SCHEME
+    connect_args = {
+        "server_settings": {"search_path": settings.DB_SCHEME},
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "timeout": settings.DB_CONNECT_TIMEOUT,
+    }
+    if settings.DB_COMMAND_TIMEOUT is not None:
+        connect_args["command_timeout"] = settings.DB_COMMAND_TIMEOUT
+
+    return create_async_engine(
+        url,
+        echo=False,
+        connect_args=connect_args,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+def get_pool_stats(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    stats = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout_seconds": settings.DB_POOL_TIMEOUT,
+    }
+    pool_stats = getattr(pool, "stats", None)
+    if pool_stats is not None:
+        labels = [f"le_{bound}ms" for bound in WAIT_BUCKETS_MS] + ["inf"]
+        stats.update(
+            {
+                "checkouts": pool_stats.checkouts,
+                "timeouts": pool_stats.timeouts,
+                "connect_errors": pool_stats.connect_errors,
+                "wait_avg_ms": round(
+                    pool_stats.wait_total_ms / max(sum(pool_stats.wait_histogram), 1),
+                    3,
+                ),
+                "wait_max_ms": round(pool_stats.wait_max_ms, 3),
+                "wait_histogram": dict(zip(labels, pool_stats.wait_histogram)),
+            }
+        )
+    return stats
+
+
+engine = create_engine_for(settings.DATABASE_URL)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine, class_=AsyncSession, expire_on_commit=False
 )
 
 
+replica_engine = (
+    create_engine_for(settings.DATABASE_REPLICA_URL)
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+
+ReplicaSessionLocal = (
+    async_sessionmaker(bind=replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
+# Segundos de retraso del replica; 0 si ya reprodujo todo lo recibido
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """)
+
+
+class ReplicaRouter:
+    """
+    Decide si una lectura puede ir al replica.
+
+    - El replica solo se usa mientras el último health check fue exitoso y
+      su retraso no supera DB_REPLICA_MAX_LAG_SECONDS.
+    - Read-your-writes: tras un commit en el primario, el cliente queda
+      fijado al primario durante DB_REPLICA_PIN_SECONDS.
+    """
+
+    MAX_PINNED_CLIENTS = 50000
+
+    def __init__(self):
+        self.enabled = replica_engine is not None
+        self.healthy = False
+        self.lag_seconds: float | None = None
+        self.last_error: str | None = None
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.primary_fallbacks = 0
+        self._pins: OrderedDict[bytes, float] = OrderedDict()
+
+    def pin(self, client_key: bytes) -> None:
+        self._pins[client_key] = time.monotonic() + settings.DB_REPLICA_PIN_SECONDS
+        self._pins.move_to_end(client_key)
+        while len(self._pins) > self.MAX_PINNED_CLIENTS:
+            self._pins.popitem(last=False)
+
+    def is_pinned(self, client_key: bytes) -> bool:
+        until = self._pins.get(client_key)
+        if until is None:
+            return False
+        if until < time.monotonic():
+            del self._pins[client_key]
+            return False
+        return True
+
+    def use_replica(self, client_key: bytes) -> bool:
+        if not (self.enabled and self.healthy) or self.is_pinned(client_key):
+            self.primary_reads += 1
+            return False
+        self.replica_reads += 1
+        return True
+
+    def mark_unhealthy(self, reason: str) -> None:
+        self.healthy = False
+        self.last_error = reason
+
+    async def check(self) -> None:
+        try:
+            async with replica_engine.connect() as connection:
+                lag = float((await connection.execute(REPLICA_LAG_QUERY)).scalar())
+        except Exception as e:
+            self.lag_seconds = None
+            self.mark_unhealthy(f"{type(e).__name__}: {e}")
+            return
+
+        self.lag_seconds = lag
+        if lag > settings.DB_REPLICA_MAX_LAG_SECONDS:
+            self.mark_unhealthy(f"Replica lag {lag:.1f}s above threshold")
+        else:
+            self.healthy = True
+            self.last_error = None
+
+    async def run_health_checks(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(settings.DB_REPLICA_HEALTH_INTERVAL_SECONDS)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "last_error": self.last_error,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+            "pinned_clients": len(self._pins),
+        }
+
+
+replica_router = ReplicaRouter()
+
+
+def client_key(request: Request) -> bytes:
+    """Identifica al cliente por su credencial (o IP) para read-your-writes."""
+    identity = request.headers.get("authorization") or (
+        request.client.host if request.client else ""
+    )
+    return hashlib.blake2b(identity.encode("utf-8"), digest_size=16).digest()
+
+
+@event.listens_for(Session, "after_commit")
+def _pin_client_after_commit(session: Session) -> None:
+    key = session.info.get("replica_pin_key")
+    if key is not None:
+        replica_router.pin(key)
+
+
 class Base(DeclarativeBase):
     pass
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
+        if replica_router.enabled:
+            session.info["replica_pin_key"] = client_key(request)
+        yield session
+
+
+def read_sessionmaker(request: Request) -> async_sessionmaker[AsyncSession]:
+    """
+    Fábrica de sesiones para lecturas: el replica cuando está sano, con
+    retraso aceptable y el cliente no escribió recientemente.
+    """
+    if replica_router.use_replica(client_key(request)):
+        return ReplicaSessionLocal
+    return AsyncSessionLocal
+
+
+# Errores que indican un replica caído o inalcanzable
+REPLICA_ERRORS = (
+    sa_exc.InterfaceError,
+    sa_exc.OperationalError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+
+@asynccontextmanager
+async def read_session(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[AsyncSession]:
+    """
+    Abre una sesión de lectura de la fábrica elegida por `read_sessionmaker`.
+
+    Si es el replica, la conexión se toma (con su pre-ping) antes de entregar
+    la sesión: cuando el replica no responde se marca caído y la misma
+    lectura se hace en el primario, en lugar de fallar la petición. Un error
+    de conexión a mitad de la lectura no puede reintentarse aquí; marca el
+    replica caído para las siguientes y se propaga.
+    """
+    if session_factory is ReplicaSessionLocal:
+        async with ReplicaSessionLocal() as session:
+            try:
+                await session.connection()
+            except REPLICA_ERRORS as e:
+                replica_router.mark_unhealthy(f"{type(e).__name__}: {e}")
+                replica_router.primary_fallbacks += 1
+            else:
+                try:
+                    yield session
+                except REPLICA_ERRORS as e:
+                    replica_router.mark_unhealthy(f"{type(e).__name__}: {e}")
+                    raise
+                return
+
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Sesión para endpoints de solo lectura (ver `read_session`)."""
+    async with read_session(read_sessionmaker(request)) as session:
         yield session
@@ -0,0 +1,148 @@
+import asyncio
+import time
+from typing import Optional
+from uuid import UUID
+
+from jose import JWTError
+from sqlalchemy import any_, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.authz_versions import authz_versions
+from app.core.paseto import (
+    PASETO_LOCAL_PREFIX,
+    get_cached_token,
+    is_service_scope_allowed,
+    verify_token,
+)
+from app.core.security import decode_jwt
+from app.models.users import User
+
+
+def _result(
+    token_type: str,
+    claims: Optional[dict] = None,
+    exp_ts: Optional[float] = None,
+    error: Optional[str] = None,
+) -> dict:
+    expires_in = None
+    if exp_ts is not None:
+        expires_in = max(0, int(exp_ts - time.time()))
+    return {
+        "active": error is None,
+        "token_type": token_type,
+        "claims": claims,
+        "expires_in": expires_in,
+        "error": error,
+    }
+
+
+def _paseto_result(payload: dict, exp_ts: Optional[float]) -> dict:
+    if exp_ts is None:
+        return _result("paseto", error="Token has no expiration")
+    if not is_service_scope_allowed(payload):
+        return _result("paseto", error="Scope not allowed")
+    return _result("paseto", claims=payload, exp_ts=exp_ts)
+
+
+def _introspect_paseto(token: str) -> dict:
+    try:
+        payload, exp_ts = verify_token(token)
+    except ValueError as e:
+        return _result("paseto", error=str(e))
+    return _paseto_result(payload, exp_ts)
+
+
+def _introspect_jwt(token: str) -> tuple[dict, Optional[UUID]]:
+    """
+    Valida firma y `exp`. Si son válidos retorna además el usuario del token
+    cuyo estado falta comprobar en la BD (None si ya se resolvió).
+    """
+    try:
+        claims = decode_jwt(token)
+        user_id = UUID(str(claims["sub"]))
+    except JWTError as e:
+        return _result("jwt", error=str(e)), None
+    except (KeyError, ValueError):
+        return _result("jwt", error="Invalid subject"), None
+
+    result = _result("jwt", claims=claims, exp_ts=claims.get("exp"))
+    version = claims.get("ver")
+    if version is None:
+        return result, user_id
+    # Same rule get_current_user applies to stateless access tokens
+    is_current = authz_versions.check(user_id, version)
+    if is_current is None:
+        return result, user_id
+    if not is_current:
+        return _result("jwt", claims=claims, error="Token has been revoked"), None
+    return result, None
+
+
+def _check_user(result: dict, user: Optional[tuple[int, bool]]) -> dict:
+    claims = result["claims"]
+    if user is None:
+        return _result("jwt", claims=claims, error="User not found")
+    version, is_active = user
+    if not is_active:
+        return _result("jwt", claims=claims, error="Inactive user")
+    if claims.get("ver") is not None and claims["ver"] < version:
+        return _result("jwt", claims=claims, error="Token has been revoked")
+    return result
+
+
+async def _load_users(
+    db: AsyncSession, user_ids: list[UUID]
+) -> dict[UUID, tuple[int, bool]]:
+    stmt = select(User.user_id, User.authz_version, User.is_active).where(
+        User.user_id == any_(literal(user_ids, ARRAY(PG_UUID(as_uuid=True))))
+    )
+    users = {}
+    for user_id, version, is_active in await db.execute(stmt):
+        users[user_id] = (version, bool(is_active))
+        authz_versions.record(user_id, version, bool(is_active))
+    return users
+
+
+async def introspect_tokens(db: AsyncSession, tokens: list[str]) -> list[dict]:
+    """
+    Evalúa un lote de tokens PASETO (v4.local) y JWT emitidos por GAC.
+
+    Los tokens repetidos se evalúan una sola vez. Los PASETO ya verificados
+    se resuelven desde el cache de `app.core.paseto`; el resto se descifra
+    concurrentemente en el executor de hilos. Los JWT (HMAC) se validan en
+    línea porque su costo es menor que el de despacharlos a un hilo.
+
+    Un JWT válido solo está activo si su usuario existe, está activo y (en
+    tokens stateless) su `ver` sigue vigente, igual que al autenticar una
+    petición. Se consulta primero la tabla de versiones en memoria y los
+    usuarios que no estén en ella se leen de la BD en una sola consulta.
+    """
+    results: dict[str, dict] = {}
+    pending: list[str] = []
+    unchecked: dict[str, UUID] = {}
+
+    for token in dict.fromkeys(tokens):
+        if token.startswith(PASETO_LOCAL_PREFIX):
+            cached = get_cached_token(token)
+            if cached is not None:
+                results[token] = _paseto_result(*cached)
+            else:
+                pending.append(token)
+        else:
+            results[token], user_id = _introspect_jwt(token)
+            if user_id is not None:
+                unchecked[token] = user_id
+
+    if pending:
+        decoded = await asyncio.gather(
+            *(asyncio.to_thread(_introspect_paseto, token) for token in pending)
+        )
+        results.update(zip(pending, decoded))
+
+    if unchecked:
+        users = await _load_users(db, list(set(unchecked.values())))
+        for token, user_id in unchecked.items():
+            results[token] = _check_user(results[token], users.get(user_id))
+
+    return [results[token] for token in tokens]
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import DateTime, column, or_, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.users import User
+
+logger = logging.getLogger(__name__)
+
+# Cada fila usa 2 parámetros; asyncpg admite hasta 32767 por sentencia
+FLUSH_CHUNK_SIZE = 5000
+
+
+class LastLoginBuffer:
+    """
+    Buffer write-behind para `users.last_login_at`.
+
+    El login solo registra el timestamp en memoria; una tarea en segundo plano
+    lo vuelca periódicamente con un único `UPDATE ... FROM (VALUES ...)` por
+    lote. Si un usuario inicia sesión varias veces entre volcados solo se
+    escribe el último timestamp.
+    """
+
+    def __init__(self, max_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._pending: dict[UUID, datetime] = {}
+        self._flush_requested = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self.flushed_total = 0
+        self.flush_failures = 0
+        self.last_flush_ms = 0.0
+
+    def record(self, user_id: UUID, logged_in_at: datetime) -> None:
+        self._pending[user_id] = logged_in_at
+        if len(self._pending) >= self.max_size:
+            self._flush_requested.set()
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, {}
+            rows = list(batch.items())
+            start = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as session:
+                    for i in range(0, len(rows), FLUSH_CHUNK_SIZE):
+                        await session.execute(
+                            _build_update(rows[i : i + FLUSH_CHUNK_SIZE])
+                        )
+                    await session.commit()
+            except BaseException as e:
+                # Also on cancellation (shutdown): the lifespan's final flush
+                # must still write this batch. Re-running it is harmless, the
+                # UPDATE only moves last_login_at forward.
+                if isinstance(e, Exception):
+                    self.flush_failures += 1
+                # Reencolar sin pisar logins registrados durante el volcado
+                for user_id, logged_in_at in rows:
+                    current = self._pending.get(user_id)
+                    if current is None or current < logged_in_at:
+                        self._pending[user_id] = logged_in_at
+                raise
+
+            self.last_flush_ms = (time.perf_counter() - start) * 1000
+            self.flushed_total += len(rows)
+            return len(rows)
+
+    async def run_flusher(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_requested.wait(), timeout=self.flush_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush last_login_at buffer")
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._pending),
+            "max_size": self.max_size,
+            "flushed_total": self.flushed_total,
+            "flush_failures": self.flush_failures,
+            "last_flush_ms": round(self.last_flush_ms, 2),
+        }
+
+
+def _build_update(rows: list[tuple[UUID, datetime]]):
+    users = User.__table__
+    logins = values(
+        column("user_id", PG_UUID(as_uuid=True)),
+        column("last_login_at", DateTime()),
+        name="logins",
+    ).data(rows)
+    return (
+        update(users)
+        .where(users.c.user_id == logins.c.user_id)
+        .where(
+            or_(
+                users.c.last_login_at.is_(None),
+                users.c.last_login_at < logins.c.last_login_at,
+            )
+        )
+        .values(last_login_at=logins.c.last_login_at)
+    )
+
+
+last_login_buffer = LastLoginBuffer(
+    max_size=settings.LAST_LOGIN_BUFFER_MAX_SIZE,
+    flush_interval=settings.LAST_LOGIN_FLUSH_INTERVAL_SECONDS,
+)
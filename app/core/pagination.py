@@ -0,0 +1,82 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+
+class InvalidCursor(ValueError):
+    """El cursor recibido no fue emitido por esta API o está corrupto."""
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def keyset_stmt(
+    stmt: Select,
+    created_col: InstrumentedAttribute,
+    id_col: InstrumentedAttribute,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Select:
+    """
+    Aplica a `stmt` el filtro del cursor y el orden `(created_at, id)`
+    descendente. Pide una fila extra; `keyset_split` la recorta.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    return stmt.order_by(created_col.desc(), id_col.desc()).limit(limit + 1)
+
+
+def keyset_split(
+    rows: Sequence[Any],
+    created_col: InstrumentedAttribute,
+    id_col: InstrumentedAttribute,
+    limit: int,
+) -> tuple[Sequence[Any], Optional[str]]:
+    """Separa la fila extra y arma el cursor de la página siguiente."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(
+        getattr(last, created_col.key), getattr(last, id_col.key)
+    )
+
+
+async def keyset_page(
+    db: AsyncSession,
+    stmt: Select,
+    created_col: InstrumentedAttribute,
+    id_col: InstrumentedAttribute,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> tuple[Sequence[Any], Optional[str]]:
+    """
+    Ejecuta `stmt` paginado por keyset sobre `(created_at, id)` descendente.
+
+    A diferencia de `OFFSET`, el costo de cada página es constante: la
+    condición `(created_at, id) < cursor` se resuelve con un index range scan
+    sobre el índice compuesto correspondiente. Se pide una fila extra para
+    saber si existe una página siguiente sin un `COUNT(*)`.
+    """
+    stmt = keyset_stmt(stmt, created_col, id_col, limit, cursor)
+    rows = list((await db.execute(stmt)).scalars().all())
+    return keyset_split(rows, created_col, id_col, limit)
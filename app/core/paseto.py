@@ -1,13 +1,215 @@
 import base64
+import binascii
+import hashlib
 import json
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 
 import pyseto
 from pyseto import Key
 
 from app.core.config import settings
 
+PASETO_LOCAL_PREFIX = "v4.local."
+
+VALID_SERVICE_SCOPES = frozenset(
+    {
+        "service-auth",
+        "internal-nexus-admin",
+        "internal-gac-admin",
+        "internal-app-admin",
+    }
+)
+
+
+def _build_key(encoded_secret: str) -> Key:
+    """
+    Construye una clave simétrica v4.local.
+    La clave debe ser de 32 bytes para PASETO v4.local.
+    """
+    # Decodificar la clave desde base64 (debe ser de 32 bytes)
+    secret = base64.b64decode(encoded_secret)
+    if len(secret) < 32:
+        # Pad con ceros si es menor
+        secret = secret.ljust(32, b"\0")
+    elif len(secret) > 32:
+        # Truncar si es mayor
+        secret = secret[:32]
+
+    return Key.new(version=4, purpose="local", key=secret)
+
+
+class PasetoKeyRing:
+    """
+    Conjunto de claves v4.local activas.
+
+    La clave primaria firma los tokens nuevos; las claves anteriores solo se
+    usan para descifrar tokens emitidos antes de una rotación. Si la clave
+    primaria tiene `kid`, se agrega al footer del token para que el
+    descifrado use directamente la clave correcta.
+    """
+
+    def __init__(self, primary_kid: str, primary: Key, previous: dict[str, Key]):
+        self.primary_kid = primary_kid
+        self.primary = primary
+        self._by_kid = {**previous}
+        if primary_kid:
+            self._by_kid[primary_kid] = primary
+        self._all = [primary, *previous.values()]
+        self.footer = (
+            json.dumps({"kid": primary_kid}, separators=(",", ":")).encode("utf-8")
+            if primary_kid
+            else b""
+        )
+
+    def keys_for(self, token: str) -> list[Key]:
+        parts = token.split(".")
+        if len(parts) == 4:
+            try:
+                footer = json.loads(base64.urlsafe_b64decode(parts[3] + "=="))
+                key = self._by_kid.get(footer.get("kid"))
+                if key is not None:
+                    return [key]
+            except (ValueError, AttributeError, binascii.Error):
+                pass
+        return self._all
+
+
+@lru_cache(maxsize=1)
+def get_key_ring() -> PasetoKeyRing:
+    """
+    Construye el key ring una sola vez por proceso.
+
+    PASETO_PREVIOUS_KEYS admite claves anteriores con el formato
+    `kid1:base64key1,kid2:base64key2`.
+    """
+    previous = {}
+    for entry in filter(None, settings.PASETO_PREVIOUS_KEYS.split(",")):
+        kid, _, encoded = entry.strip().partition(":")
+        previous[kid] = _build_key(encoded)
+
+    return PasetoKeyRing(
+        primary_kid=settings.PASETO_KEY_ID,
+        primary=_build_key(settings.PASETO_SECRET_KEY),
+        previous=previous,
+    )
+
+
+class _VerifiedTokenCache:
+    """
+    Cache LRU de payloads ya descifrados, indexado por el digest del token.
+    Cada entrada expira en el `exp` del propio token.
+
+    Protegido con un lock porque la introspección por lotes descifra tokens
+    en hilos del executor.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest: bytes) -> tuple[dict, float] | None:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            exp_ts, payload = entry
+            if exp_ts <= time.time():
+                del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return payload, exp_ts
+
+    def set(self, digest: bytes, payload: dict, exp_ts: float) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[digest] = (exp_ts, payload)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_token_cache = _VerifiedTokenCache(settings.PASETO_DECODE_CACHE_SIZE)
+
+
+def get_token_cache_stats() -> dict:
+    return _token_cache.stats()
+
+
+def _parse_exp(payload: dict) -> float | None:
+    if not isinstance(payload, dict) or "exp" not in payload:
+        return None
+    exp_datetime = datetime.fromisoformat(payload["exp"])
+    if exp_datetime.tzinfo is None:
+        raise ValueError("Token expiration must include a timezone")
+    return exp_datetime.timestamp()
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def get_cached_token(token: str) -> tuple[dict, float] | None:
+    """Retorna (payload, exp) si el token ya fue verificado y sigue vigente."""
+    cached = _token_cache.get(_token_digest(token))
+    if cached is None:
+        return None
+    payload, exp_ts = cached
+    return dict(payload), exp_ts
+
+
+def verify_token(token: str) -> tuple[dict, float | None]:
+    """
+    Descifra un token v4.local y valida su expiración.
+
+    Los tokens con `exp` se guardan en cache hasta que expiran, de modo que
+    validar repetidamente el mismo token no repite el descifrado.
+
+    Returns:
+        Tupla (payload, exp como timestamp UNIX o None si no tiene `exp`)
+
+    Raises:
+        ValueError: Si el token es inválido o ha expirado
+    """
+    digest = _token_digest(token)
+    cached = _token_cache.get(digest)
+    if cached is not None:
+        payload, exp_ts = cached
+        return dict(payload), exp_ts
+
+    try:
+        decoded = pyseto.decode(get_key_ring().keys_for(token), token)
+        payload = json.loads(decoded.payload.decode("utf-8"))
+        exp_ts = _parse_exp(payload)
+    except Exception as e:
+        raise ValueError(f"Invalid token: {str(e)}")
+
+    if exp_ts is not None:
+        if exp_ts < time.time():
+            raise ValueError("Invalid token: Token has expired")
+        _token_cache.set(digest, payload, exp_ts)
+
+    return dict(payload), exp_ts
+
 
 def create_app_token(
     user_id: uuid.UUID, app_name: str = "gac", expires_in_minutes: int = 5
@@ -35,26 +237,14 @@ def create_app_token(
         "exp": exp.isoformat(),
     }
 
-    # Crear clave simétrica para v4.local
-    """
-    Inicializa el generador con la clave secreta de la configuración.
-    La clave debe ser de 32 bytes para PASETO v4.local.
-    """
-    # Decodificar la clave desde base64 (debe ser de 32 bytes)
-    secret = base64.b64decode(settings.PASETO_SECRET_KEY)
-    if len(secret) < 32:
-        # Pad con ceros si es menor
-        secret = secret.ljust(32, b"\0")
-    elif len(secret) > 32:
-        # Truncar si es mayor
-        secret = secret[:32]
-
-    key = Key.new(version=4, purpose="local", key=secret)
+    key_ring = get_key_ring()
 
     # Convertir payload a JSON string para compatibilidad
     payload_json = json.dumps(payload, separators=(",", ":"))
 
-    token = pyseto.encode(key, payload_json.encode("utf-8"))
+    token = pyseto.encode(
+        key_ring.primary, payload_json.encode("utf-8"), footer=key_ring.footer
+    )
 
     return token.decode("utf-8") if isinstance(token, bytes) else token
 
@@ -72,30 +262,8 @@ def decode_app_token(token: str) -> dict:
     Raises:
         ValueError: Si el token es inválido o ha expirado
     """
-    try:
-        # Decodificar la clave desde base64 (debe ser de 32 bytes)
-        secret = base64.b64decode(settings.PASETO_SECRET_KEY)
-        if len(secret) < 32:
-            secret = secret.ljust(32, b"\0")
-        elif len(secret) > 32:
-            secret = secret[:32]
-
-        key = Key.new(version=4, purpose="local", key=secret)
-        decoded = pyseto.decode(key, token)
-
-        # Decodificar el payload como hace el otro API
-        payload = json.loads(decoded.payload.decode("utf-8"))
-
-        # Verificar expiración
-        if isinstance(payload, dict) and "exp" in payload:
-            exp_datetime = datetime.fromisoformat(payload["exp"])
-            if exp_datetime < datetime.now(timezone.utc):
-                raise ValueError("Token has expired")
-
-        return payload
-
-    except Exception as e:
-        raise ValueError(f"Invalid token: {str(e)}")
+    payload, _ = verify_token(token)
+    return payload
 
 
 def refresh_app_token(
@@ -123,10 +291,19 @@ def refresh_app_token(
         raise ValueError(f"Cannot refresh token: {str(e)}")
 
 
+def is_service_scope_allowed(payload: dict) -> bool:
+    scope = payload.get("scope")
+    if scope and scope not in VALID_SERVICE_SCOPES:
+        # Ser más flexible: si tiene service="gac", aceptar cualquier scope que empiece con "internal"
+        return payload.get("service") == "gac" and scope.startswith("internal")
+    return True
+
+
 def decode_service_token(
     token: str,
     required_service: str | None = None,
     required_role: str | None = None,
+    required_scope: str | None = None,
 ) -> dict | None:
     """
     Decodifica y valida un token PASETO de servicio (compatible con otros servicios).
@@ -135,43 +312,20 @@ def decode_service_token(
         token: Token PASETO a decodificar
         required_service: Si se proporciona, valida que el service coincida
         required_role: Si se proporciona, valida que el role coincida
+        required_scope: Si se proporciona, valida que el scope coincida
 
     Returns:
         dict: Payload del token si es válido, None si es inválido o expirado
     """
     try:
-        # Decodificar la clave desde base64 (debe ser de 32 bytes)
-        secret = base64.b64decode(settings.PASETO_SECRET_KEY)
-        if len(secret) < 32:
-            secret = secret.ljust(32, b"\0")
-        elif len(secret) > 32:
-            secret = secret[:32]
-
-        key = Key.new(version=4, purpose="local", key=secret)
-        decoded = pyseto.decode(key, token)
-
-        # Decodificar el payload como JSON (compatible con otros servicios)
-        payload = json.loads(decoded.payload.decode("utf-8"))
-
-        # Validar expiración
-        exp = datetime.fromisoformat(payload["exp"])
-        if datetime.now(timezone.utc) > exp:
+        payload, exp_ts = verify_token(token)
+        if exp_ts is None:
             return None
 
         # Validar scope - aceptar scopes de servicio válidos
-        valid_service_scopes = {
-            "service-auth",
-            "internal-nexus-admin",
-            "internal-gac-admin",
-            "internal-app-admin",
-        }
+        if not is_service_scope_allowed(payload):
+            return None
         scope = payload.get("scope")
-        if scope and scope not in valid_service_scopes:
-            # Ser más flexible: si tiene service="gac", aceptar cualquier scope que empiece con "internal"
-            if payload.get("service") == "gac" and scope.startswith("internal"):
-                pass  # Aceptar
-            else:
-                return None
 
         # Validar service si se requiere
         if required_service and payload.get("service") != required_service:
@@ -181,6 +335,10 @@ def decode_service_token(
         if required_role and payload.get("role") != required_role:
             return None
 
+        # Validar scope si se requiere
+        if required_scope and scope != required_scope:
+            return None
+
         return payload
 
     except Exception:
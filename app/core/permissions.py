@@ -0,0 +1,145 @@
+import asyncio
+import logging
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.users import Permission, Role, RolePermission
+
+logger = logging.getLogger(__name__)
+
+# Registro append-only: la posición de cada permiso es su bit en las máscaras.
+# Agregar siempre al final y no reordenar ni reutilizar posiciones.
+PERMISSIONS: tuple[tuple[str, str], ...] = (
+    ("users:read", "Consultar usuarios"),
+    ("users:write", "Crear, modificar y desactivar usuarios"),
+    ("roles:read", "Consultar roles y sus permisos"),
+    ("roles:write", "Crear y asignar roles y editar sus permisos"),
+    ("exports:read", "Exportaciones masivas de órdenes, pagos y envíos"),
+    ("internal:read", "Métricas y diagnóstico internos"),
+    ("internal:tokens", "Emitir, refrescar e inspeccionar tokens de servicio"),
+)
+PERMISSION_BITS: dict[str, int] = {
+    name: 1 << bit for bit, (name, _) in enumerate(PERMISSIONS)
+}
+ALL_PERMISSIONS = (1 << len(PERMISSIONS)) - 1
+
+# Tiene todos los permisos sin necesidad de filas en role_permissions
+SUPERUSER_ROLE = "admin"
+
+# Combinaciones de roles distintas cacheadas por worker antes de vaciar el cache
+MAX_ROLE_COMBINATIONS = 1024
+
+
+def permission_mask(names: Iterable[str]) -> int:
+    """Máscara con los bits de `names`; ValueError si alguno no está registrado."""
+    names = list(names)
+    unknown = sorted(name for name in names if name not in PERMISSION_BITS)
+    if unknown:
+        raise ValueError(f"Unknown permissions: {', '.join(unknown)}")
+    mask = 0
+    for name in names:
+        mask |= PERMISSION_BITS[name]
+    return mask
+
+
+def permission_names(mask: int) -> list[str]:
+    return [name for name, bit in PERMISSION_BITS.items() if mask & bit]
+
+
+class PermissionTable:
+    """
+    Permisos de cada rol compilados a máscaras de bits.
+
+    Se carga al arrancar desde `role_permissions` y se recarga completa de
+    forma periódica (y en el worker que edita los permisos de un rol). La
+    máscara de un principal se calcula una vez por combinación de roles y se
+    cachea por el `frozenset` de roles, así que autorizar una petición es un
+    lookup y un AND.
+    """
+
+    def __init__(self):
+        self._role_masks: dict[str, int] = {SUPERUSER_ROLE: ALL_PERMISSIONS}
+        self._combined: dict[frozenset[str], int] = {}
+        self.synced = False
+        self.loaded = False
+        self.refreshes = 0
+
+    def mask_of(self, roles: frozenset[str]) -> int:
+        mask = self._combined.get(roles)
+        if mask is None:
+            mask = 0
+            for role in roles:
+                mask |= self._role_masks.get(role, 0)
+            if len(self._combined) >= MAX_ROLE_COMBINATIONS:
+                self._combined = {}
+            self._combined[roles] = mask
+        return mask
+
+    def has(self, roles: frozenset[str], required: int) -> bool:
+        return (self.mask_of(roles) & required) == required
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Inserta en `permissions` los permisos registrados que aún no existan."""
+        stmt = pg_insert(Permission).values(
+            [
+                {"name": name, "description": description}
+                for name, description in PERMISSIONS
+            ]
+        )
+        await db.execute(stmt.on_conflict_do_nothing(index_elements=[Permission.name]))
+
+    async def refresh(self, db: AsyncSession) -> None:
+        stmt = (
+            select(Role.name, Permission.name)
+            .join(RolePermission, RolePermission.role_id == Role.role_id)
+            .join(Permission, Permission.permission_id == RolePermission.permission_id)
+        )
+        role_masks: dict[str, int] = {}
+        unknown = set()
+        for role_name, permission_name in await db.execute(stmt):
+            bit = PERMISSION_BITS.get(permission_name)
+            if bit is None:
+                unknown.add(permission_name)
+                continue
+            role_masks[role_name] = role_masks.get(role_name, 0) | bit
+        if unknown:
+            logger.warning("Ignoring unregistered permissions: %s", sorted(unknown))
+        role_masks[SUPERUSER_ROLE] = ALL_PERMISSIONS
+
+        self._role_masks = role_masks
+        self._combined = {}
+        self.loaded = True
+        self.refreshes += 1
+
+    async def load(self) -> None:
+        async with AsyncSessionLocal() as session:
+            if not self.synced:
+                await self.sync(session)
+                await session.commit()
+                self.synced = True
+            await self.refresh(session)
+
+    async def run_refresher(self) -> None:
+        # The initial load happens in the app lifespan
+        while True:
+            await asyncio.sleep(settings.PERMISSION_REFRESH_SECONDS)
+            try:
+                await self.load()
+            except Exception:
+                logger.exception("Failed to refresh role permissions")
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self.loaded,
+            "roles": len(self._role_masks),
+            "role_combinations": len(self._combined),
+            "refreshes": self.refreshes,
+        }
+
+
+permission_table = PermissionTable()
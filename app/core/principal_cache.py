@@ -0,0 +1,125 @@
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+from uuid import UUID
+
+from app.core.config import settings
+
+
+class Principal:
+    """
+    Representación compacta del usuario autenticado.
+
+    Solo contiene lo necesario para autorizar una petición, de modo que
+    puede cachearse entre peticiones sin mantener instancias ORM vivas.
+    """
+
+    __slots__ = ("user_id", "is_active", "roles")
+
+    is_service = False
+
+    def __init__(self, user_id: UUID | None, is_active: bool, roles: Iterable[str]):
+        self.user_id = user_id
+        self.is_active = is_active
+        self.roles = frozenset(roles)
+
+    def __repr__(self) -> str:
+        return f"Principal(user_id={self.user_id}, roles={sorted(self.roles)})"
+
+
+class ServicePrincipal(Principal):
+    """
+    Servicio autenticado con un token PASETO v4.local (sin acceso a BD).
+
+    `roles` contiene únicamente el `role` del token (p. ej. `GAC_ADMIN`), por
+    lo que nunca coincide con los roles de usuario como `admin`. `user_id`
+    solo se toma de `internal_id` en tokens emitidos por GAC, ya que en otros
+    servicios ese identificador no corresponde a un usuario de esta base.
+    """
+
+    __slots__ = ("service", "scope")
+
+    is_service = True
+
+    def __init__(self, payload: dict):
+        user_id = None
+        if payload.get("service") == "gac" and payload.get("internal_id"):
+            try:
+                user_id = UUID(payload["internal_id"])
+            except ValueError:
+                user_id = None
+        role = payload.get("role")
+        super().__init__(user_id=user_id, is_active=True, roles=[role] if role else [])
+        self.service = payload.get("service")
+        self.scope = payload.get("scope")
+
+    def __repr__(self) -> str:
+        return f"ServicePrincipal(service={self.service}, roles={sorted(self.roles)})"
+
+
+class PrincipalCache:
+    """
+    Cache LRU con TTL de principals indexados por el `sub` del token.
+
+    El cache es local al proceso: cada worker de uvicorn mantiene el suyo y
+    la invalidación explícita solo afecta al worker que la ejecuta, por lo
+    que el TTL acota el tiempo máximo de datos obsoletos en los demás.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, Principal]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, subject: str) -> Optional[Principal]:
+        entry = self._entries.get(subject)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, principal = entry
+        if expires_at < time.monotonic():
+            del self._entries[subject]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(subject)
+        self.hits += 1
+        return principal
+
+    def set(self, subject: str, principal: Principal) -> None:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+
+        self._entries[subject] = (time.monotonic() + self.ttl_seconds, principal)
+        self._entries.move_to_end(subject)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, user_id: UUID | str) -> None:
+        self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,172 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+class LimiterBackend(ABC):
+    """
+    Almacenamiento del limitador de login.
+
+    La interfaz es asíncrona para poder sustituir la implementación en
+    memoria por una compartida entre instancias sin tocar a los llamadores.
+    """
+
+    @abstractmethod
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """Consume un token del bucket; retorna 0 o los segundos a esperar."""
+
+    @abstractmethod
+    async def locked_for(self, key: str) -> float:
+        """Segundos restantes de bloqueo para la clave (0 si no está bloqueada)."""
+
+    @abstractmethod
+    async def add_failure(self, key: str) -> int:
+        """Registra un fallo consecutivo y retorna el total acumulado."""
+
+    @abstractmethod
+    async def lock(self, key: str, seconds: float) -> None:
+        """Bloquea la clave durante `seconds`."""
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """Olvida fallos y bloqueo de la clave (login exitoso)."""
+
+
+class InMemoryLimiterBackend(LimiterBackend):
+    """
+    Backend local al proceso con número de claves acotado (LRU), para que
+    una ráfaga con emails aleatorios no haga crecer la memoria sin límite.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self._failures: OrderedDict[str, list[float]] = OrderedDict()
+
+    def _touch(self, store: OrderedDict, key: str, default: list[float]) -> list:
+        entry = store.get(key)
+        if entry is None:
+            entry = store[key] = default
+            while len(store) > self.max_keys:
+                store.popitem(last=False)
+        else:
+            store.move_to_end(key)
+        return entry
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        now = time.monotonic()
+        bucket = self._touch(self._buckets, key, [capacity, now])
+        tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill_per_second)
+        bucket[1] = now
+        if tokens >= 1:
+            bucket[0] = tokens - 1
+            return 0.0
+        bucket[0] = tokens
+        return (1 - tokens) / refill_per_second
+
+    async def locked_for(self, key: str) -> float:
+        entry = self._failures.get(key)
+        if entry is None:
+            return 0.0
+        return max(0.0, entry[1] - time.monotonic())
+
+    async def add_failure(self, key: str) -> int:
+        entry = self._touch(self._failures, key, [0, 0.0])
+        entry[0] += 1
+        return int(entry[0])
+
+    async def lock(self, key: str, seconds: float) -> None:
+        entry = self._touch(self._failures, key, [0, 0.0])
+        entry[1] = time.monotonic() + seconds
+
+    async def reset(self, key: str) -> None:
+        self._failures.pop(key, None)
+
+
+class LoginRateLimiter:
+    """
+    Limita intentos de login antes de que se ejecute argon2.
+
+    - Token bucket por email y por IP de origen.
+    - Bloqueo exponencial por email tras `LOGIN_LOCKOUT_THRESHOLD` fallos
+      consecutivos: base * 2^(fallos - umbral), acotado por el máximo.
+    """
+
+    def __init__(self, backend: LimiterBackend):
+        self.backend = backend
+        self.allowed = 0
+        self.rejected_rate = 0
+        self.rejected_lockout = 0
+        self.failures = 0
+        self.lockouts = 0
+
+    async def check(self, email: str, client_ip: Optional[str]) -> float:
+        """Retorna 0 si el intento puede continuar, o los segundos a esperar."""
+        if not settings.LOGIN_RATE_LIMIT_ENABLED:
+            return 0.0
+
+        email_key = email.strip().lower()
+        locked = await self.backend.locked_for(f"lock:{email_key}")
+        if locked > 0:
+            self.rejected_lockout += 1
+            return locked
+
+        if client_ip:
+            wait = await self.backend.take(
+                f"ip:{client_ip}",
+                settings.LOGIN_RATE_IP_BURST,
+                settings.LOGIN_RATE_IP_PER_MINUTE / 60,
+            )
+            if wait > 0:
+                self.rejected_rate += 1
+                return wait
+
+        wait = await self.backend.take(
+            f"email:{email_key}",
+            settings.LOGIN_RATE_EMAIL_BURST,
+            settings.LOGIN_RATE_EMAIL_PER_MINUTE / 60,
+        )
+        if wait > 0:
+            self.rejected_rate += 1
+            return wait
+
+        self.allowed += 1
+        return 0.0
+
+    async def record_failure(self, email: str) -> None:
+        if not settings.LOGIN_RATE_LIMIT_ENABLED:
+            return
+
+        self.failures += 1
+        key = f"lock:{email.strip().lower()}"
+        failures = await self.backend.add_failure(key)
+        if failures >= settings.LOGIN_LOCKOUT_THRESHOLD:
+            exponent = min(failures - settings.LOGIN_LOCKOUT_THRESHOLD, 16)
+            seconds = min(
+                settings.LOGIN_LOCKOUT_BASE_SECONDS * 2**exponent,
+                settings.LOGIN_LOCKOUT_MAX_SECONDS,
+            )
+            await self.backend.lock(key, seconds)
+            self.lockouts += 1
+
+    async def record_success(self, email: str) -> None:
+        if settings.LOGIN_RATE_LIMIT_ENABLED:
+            await self.backend.reset(f"lock:{email.strip().lower()}")
+
+    def stats(self) -> dict:
+        return {
+            "enabled": settings.LOGIN_RATE_LIMIT_ENABLED,
+            "allowed": self.allowed,
+            "rejected_rate": self.rejected_rate,
+            "rejected_lockout": self.rejected_lockout,
+            "failures": self.failures,
+            "lockouts": self.lockouts,
+        }
+
+
+login_limiter = LoginRateLimiter(
+    InMemoryLimiterBackend(max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS)
+)
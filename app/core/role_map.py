@@ -0,0 +1,54 @@
+import time
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.users import Role
+
+
+class RoleMap:
+    """
+    Cache en memoria `nombre de rol -> role_id`.
+
+    Los roles casi nunca cambian, así que resolver nombres no debería costar
+    una consulta por petición. La tabla se recarga completa cuando vence el
+    TTL o cuando se pide un nombre desconocido (p. ej. un rol recién creado
+    en otro worker); un nombre que sigue sin existir tras recargar se ignora.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._ids: dict[str, UUID] = {}
+        self._expires_at = 0.0
+        self.reloads = 0
+
+    async def _reload(self, db: AsyncSession) -> None:
+        result = await db.execute(select(Role.name, Role.role_id))
+        self._ids = {name: role_id for name, role_id in result}
+        self._expires_at = time.monotonic() + self.ttl_seconds
+        self.reloads += 1
+
+    async def resolve(self, db: AsyncSession, names: Iterable[str]) -> dict[str, UUID]:
+        names = list(dict.fromkeys(names))
+        if not names:
+            return {}
+        if time.monotonic() >= self._expires_at or any(
+            name not in self._ids for name in names
+        ):
+            await self._reload(db)
+        return {name: self._ids[name] for name in names if name in self._ids}
+
+    def add(self, name: str, role_id: UUID) -> None:
+        self._ids[name] = role_id
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+    def stats(self) -> dict:
+        return {"size": len(self._ids), "reloads": self.reloads}
+
+
+role_map = RoleMap(ttl_seconds=settings.ROLE_MAP_TTL_SECONDS)
@@ -1,10 +1,34 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Iterable, Optional, TypeVar, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+
+def _argon2_options() -> dict:
+    """Parámetros argon2 configurados; los no definidos usan el default de la librería."""
+    options = {
+        "argon2__time_cost": settings.ARGON2_TIME_COST,
+        "argon2__memory_cost": settings.ARGON2_MEMORY_COST,
+        "argon2__parallelism": settings.ARGON2_PARALLELISM,
+    }
+    return {key: value for key, value in options.items() if value is not None}
+
+
+# Hashes with other parameters are reported by needs_update and rehashed on login
+pwd_context = CryptContext(schemes=["argon2"], deprecated="auto", **_argon2_options())
+
+T = TypeVar("T")
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Se lanza cuando la cola de hashing está llena (demasiados logins en curso)."""
+
+
+_hash_executor: Optional[Executor] = None
+_pending_hash_jobs = 0
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -15,8 +39,103 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def get_password_hashes(passwords: list[str]) -> list[str]:
+    # One executor job per chunk: pickling overhead is paid once per chunk
+    return [pwd_context.hash(password) for password in passwords]
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    return pwd_context.needs_update(hashed_password)
+
+
+def _get_hash_executor() -> Optional[Executor]:
+    """
+    Retorna el pool de procesos para argon2, creándolo en el primer uso.
+    Con PASSWORD_HASH_WORKERS=0 se usa el executor de hilos por defecto del loop.
+    """
+    global _hash_executor
+    if _hash_executor is None and settings.PASSWORD_HASH_WORKERS > 0:
+        _hash_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return _hash_executor
+
+
+async def _run_hash_job(func: Callable[..., T], *args: Any) -> T:
+    global _pending_hash_jobs
+    if _pending_hash_jobs >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHasherBusy("Password hashing queue is full")
+
+    _pending_hash_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_hash_executor(), func, *args)
+    finally:
+        _pending_hash_jobs -= 1
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifica la contraseña fuera del event loop (pool de procesos)."""
+    return await _run_hash_job(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    """Genera el hash argon2 fuera del event loop (pool de procesos)."""
+    return await _run_hash_job(get_password_hash, password)
+
+
+async def hash_passwords_async(passwords: list[str]) -> list[str]:
+    """
+    Hashea un lote de contraseñas repartido entre los workers del pool.
+
+    Se divide en a lo sumo `2 * PASSWORD_HASH_WORKERS` trabajos (y nunca más
+    de la mitad de `PASSWORD_HASH_MAX_PENDING`, para dejar cola a los logins),
+    así el tiempo total queda acotado por el throughput de argon2 en todos los
+    cores. Conserva el orden de `passwords`.
+    """
+    if not passwords:
+        return []
+    jobs = max(
+        1,
+        min(
+            len(passwords),
+            2 * max(settings.PASSWORD_HASH_WORKERS, 1),
+            settings.PASSWORD_HASH_MAX_PENDING // 2,
+        ),
+    )
+    size = -(-len(passwords) // jobs)
+    chunks = await asyncio.gather(
+        *(
+            _run_hash_job(get_password_hashes, passwords[start : start + size])
+            for start in range(0, len(passwords), size)
+        )
+    )
+    return [password_hash for chunk in chunks for password_hash in chunk]
+
+
+def get_hash_pool_stats() -> dict:
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "pending": _pending_hash_jobs,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+    }
+
+
+def shutdown_hash_executor() -> None:
+    global _hash_executor
+    if _hash_executor is not None:
+        _hash_executor.shutdown(wait=True, cancel_futures=True)
+        _hash_executor = None
+
+
+def decode_jwt(token: str) -> dict:
+    """Valida firma y expiración de un JWT emitido por GAC (lanza JWTError)."""
+    return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+
+
 def create_access_token(
-    subject: Union[str, Any], expires_delta: timedelta = None
+    subject: Union[str, Any],
+    expires_delta: timedelta = None,
+    roles: Optional[Iterable[str]] = None,
+    authz_version: Optional[int] = None,
 ) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -26,6 +145,10 @@ def create_access_token(
         )
 
     to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
+    # Stateless mode: embed what get_current_user needs so it can skip the DB
+    if roles is not None and authz_version is not None:
+        to_encode["roles"] = sorted(roles)
+        to_encode["ver"] = authz_version
     encoded_jwt = jwt.encode(
         to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM
     )
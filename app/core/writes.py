@@ -0,0 +1,33 @@
+from typing import Any, Optional, Sequence, TypeVar
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ModelT = TypeVar("ModelT")
+
+
+def insert_stmt(model, values: dict, conflict: Optional[Sequence[Any]] = None):
+    """`INSERT ... [ON CONFLICT (conflict) DO NOTHING] RETURNING model`."""
+    stmt = pg_insert(model).values(**values)
+    if conflict is not None:
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict))
+    return stmt.returning(model)
+
+
+async def insert_returning(
+    db: AsyncSession,
+    model: type[ModelT],
+    values: dict,
+    conflict: Optional[Sequence[Any]] = None,
+) -> Optional[ModelT]:
+    """
+    Inserta una fila y la devuelve como instancia ORM en una sola ida y vuelta.
+
+    `RETURNING` trae los valores que asigna el servidor (`created_at`,
+    defaults), así que no hace falta `refresh` después del commit: las
+    sesiones usan `expire_on_commit=False`. Con `conflict` (columnas o
+    expresiones de un índice único) un duplicado no aborta la transacción
+    con `IntegrityError`: no se inserta nada y se retorna None.
+    """
+    result = await db.scalars(insert_stmt(model, values, conflict))
+    return result.one_or_none()
@@ -1,10 +1,18 @@
-from fastapi import FastAPI
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import exc as sa_exc
 
 from app.api.v1 import (
     orders,
     payments,
     shipments,
+    clients,
+    exports,
     products,
     devices,
     auth,
@@ -12,6 +20,49 @@ from app.api.v1 import (
     users,
     internal,
 )
+from app.core.authz_versions import authz_versions
+from app.core.config import settings
+from app.core.database import replica_router
+from app.core.last_login import last_login_buffer
+from app.core.paseto import get_key_ring
+from app.core.permissions import permission_table
+from app.core.security import PasswordHasherBusy, shutdown_hash_executor
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Fail fast on malformed PASETO keys instead of on the first request
+    get_key_ring()
+
+    try:
+        await permission_table.load()
+    except Exception:
+        # Until the table loads only the superuser role passes permission checks
+        logger.exception("Could not load role permissions, retrying in background")
+
+    background_tasks = [
+        asyncio.create_task(last_login_buffer.run_flusher()),
+        asyncio.create_task(permission_table.run_refresher()),
+    ]
+    if replica_router.enabled:
+        background_tasks.append(asyncio.create_task(replica_router.run_health_checks()))
+    if settings.STATELESS_ACCESS_TOKENS:
+        background_tasks.append(asyncio.create_task(authz_versions.run_refresher()))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    try:
+        await last_login_buffer.flush()
+    except Exception:
+        logger.exception("Could not flush last_login_at buffer on shutdown")
+    shutdown_hash_executor()
+
 
 app = FastAPI(
     title="GAC API",
@@ -20,6 +71,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
 # CORS Configuration
@@ -43,10 +95,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"message": "Service busy, try again later", "error": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(sa_exc.TimeoutError)
+async def db_pool_timeout_handler(request: Request, exc: sa_exc.TimeoutError):
+    # Fail fast when no connection frees up within DB_POOL_TIMEOUT
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={
+            "message": "Database busy, try again later",
+            "error": "Connection pool exhausted",
+        },
+        headers={"Retry-After": "1"},
+    )
+
+
 # Include Routers
 app.include_router(orders.router, prefix="/api/v1", tags=["orders"])
 app.include_router(payments.router, prefix="/api/v1", tags=["payments"])
 app.include_router(shipments.router, prefix="/api/v1", tags=["shipments"])
+app.include_router(clients.router, prefix="/api/v1", tags=["clients"])
+app.include_router(exports.router, prefix="/api/v1", tags=["exports"])
 app.include_router(products.router, prefix="/api/v1", tags=["products"])
 app.include_router(devices.router, prefix="/api/v1", tags=["devices"])
 app.include_router(auth.router, prefix="/api/v1", tags=["auth"])
@@ -1,4 +1,11 @@
-from .users import User as User, Role as Role, UserRole as UserRole
+from .users import (
+    User as User,
+    Role as Role,
+    UserRole as UserRole,
+    Permission as Permission,
+    RolePermission as RolePermission,
+)
 from .orders import Order as Order, OrderItem as OrderItem
 from .payments import Payment as Payment
 from .shipments import Shipment as Shipment
+from .client_balances import ClientBalance as ClientBalance
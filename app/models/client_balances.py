@@ -0,0 +1,35 @@
+from __future__ import annotations
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+from sqlalchemy import Integer, Numeric, func
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from app.core.database import Base
+
+
+class ClientBalance(Base):
+    """
+    Agregados por cliente mantenidos incrementalmente en la misma transacción
+    que crea órdenes y pagos (ver `BalanceService`).
+    """
+
+    __tablename__ = "client_balances"
+    __table_args__ = {"schema": "gac"}
+
+    client_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), primary_key=True)
+    orders_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    orders_total: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0, server_default="0"
+    )
+    payments_pending: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0, server_default="0"
+    )
+    payments_confirmed: Mapped[Decimal] = mapped_column(
+        Numeric(14, 2), nullable=False, default=0, server_default="0"
+    )
+    updated_at: Mapped[datetime | None] = mapped_column(
+        server_default=func.now(), onupdate=func.now()
+    )
@@ -3,7 +3,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
-from sqlalchemy import String, Integer, ForeignKey, Text, Numeric, func
+from sqlalchemy import String, Integer, ForeignKey, Index, Text, Numeric, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from app.core.database import Base
@@ -15,7 +15,13 @@ if TYPE_CHECKING:
 
 class Order(Base):
     __tablename__ = "orders"
-    __table_args__ = {"schema": "gac"}
+    __table_args__ = (
+        # Keyset pagination of /clients/{client_id}/orders
+        Index("ix_orders_client_created", "client_id", "created_at", "order_id"),
+        # Exports filtered only by date range
+        Index("ix_orders_created", "created_at", "order_id"),
+        {"schema": "gac"},
+    )
 
     order_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -23,16 +29,17 @@ class Order(Base):
         default=uuid4,
         server_default=func.gen_random_uuid(),
     )
-    client_id: Mapped[UUID] = mapped_column(
-        PG_UUID(as_uuid=True), nullable=False, index=True
-    )
+    client_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
     created_by: Mapped[UUID | None] = mapped_column(ForeignKey("gac.users.user_id"))
     status: Mapped[str] = mapped_column(
         String(50), nullable=False
     )  # Check constraint handled in DB or Pydantic
     total_amount: Mapped[Decimal | None] = mapped_column(Numeric(12, 2), default=0)
     notes: Mapped[str | None] = mapped_column(Text)
-    created_at: Mapped[datetime | None] = mapped_column(server_default=func.now())
+    # NOT NULL: keyset pagination orders by (created_at, id)
+    created_at: Mapped[datetime] = mapped_column(
+        nullable=False, server_default=func.now()
+    )
     updated_at: Mapped[datetime | None] = mapped_column(
         server_default=func.now(), onupdate=func.now()
     )
@@ -46,7 +53,11 @@ class Order(Base):
 
 class OrderItem(Base):
     __tablename__ = "order_items"
-    __table_args__ = {"schema": "gac"}
+    __table_args__ = (
+        # Items of an order already sorted (selectinload, exports)
+        Index("ix_order_items_order_created", "order_id", "created_at"),
+        {"schema": "gac"},
+    )
 
     item_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -57,7 +68,6 @@ class OrderItem(Base):
     order_id: Mapped[UUID] = mapped_column(
         ForeignKey("gac.orders.order_id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     device_id: Mapped[UUID | None] = mapped_column(PG_UUID(as_uuid=True))
     product_key: Mapped[str | None] = mapped_column(String(50))
@@ -3,7 +3,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
-from sqlalchemy import String, ForeignKey, Numeric, func
+from sqlalchemy import String, ForeignKey, Index, Numeric, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from app.core.database import Base
@@ -14,7 +14,20 @@ if TYPE_CHECKING:
 
 class Payment(Base):
     __tablename__ = "payments"
-    __table_args__ = {"schema": "gac"}
+    __table_args__ = (
+        # Keyset pagination of /clients/{client_id}/payments
+        Index("ix_payments_client_created", "client_id", "created_at", "payment_id"),
+        # Exports filtered only by date range
+        Index("ix_payments_created", "created_at", "payment_id"),
+        # Duplicate check of payment imports
+        Index(
+            "ix_payments_client_transaction_ref",
+            "client_id",
+            "transaction_ref",
+            postgresql_where=text("transaction_ref IS NOT NULL"),
+        ),
+        {"schema": "gac"},
+    )
 
     payment_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -25,9 +38,7 @@ class Payment(Base):
     order_id: Mapped[UUID | None] = mapped_column(
         ForeignKey("gac.orders.order_id"), index=True
     )
-    client_id: Mapped[UUID] = mapped_column(
-        PG_UUID(as_uuid=True), nullable=False, index=True
-    )
+    client_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
     amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
     method: Mapped[str] = mapped_column(
         String(50), nullable=False
@@ -37,6 +48,9 @@ class Payment(Base):
     )  # pending, confirmed, failed
     transaction_ref: Mapped[str | None] = mapped_column(String(255))
     paid_at: Mapped[datetime | None] = mapped_column()
-    created_at: Mapped[datetime | None] = mapped_column(server_default=func.now())
+    # NOT NULL: keyset pagination orders by (created_at, id)
+    created_at: Mapped[datetime] = mapped_column(
+        nullable=False, server_default=func.now()
+    )
 
     order: Mapped["Order"] = relationship(back_populates="payments")
@@ -2,7 +2,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
-from sqlalchemy import String, ForeignKey, func
+from sqlalchemy import String, ForeignKey, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from app.core.database import Base
@@ -13,7 +13,13 @@ if TYPE_CHECKING:
 
 class Shipment(Base):
     __tablename__ = "shipments"
-    __table_args__ = {"schema": "gac"}
+    __table_args__ = (
+        # Keyset pagination of /clients/{client_id}/shipments
+        Index("ix_shipments_client_created", "client_id", "created_at", "shipment_id"),
+        # Exports filtered only by date range
+        Index("ix_shipments_created", "created_at", "shipment_id"),
+        {"schema": "gac"},
+    )
 
     shipment_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -26,12 +32,15 @@ class Shipment(Base):
     )
     client_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), nullable=False)
     shipping_carrier: Mapped[str | None] = mapped_column(String(100))
-    tracking_number: Mapped[str | None] = mapped_column(String(255))
+    tracking_number: Mapped[str | None] = mapped_column(String(255), index=True)
     status: Mapped[str | None] = mapped_column(
         String(50)
     )  # pending, packed, shipped, delivered
     address: Mapped[dict | None] = mapped_column(JSONB)
-    created_at: Mapped[datetime | None] = mapped_column(server_default=func.now())
+    # NOT NULL: keyset pagination orders by (created_at, id)
+    created_at: Mapped[datetime] = mapped_column(
+        nullable=False, server_default=func.now()
+    )
     updated_at: Mapped[datetime | None] = mapped_column(
         server_default=func.now(), onupdate=func.now()
     )
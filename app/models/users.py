@@ -1,7 +1,7 @@
 from __future__ import annotations
 from datetime import datetime
 from uuid import UUID, uuid4
-from sqlalchemy import String, Boolean, ForeignKey, Text, func
+from sqlalchemy import String, Boolean, ForeignKey, Index, Integer, Text, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 from app.core.database import Base
@@ -9,7 +9,13 @@ from app.core.database import Base
 
 class User(Base):
     __tablename__ = "users"
-    __table_args__ = {"schema": "gac"}
+    __table_args__ = (
+        # Keyset pagination of /users
+        Index("ix_users_created", "created_at", "user_id"),
+        # Emails are unique and looked up case-insensitively
+        Index("ix_users_email_lower", text("lower(email)"), unique=True),
+        {"schema": "gac"},
+    )
 
     user_id: Mapped[UUID] = mapped_column(
         PG_UUID(as_uuid=True),
@@ -17,14 +23,21 @@ class User(Base):
         default=uuid4,
         server_default=func.gen_random_uuid(),
     )
-    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
+    email: Mapped[str] = mapped_column(String(255), nullable=False)
     password_hash: Mapped[str] = mapped_column(Text, nullable=False)
     full_name: Mapped[str | None] = mapped_column(String(255))
     is_active: Mapped[bool | None] = mapped_column(Boolean, default=True)
-    created_at: Mapped[datetime | None] = mapped_column(server_default=func.now())
+    # NOT NULL: keyset pagination orders by (created_at, id)
+    created_at: Mapped[datetime] = mapped_column(
+        nullable=False, server_default=func.now()
+    )
     last_login_at: Mapped[datetime | None] = mapped_column(
         server_default=None, nullable=True
     )
+    # Incrementado en cada cambio de roles o desactivación (tokens stateless)
+    authz_version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
 
     roles: Mapped[list[Role]] = relationship(
         secondary="gac.user_roles", back_populates="users"
@@ -50,7 +63,11 @@ class Role(Base):
 
 class UserRole(Base):
     __tablename__ = "user_roles"
-    __table_args__ = {"schema": "gac"}
+    __table_args__ = (
+        # The primary key covers lookups by user; this one covers them by role
+        Index("ix_user_roles_role_id", "role_id"),
+        {"schema": "gac"},
+    )
 
     user_id: Mapped[UUID] = mapped_column(
         ForeignKey("gac.users.user_id", ondelete="CASCADE"), primary_key=True
@@ -58,3 +75,31 @@ class UserRole(Base):
     role_id: Mapped[UUID] = mapped_column(
         ForeignKey("gac.roles.role_id", ondelete="CASCADE"), primary_key=True
     )
+
+
+class Permission(Base):
+    __tablename__ = "permissions"
+    __table_args__ = {"schema": "gac"}
+
+    permission_id: Mapped[UUID] = mapped_column(
+        PG_UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid4,
+        server_default=func.gen_random_uuid(),
+    )
+    # Debe existir en app.core.permissions.PERMISSIONS (define su bit)
+    name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    description: Mapped[str | None] = mapped_column(Text)
+
+
+class RolePermission(Base):
+    __tablename__ = "role_permissions"
+    __table_args__ = {"schema": "gac"}
+
+    role_id: Mapped[UUID] = mapped_column(
+        ForeignKey("gac.roles.role_id", ondelete="CASCADE"), primary_key=True
+    )
+    permission_id: Mapped[UUID] = mapped_column(
+        ForeignKey("gac.permissions.permission_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
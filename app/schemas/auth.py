@@ -1,6 +1,6 @@
 from uuid import UUID
-from typing import List, Optional
-from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
 
 
 class Token(BaseModel):
@@ -13,6 +13,9 @@ class TokenPayload(BaseModel):
     sub: UUID
     exp: int
     type: str
+    # Only present on stateless access tokens
+    roles: Optional[List[str]] = None
+    ver: Optional[int] = None
 
 
 class LoginRequest(BaseModel):
@@ -33,3 +36,15 @@ class UserResponse(BaseModel):
 
 class PasswordUpdate(BaseModel):
     new_password: str
+
+
+class TokenIntrospectRequest(BaseModel):
+    tokens: List[str] = Field(min_length=1, max_length=500)
+
+
+class TokenIntrospection(BaseModel):
+    active: bool
+    token_type: str
+    claims: Optional[Dict[str, Any]] = None
+    expires_in: Optional[int] = None
+    error: Optional[str] = None
@@ -0,0 +1,21 @@
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+from typing import Optional
+from pydantic import BaseModel
+
+
+class ClientSummary(BaseModel):
+    client_id: UUID
+    orders_count: int = 0
+    orders_total: Decimal = Decimal("0.00")
+    paid_amount: Decimal = Decimal("0.00")
+    pending_payments: Decimal = Decimal("0.00")
+    outstanding_balance: Decimal = Decimal("0.00")
+    updated_at: Optional[datetime] = None
+
+
+class ClientBalanceMismatch(BaseModel):
+    client_id: UUID
+    stored: dict
+    expected: dict
@@ -1,4 +1,6 @@
+import json
 from typing import Generic, TypeVar, Optional
+from fastapi import Response
 from pydantic import BaseModel
 
 T = TypeVar("T")
@@ -8,3 +10,20 @@ class ResponseModel(BaseModel, Generic[T]):
     message: str
     data: Optional[T] = None
     error: Optional[str] = None
+    next_cursor: Optional[str] = None
+
+
+def raw_response(
+    message: str, data: Optional[str], next_cursor: Optional[str] = None
+) -> Response:
+    """
+    `ResponseModel` con `data` ya serializado como JSON (p. ej. por Postgres).
+
+    Evita construir y validar modelos solo para volver a serializarlos; el
+    cuerpo tiene las mismas claves y el mismo orden que `ResponseModel`.
+    """
+    body = (
+        f'{{"message":{json.dumps(message)},"data":{data or "null"},'
+        f'"error":null,"next_cursor":{json.dumps(next_cursor)}}}'
+    )
+    return Response(content=body, media_type="application/json")
@@ -3,7 +3,7 @@ from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
 from typing import List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class OrderItemBase(BaseModel):
@@ -31,8 +31,12 @@ class OrderBase(BaseModel):
     notes: Optional[str] = None
 
 
+# 4 bind parameters per item in a single INSERT; asyncpg allows 32767
+MAX_ORDER_ITEMS = 5000
+
+
 class OrderCreate(OrderBase):
-    items: List[OrderItemCreate]
+    items: List[OrderItemCreate] = Field(max_length=MAX_ORDER_ITEMS)
 
 
 class OrderResponse(OrderBase):
@@ -46,3 +50,33 @@ class OrderResponse(OrderBase):
 
     class Config:
         from_attributes = True
+
+
+MAX_BULK_ORDERS = 5000
+# Bounds the whole request, not just each order (5000 x 5000 items otherwise)
+MAX_BULK_ORDER_ITEMS = 50000
+
+
+class OrderBulkCreate(BaseModel):
+    orders: List[OrderCreate] = Field(min_length=1, max_length=MAX_BULK_ORDERS)
+
+    @model_validator(mode="after")
+    def check_total_items(self):
+        total = sum(len(order.items) for order in self.orders)
+        if total > MAX_BULK_ORDER_ITEMS:
+            raise ValueError(
+                f"Too many items: {total} (at most {MAX_BULK_ORDER_ITEMS} per request)"
+            )
+        return self
+
+
+class OrderBulkError(BaseModel):
+    index: int
+    error: str
+
+
+class OrderBulkResult(BaseModel):
+    created: int
+    # Mismo orden que la petición; None para las órdenes que fallaron
+    order_ids: List[Optional[UUID]]
+    errors: List[OrderBulkError] = []
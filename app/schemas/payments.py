@@ -1,16 +1,17 @@
 from datetime import datetime
 from decimal import Decimal
 from uuid import UUID
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 
 class PaymentBase(BaseModel):
     order_id: Optional[UUID] = None
     client_id: UUID
-    amount: Decimal = Field(gt=0)
-    method: str
-    transaction_ref: Optional[str] = None
+    # Límites de las columnas numeric(12, 2) / varchar de gac.payments
+    amount: Decimal = Field(gt=0, lt=Decimal("1e10"))
+    method: str = Field(max_length=50)
+    transaction_ref: Optional[str] = Field(default=None, max_length=255)
 
 
 class PaymentCreate(PaymentBase):
@@ -25,3 +26,17 @@ class PaymentResponse(PaymentBase):
 
     class Config:
         from_attributes = True
+
+
+class PaymentImportError(BaseModel):
+    line: int
+    error: str
+
+
+class PaymentImportResult(BaseModel):
+    received: int
+    imported: int
+    failed: int
+    errors: List[PaymentImportError] = []
+    # True si hubo más errores de los que se listan en `errors`
+    errors_truncated: bool = False
@@ -1,5 +1,6 @@
 from uuid import UUID
-from pydantic import BaseModel
+from typing import List, Optional
+from pydantic import BaseModel, Field
 
 
 class RoleCreate(BaseModel):
@@ -12,3 +13,30 @@ class RoleResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Se envía como un solo arreglo (un parámetro), no hay límite de asyncpg
+MAX_ROLE_BULK_USERS = 10000
+
+
+class RoleBulkAssignment(BaseModel):
+    user_ids: List[UUID] = Field(min_length=1, max_length=MAX_ROLE_BULK_USERS)
+
+
+class RoleBulkAssignmentResult(BaseModel):
+    changed: int
+    # Usuarios cuyo conjunto de roles cambió (los demás ya lo tenían / no lo tenían)
+    user_ids: List[UUID]
+
+
+class PermissionResponse(BaseModel):
+    name: str
+    description: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class RolePermissionsUpdate(BaseModel):
+    # Reemplaza el conjunto completo; una lista vacía quita todos los permisos
+    permissions: List[str]
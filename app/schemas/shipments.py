@@ -1,7 +1,9 @@
 from datetime import datetime
 from uuid import UUID
-from typing import Optional, Dict, Any
-from pydantic import BaseModel
+from typing import Optional, Dict, Any, List, Literal
+from pydantic import BaseModel, Field, model_validator
+
+ShipmentStatus = Literal["pending", "packed", "shipped", "delivered", "cancelled"]
 
 
 class ShipmentBase(BaseModel):
@@ -17,7 +19,39 @@ class ShipmentCreate(ShipmentBase):
 
 
 class ShipmentUpdateStatus(BaseModel):
-    status: str
+    status: ShipmentStatus
+    # Precondición opcional: solo cambiar si el estado actual es este
+    expected_status: Optional[ShipmentStatus] = None
+
+
+MAX_BULK_STATUS_UPDATES = 50000
+
+
+class ShipmentStatusUpdateItem(BaseModel):
+    shipment_id: Optional[UUID] = None
+    tracking_number: Optional[str] = Field(default=None, max_length=255)
+    status: ShipmentStatus
+
+    @model_validator(mode="after")
+    def check_key(self):
+        if (self.shipment_id is None) == (self.tracking_number is None):
+            raise ValueError("Provide exactly one of shipment_id or tracking_number")
+        return self
+
+
+class ShipmentBulkStatusUpdate(BaseModel):
+    updates: List[ShipmentStatusUpdateItem] = Field(
+        min_length=1, max_length=MAX_BULK_STATUS_UPDATES
+    )
+
+
+class ShipmentBulkStatusResult(BaseModel):
+    updated: int
+    not_found_shipment_ids: List[UUID] = []
+    not_found_tracking_numbers: List[str] = []
+    # Existen, pero su estado actual no admite el cambio solicitado
+    rejected_shipment_ids: List[UUID] = []
+    rejected_tracking_numbers: List[str] = []
 
 
 class ShipmentResponse(ShipmentBase):
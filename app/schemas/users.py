@@ -1,5 +1,5 @@
 from uuid import UUID
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, EmailStr, Field
 
 
@@ -11,6 +11,30 @@ class UserCreate(BaseModel):
     roles: List[str] = []
 
 
+# 5 bind parameters per user in a single INSERT; asyncpg allows 32767
+MAX_BULK_USERS = 1000
+
+
+class UserBulkCreate(BaseModel):
+    users: List[UserCreate] = Field(min_length=1, max_length=MAX_BULK_USERS)
+
+
+class UserBulkOutcome(BaseModel):
+    index: int
+    email: EmailStr
+    # created: nuevo; exists: el email ya estaba registrado;
+    # duplicate: el email aparece antes en la misma petición
+    status: Literal["created", "exists", "duplicate"]
+    user_id: Optional[UUID] = None
+
+
+class UserBulkResult(BaseModel):
+    created: int
+    skipped: int
+    # Mismo orden que la petición
+    results: List[UserBulkOutcome]
+
+
 class UserUpdate(BaseModel):
     full_name: Optional[str] = None
     is_active: Optional[bool] = None
@@ -1,36 +1,100 @@
+import asyncio
+import logging
 from datetime import datetime
 from typing import Optional
+from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from jose import jwt, JWTError
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import selectinload
+from jose import JWTError
 from pydantic import ValidationError
 
+from app.core.authz_versions import authz_versions
 from app.core.config import settings
-from app.core.security import verify_password, create_access_token, create_refresh_token
+from app.core.database import AsyncSessionLocal
+from app.core.last_login import last_login_buffer
+from app.core.security import (
+    PasswordHasherBusy,
+    hash_password_async,
+    password_needs_rehash,
+    verify_password_async,
+    create_access_token,
+    decode_jwt,
+    create_refresh_token,
+)
 from app.models.users import User
 from app.schemas.auth import Token, TokenPayload
 
+logger = logging.getLogger(__name__)
+
+# Strong references so pending rehash tasks are not garbage collected
+_rehash_tasks: set[asyncio.Task] = set()
+
+
+async def _rehash_password(user_id: UUID, password: str, old_hash: str) -> None:
+    try:
+        new_hash = await hash_password_async(password)
+        async with AsyncSessionLocal() as session:
+            # Skip if the password changed while we were hashing
+            await session.execute(
+                update(User)
+                .where(User.user_id == user_id, User.password_hash == old_hash)
+                .values(password_hash=new_hash)
+            )
+            await session.commit()
+    except PasswordHasherBusy:
+        logger.info("Hash pool busy, rehash of %s deferred to next login", user_id)
+    except Exception:
+        logger.exception("Failed to rehash password for user %s", user_id)
+
+
+def schedule_password_rehash(user_id: UUID, password: str, old_hash: str) -> None:
+    task = asyncio.create_task(_rehash_password(user_id, password, old_hash))
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+
 
 class AuthService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    def _user_query(self):
+        stmt = select(User)
+        if settings.STATELESS_ACCESS_TOKENS:
+            stmt = stmt.options(selectinload(User.roles))
+        return stmt
+
+    def _create_access_token(self, user: User) -> str:
+        if settings.STATELESS_ACCESS_TOKENS:
+            authz_versions.record(
+                user.user_id, user.authz_version, bool(user.is_active)
+            )
+            return create_access_token(
+                subject=user.user_id,
+                roles=[role.name for role in user.roles],
+                authz_version=user.authz_version,
+            )
+        return create_access_token(subject=user.user_id)
+
     async def authenticate_user(self, email: str, password: str) -> Optional[Token]:
-        stmt = select(User).where(User.email == email)
+        stmt = self._user_query().where(func.lower(User.email) == email.lower())
         result = await self.db.execute(stmt)
         user = result.scalar_one_or_none()
 
-        if not user or not verify_password(password, user.password_hash):
+        if not user or not await verify_password_async(password, user.password_hash):
             return None
 
         if not user.is_active:
             return None
 
-        # Update last login
-        user.last_login_at = datetime.utcnow()
-        await self.db.commit()
+        # Hash created with outdated argon2 parameters: upgrade it off the request path
+        if password_needs_rehash(user.password_hash):
+            schedule_password_rehash(user.user_id, password, user.password_hash)
+
+        # Persisted asynchronously by the write-behind buffer
+        last_login_buffer.record(user.user_id, datetime.utcnow())
 
-        access_token = create_access_token(subject=user.user_id)
+        access_token = self._create_access_token(user)
         refresh_token = create_refresh_token(subject=user.user_id)
 
         return Token(
@@ -39,9 +103,7 @@ class AuthService:
 
     async def refresh_token(self, refresh_token: str) -> Optional[Token]:
         try:
-            payload = jwt.decode(
-                refresh_token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]
-            )
+            payload = decode_jwt(refresh_token)
             token_data = TokenPayload(**payload)
 
             if token_data.type != "refresh":
@@ -50,14 +112,14 @@ class AuthService:
         except (JWTError, ValidationError):
             return None
 
-        stmt = select(User).where(User.user_id == token_data.sub)
+        stmt = self._user_query().where(User.user_id == token_data.sub)
         result = await self.db.execute(stmt)
         user = result.scalar_one_or_none()
 
         if not user or not user.is_active:
             return None
 
-        new_access_token = create_access_token(subject=user.user_id)
+        new_access_token = self._create_access_token(user)
         # Optionally rotate refresh token here, for now just return new access token
         # Returning the same refresh token or a new one depends on policy.
         # Requirement says "refresh token (7-30 days)", usually implies reuse until expiry or rotation.
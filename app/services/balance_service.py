@@ -0,0 +1,184 @@
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, List
+from uuid import UUID
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.client_balances import ClientBalance
+from app.schemas.clients import ClientBalanceMismatch, ClientSummary
+
+DELTA_COLUMNS = (
+    "orders_count",
+    "orders_total",
+    "payments_pending",
+    "payments_confirmed",
+)
+
+# Agregados calculados desde cero; compartido por rebuild() y check()
+EXPECTED_BALANCES = """
+    WITH order_totals AS (
+        SELECT client_id, count(*) AS orders_count, sum(total_amount) AS orders_total
+        FROM gac.orders
+        GROUP BY client_id
+    ),
+    payment_totals AS (
+        SELECT
+            client_id,
+            sum(amount) FILTER (WHERE status = 'pending') AS payments_pending,
+            sum(amount) FILTER (WHERE status = 'confirmed') AS payments_confirmed
+        FROM gac.payments
+        GROUP BY client_id
+    ),
+    expected AS (
+        SELECT
+            client_id,
+            coalesce(o.orders_count, 0) AS orders_count,
+            coalesce(o.orders_total, 0) AS orders_total,
+            coalesce(p.payments_pending, 0) AS payments_pending,
+            coalesce(p.payments_confirmed, 0) AS payments_confirmed
+        FROM order_totals o
+        FULL OUTER JOIN payment_totals p USING (client_id)
+    )
+"""
+
+REBUILD_BALANCES = text(EXPECTED_BALANCES + """
+    , upserted AS (
+        INSERT INTO gac.client_balances AS b (
+            client_id, orders_count, orders_total, payments_pending, payments_confirmed
+        )
+        SELECT * FROM expected
+        ON CONFLICT (client_id) DO UPDATE SET
+            orders_count = excluded.orders_count,
+            orders_total = excluded.orders_total,
+            payments_pending = excluded.payments_pending,
+            payments_confirmed = excluded.payments_confirmed,
+            updated_at = now()
+        RETURNING b.client_id
+    )
+    DELETE FROM gac.client_balances b
+    WHERE NOT EXISTS (SELECT 1 FROM expected e WHERE e.client_id = b.client_id)
+    """)
+
+CHECK_BALANCES = text(EXPECTED_BALANCES + """
+    SELECT
+        coalesce(b.client_id, e.client_id) AS client_id,
+        b.orders_count AS stored_orders_count,
+        b.orders_total AS stored_orders_total,
+        b.payments_pending AS stored_payments_pending,
+        b.payments_confirmed AS stored_payments_confirmed,
+        e.orders_count AS expected_orders_count,
+        e.orders_total AS expected_orders_total,
+        e.payments_pending AS expected_payments_pending,
+        e.payments_confirmed AS expected_payments_confirmed
+    FROM gac.client_balances b
+    FULL OUTER JOIN expected e USING (client_id)
+    WHERE (b.orders_count, b.orders_total, b.payments_pending, b.payments_confirmed)
+        IS DISTINCT FROM
+        (e.orders_count, e.orders_total, e.payments_pending, e.payments_confirmed)
+    """)
+
+
+def to_cents(value: Decimal) -> Decimal:
+    """Redondea como `numeric(12, 2)` (montos no negativos: half-up)."""
+    return value.quantize(Decimal("0.01"), ROUND_HALF_UP)
+
+
+def _add_to_existing(stmt):
+    table = ClientBalance.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.client_id],
+        set_={
+            **{name: table.c[name] + stmt.excluded[name] for name in DELTA_COLUMNS},
+            "updated_at": func.now(),
+        },
+    )
+
+
+def balance_upsert_from_select(source: Select):
+    """
+    Upsert de deltas leídos de `source` (columnas: client_id + DELTA_COLUMNS).
+
+    Permite encadenar la actualización del agregado como CTE de la misma
+    sentencia que escribe la orden o los pagos.
+    """
+    return _add_to_existing(
+        pg_insert(ClientBalance.__table__).from_select(
+            ["client_id", *DELTA_COLUMNS], source
+        )
+    )
+
+
+def order_delta(total_amount: Decimal, count: int = 1) -> dict:
+    return {"orders_count": count, "orders_total": total_amount}
+
+
+class BalanceService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def apply(self, deltas: Iterable[tuple[UUID, dict]]) -> None:
+        """
+        Suma los deltas a `client_balances` dentro de la transacción actual.
+
+        Los deltas del mismo cliente se combinan y se escriben en un único
+        `INSERT ... ON CONFLICT DO UPDATE`, ordenados por `client_id` para que
+        dos transacciones concurrentes bloqueen las filas en el mismo orden.
+        El llamador hace el commit junto con la escritura que origina el delta.
+        """
+        merged: Dict[UUID, dict] = {}
+        for client_id, delta in deltas:
+            row = merged.setdefault(
+                client_id, {"client_id": client_id, **dict.fromkeys(DELTA_COLUMNS, 0)}
+            )
+            for column_name, value in delta.items():
+                row[column_name] += value
+        if not merged:
+            return
+
+        stmt = pg_insert(ClientBalance.__table__).values(
+            [merged[key] for key in sorted(merged)]
+        )
+        await self.db.execute(_add_to_existing(stmt))
+
+    async def get_summary(self, client_id: UUID) -> ClientSummary:
+        balance = await self.db.scalar(
+            select(ClientBalance).where(ClientBalance.client_id == client_id)
+        )
+        if balance is None:
+            return ClientSummary(client_id=client_id)
+        return ClientSummary(
+            client_id=client_id,
+            orders_count=balance.orders_count,
+            orders_total=balance.orders_total,
+            paid_amount=balance.payments_confirmed,
+            pending_payments=balance.payments_pending,
+            outstanding_balance=balance.orders_total - balance.payments_confirmed,
+            updated_at=balance.updated_at,
+        )
+
+    async def rebuild(self) -> None:
+        """
+        Recalcula todos los agregados desde `orders` y `payments`.
+
+        El `LOCK` bloquea los upserts incrementales mientras dura la
+        reconstrucción, así que ninguna escritura concurrente se pierde ni se
+        cuenta dos veces.
+        """
+        await self.db.execute(text("LOCK TABLE gac.client_balances IN EXCLUSIVE MODE"))
+        await self.db.execute(REBUILD_BALANCES)
+        await self.db.commit()
+
+    async def check(self) -> List[ClientBalanceMismatch]:
+        """Clientes cuyo agregado difiere del calculado desde cero."""
+        mismatches = []
+        for row in (await self.db.execute(CHECK_BALANCES)).mappings():
+            mismatches.append(
+                ClientBalanceMismatch(
+                    client_id=row["client_id"],
+                    stored={name: row[f"stored_{name}"] for name in DELTA_COLUMNS},
+                    expected={name: row[f"expected_{name}"] for name in DELTA_COLUMNS},
+                )
+            )
+        return mismatches
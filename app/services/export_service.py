@@ -0,0 +1,209 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, AsyncIterator, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import read_session
+from app.models.orders import Order, OrderItem
+from app.models.payments import Payment
+from app.models.shipments import Shipment
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_KINDS = ("orders", "payments", "shipments")
+# Filas por lote leído del cursor del servidor (y por bloque escrito)
+EXPORT_BATCH_SIZE = 1000
+
+ORDER_COLUMNS = [column.name for column in Order.__table__.c]
+ITEM_COLUMNS = [
+    column.name for column in OrderItem.__table__.c if column.name != "order_id"
+]
+PAYMENT_COLUMNS = [column.name for column in Payment.__table__.c]
+SHIPMENT_COLUMNS = [column.name for column in Shipment.__table__.c]
+EXPORT_HEADERS = {
+    "orders": ORDER_COLUMNS + [f"item_{name}" for name in ITEM_COLUMNS],
+    "payments": PAYMENT_COLUMNS,
+    "shipments": SHIPMENT_COLUMNS,
+}
+
+
+def _json_default(value: Any):
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_value(value: Any):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+class _Encoder:
+    """Serializa registros a NDJSON o CSV y, opcionalmente, a gzip."""
+
+    def __init__(self, fmt: str, header: List[str], gzip: bool):
+        self.fmt = fmt
+        self.header = header
+        self._header_written = False
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+
+    def encode(self, records: Iterable) -> bytes:
+        if self.fmt == "ndjson":
+            text = "".join(
+                json.dumps(record, default=_json_default) + "\n" for record in records
+            )
+        else:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            if not self._header_written:
+                writer.writerow(self.header)
+                self._header_written = True
+            writer.writerows([_csv_value(v) for v in record] for record in records)
+            text = buffer.getvalue()
+        data = text.encode("utf-8")
+        return self._compressor.compress(data) if self._compressor else data
+
+    def finish(self) -> bytes:
+        # Un CSV sin filas sigue llevando el encabezado
+        tail = (
+            self.encode([]) if self.fmt == "csv" and not self._header_written else b""
+        )
+        if self._compressor:
+            tail += self._compressor.flush()
+        return tail
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # created_at columns are timestamp without time zone, stored in UTC
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _filtered(
+    stmt: Select,
+    model,
+    client_id: Optional[UUID] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+) -> Select:
+    if client_id is not None:
+        stmt = stmt.where(model.client_id == client_id)
+    if created_from is not None:
+        stmt = stmt.where(model.created_at >= _naive_utc(created_from))
+    if created_to is not None:
+        stmt = stmt.where(model.created_at < _naive_utc(created_to))
+    return stmt
+
+
+class ExportService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _stream_rows(self, stmt: Select) -> AsyncIterator[list]:
+        # Server-side cursor: only one batch is held in memory at a time
+        result = await self.db.stream(
+            stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.partitions():
+            yield partition
+
+    async def export_orders(self, fmt: str, **filters) -> AsyncIterator[list]:
+        """
+        Órdenes con sus items, ordenadas por `created_at`.
+
+        Se leen como `orders LEFT JOIN order_items` ordenado por orden, de
+        modo que los items de una orden llegan contiguos: en NDJSON se agrupan
+        en un objeto por orden (emitido en cuanto empieza la siguiente) y en
+        CSV se escribe una fila por item.
+        """
+        orders = Order.__table__
+        items = OrderItem.__table__
+        stmt = _filtered(
+            select(
+                *orders.c,
+                *(items.c[name].label(f"item_{name}") for name in ITEM_COLUMNS),
+            )
+            .select_from(orders.outerjoin(items, items.c.order_id == orders.c.order_id))
+            .order_by(orders.c.created_at, orders.c.order_id, items.c.created_at),
+            Order,
+            **filters,
+        )
+        if fmt == "csv":
+            async for partition in self._stream_rows(stmt):
+                yield [tuple(row) for row in partition]
+            return
+
+        current: Optional[dict] = None
+        async for partition in self._stream_rows(stmt):
+            completed = []
+            for row in partition:
+                mapping = row._mapping
+                if current is None or current["order_id"] != mapping["order_id"]:
+                    if current is not None:
+                        completed.append(current)
+                    current = {name: mapping[name] for name in ORDER_COLUMNS}
+                    current["items"] = []
+                if mapping["item_item_id"] is not None:
+                    current["items"].append(
+                        {name: mapping[f"item_{name}"] for name in ITEM_COLUMNS}
+                    )
+            yield completed
+        if current is not None:
+            yield [current]
+
+    async def _export_table(self, model, fmt: str, **filters) -> AsyncIterator[list]:
+        table = model.__table__
+        stmt = _filtered(
+            select(*table.c).order_by(table.c.created_at, *table.primary_key.columns),
+            model,
+            **filters,
+        )
+        async for partition in self._stream_rows(stmt):
+            if fmt == "csv":
+                yield [tuple(row) for row in partition]
+            else:
+                yield [dict(row._mapping) for row in partition]
+
+    def export_payments(self, fmt: str, **filters):
+        return self._export_table(Payment, fmt, **filters)
+
+    def export_shipments(self, fmt: str, **filters):
+        return self._export_table(Shipment, fmt, **filters)
+
+
+async def stream_export(
+    session_factory: async_sessionmaker[AsyncSession],
+    kind: str,
+    fmt: str,
+    gzip: bool = False,
+    **filters,
+) -> AsyncIterator[bytes]:
+    """
+    Genera el cuerpo de la exportación bloque a bloque.
+
+    Abre su propia sesión porque corre dentro de `StreamingResponse`,
+    después de que el endpoint (y sus dependencias) ya retornaron.
+    """
+    async with read_session(session_factory) as session:
+        service = ExportService(session)
+        batches = getattr(service, f"export_{kind}")(fmt, **filters)
+        encoder = _Encoder(fmt, EXPORT_HEADERS[kind], gzip)
+        async for records in batches:
+            chunk = encoder.encode(records)
+            if chunk:
+                yield chunk
+        yield encoder.finish()
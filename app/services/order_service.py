@@ -1,11 +1,204 @@
-from uuid import UUID
-from typing import List, Optional
+import logging
+from decimal import Decimal
+from uuid import UUID, uuid4
+from typing import List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import (
+    Integer,
+    Numeric,
+    Row,
+    String,
+    Text,
+    cast,
+    column,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    true,
+    values,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, aggregate_order_by
+from sqlalchemy.exc import DBAPIError
 
+from app.core.pagination import keyset_split, keyset_stmt
+from app.services.balance_service import (
+    BalanceService,
+    balance_upsert_from_select,
+    order_delta,
+    to_cents,
+)
 from app.models.orders import Order, OrderItem
-from app.schemas.orders import OrderCreate
+from app.schemas.orders import (
+    OrderBulkError,
+    OrderBulkResult,
+    OrderCreate,
+    OrderItemCreate,
+    OrderItemResponse,
+    OrderResponse,
+)
+
+logger = logging.getLogger(__name__)
+
+BULK_ORDER_CHUNK_SIZE = 500
+
+ITEM_COLUMNS = (
+    "item_id",
+    "order_id",
+    "device_id",
+    "product_key",
+    "quantity",
+    "unit_price",
+    "created_at",
+)
+
+
+def _json_fields(table, names) -> list:
+    # Arguments for json_build_object (not jsonb: it keeps the keys in
+    # response-model order); numerics go as text, like pydantic's Decimal
+    args = []
+    for name in names:
+        value = table.c[name]
+        if isinstance(value.type, Numeric):
+            value = cast(value, Text)
+        args += [literal_column(f"'{name}'"), value]
+    return args
+
+
+def _order_json():
+    """Orden con sus items como un único `json`, con la forma de `OrderResponse`."""
+    orders = Order.__table__
+    order_items = OrderItem.__table__
+    items = (
+        select(
+            func.coalesce(
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            *_json_fields(order_items, OrderItemResponse.model_fields)
+                        ),
+                        order_items.c.created_at,
+                        order_items.c.item_id,
+                    )
+                ),
+                literal_column("'[]'::json"),
+            )
+        )
+        .where(order_items.c.order_id == orders.c.order_id)
+        .scalar_subquery()
+    )
+    fields = [name for name in OrderResponse.model_fields if name != "items"]
+    return cast(
+        func.json_build_object(
+            *_json_fields(orders, fields),
+            literal_column("'items'"),
+            items,
+        ),
+        Text,
+    )
+
+
+def _create_order_stmt(order_in: OrderCreate, created_by: Optional[UUID]):
+    orders = Order.__table__
+    order_items = OrderItem.__table__
+
+    order_values = dict(
+        order_id=uuid4(),
+        client_id=order_in.client_id,
+        created_by=created_by,
+        status="pending",  # Initial status
+        notes=order_in.notes,
+    )
+    if not order_in.items:
+        new_order = (
+            insert(orders)
+            .values(**order_values, total_amount=0)
+            .returning(*orders.c)
+            .cte("new_order")
+        )
+        return select(new_order).add_cte(_balance_cte(new_order))
+
+    items = select(
+        values(
+            column("device_id", PG_UUID(as_uuid=True)),
+            column("product_key", String(50)),
+            column("quantity", Integer),
+            column("unit_price", Numeric(12, 2)),
+            name="v",
+        ).data(
+            [
+                (item.device_id, item.product_key, item.quantity, item.unit_price)
+                for item in order_in.items
+            ]
+        )
+    ).cte("items")
+    total = select(
+        func.coalesce(func.sum(items.c.quantity * items.c.unit_price), 0)
+    ).scalar_subquery()
+
+    new_order = (
+        insert(orders)
+        .values(**order_values, total_amount=total)
+        .returning(*orders.c)
+        .cte("new_order")
+    )
+    new_items = (
+        insert(order_items)
+        .from_select(
+            ["order_id", "device_id", "product_key", "quantity", "unit_price"],
+            select(
+                new_order.c.order_id,
+                # VALUES with only NULLs in a column would be typed as text
+                cast(items.c.device_id, PG_UUID(as_uuid=True)),
+                cast(items.c.product_key, String(50)),
+                items.c.quantity,
+                items.c.unit_price,
+            ).select_from(new_order.join(items, true())),
+            # item_id must come from gen_random_uuid(), not one Python uuid4()
+            include_defaults=False,
+        )
+        .returning(*(order_items.c[name] for name in ITEM_COLUMNS))
+        .cte("new_items")
+    )
+    return (
+        select(
+            new_order,
+            *(new_items.c[name].label(f"item_{name}") for name in ITEM_COLUMNS),
+        )
+        .select_from(new_order.outerjoin(new_items, true()))
+        .add_cte(_balance_cte(new_order))
+    )
+
+
+def _balance_cte(new_order):
+    # Keeps client_balances in the same statement (and transaction) as the order
+    delta = select(
+        new_order.c.client_id,
+        literal(1),
+        new_order.c.total_amount,
+        literal(0),
+        literal(0),
+    )
+    return balance_upsert_from_select(delta).cte("balance")
+
+
+def _order_total(items: List[OrderItemCreate]) -> Decimal:
+    # Same rounding as the numeric(12,2) SUM done by create_order
+    return sum(
+        (item.quantity * to_cents(item.unit_price) for item in items), Decimal(0)
+    )
+
+
+def _order_from_rows(rows: Sequence[Row]) -> Order:
+    first = rows[0]._mapping
+    order = Order(**{col.name: first[col.name] for col in Order.__table__.c})
+    order.items = [
+        OrderItem(**{name: row._mapping[f"item_{name}"] for name in ITEM_COLUMNS})
+        for row in rows
+        if row._mapping.get("item_item_id") is not None
+    ]
+    return order
 
 
 class OrderService:
@@ -15,47 +208,107 @@ class OrderService:
     async def create_order(
         self, order_in: OrderCreate, created_by: Optional[UUID] = None
     ) -> Order:
-        db_order = Order(
-            client_id=order_in.client_id,
-            notes=order_in.notes,
-            created_by=created_by,
-            status="pending",  # Initial status
-            total_amount=0,  # Will be calculated
-        )
-        self.db.add(db_order)
-        await self.db.flush()  # To get order_id
-
-        total_amount = 0
-        for item in order_in.items:
-            db_item = OrderItem(
-                order_id=db_order.order_id,
-                device_id=item.device_id,
-                product_key=item.product_key,
-                quantity=item.quantity,
-                unit_price=item.unit_price,
-            )
-            self.db.add(db_item)
-            total_amount += item.quantity * item.unit_price
+        """
+        Inserta la orden y todos sus items en una sola sentencia.
+
+        Los items viajan como una lista `VALUES`; el `INSERT` de la orden
+        calcula `total_amount` con `SUM` sobre ella y el `INSERT` de items
+        toma el `order_id` del `RETURNING` de la orden. Otro CTE suma la orden
+        a `client_balances`. La respuesta se arma con las filas devueltas,
+        sin `refresh` posterior.
+        """
+        rows = (await self.db.execute(_create_order_stmt(order_in, created_by))).all()
+        await self.db.commit()
+        return _order_from_rows(rows)
+
+    async def create_orders_bulk(
+        self,
+        orders_in: List[OrderCreate],
+        created_by: Optional[UUID] = None,
+        chunk_size: int = BULK_ORDER_CHUNK_SIZE,
+    ) -> OrderBulkResult:
+        """
+        Crea muchas órdenes con inserciones por conjuntos.
+
+        Los `order_id` se generan aquí para poder insertar órdenes e items
+        con dos `executemany` por bloque, sin leer nada de vuelta. Cada
+        bloque corre en un savepoint: si falla, solo sus órdenes se reportan
+        como error y el resto se confirma en un único commit.
+        """
+        order_ids: List[Optional[UUID]] = [uuid4() for _ in orders_in]
+        errors: List[OrderBulkError] = []
+
+        for start in range(0, len(orders_in), chunk_size):
+            chunk = range(start, min(start + chunk_size, len(orders_in)))
+            order_rows = [
+                {
+                    "order_id": order_ids[i],
+                    "client_id": orders_in[i].client_id,
+                    "created_by": created_by,
+                    "status": "pending",  # Initial status
+                    "total_amount": _order_total(orders_in[i].items),
+                    "notes": orders_in[i].notes,
+                }
+                for i in chunk
+            ]
+            item_rows = [
+                {
+                    "item_id": uuid4(),
+                    "order_id": order_ids[i],
+                    "device_id": item.device_id,
+                    "product_key": item.product_key,
+                    "quantity": item.quantity,
+                    "unit_price": item.unit_price,
+                }
+                for i in chunk
+                for item in orders_in[i].items
+            ]
+            try:
+                async with self.db.begin_nested():
+                    await self.db.execute(insert(Order.__table__), order_rows)
+                    if item_rows:
+                        await self.db.execute(insert(OrderItem.__table__), item_rows)
+                    await BalanceService(self.db).apply(
+                        (row["client_id"], order_delta(row["total_amount"]))
+                        for row in order_rows
+                    )
+            except DBAPIError as e:
+                logger.warning("Bulk order chunk at index %s failed: %s", start, e.orig)
+                error = f"Chunk {start}-{chunk[-1]} rejected: {type(e.orig).__name__}"
+                for i in chunk:
+                    order_ids[i] = None
+                    errors.append(OrderBulkError(index=i, error=error))
 
-        db_order.total_amount = total_amount
         await self.db.commit()
-        await self.db.refresh(db_order, attribute_names=["items"])
-        return db_order
-
-    async def get_order(self, order_id: UUID) -> Optional[Order]:
-        stmt = (
-            select(Order)
-            .options(selectinload(Order.items))
-            .where(Order.order_id == order_id)
-        )
-        result = await self.db.execute(stmt)
-        return result.scalar_one_or_none()
-
-    async def get_orders_by_client(self, client_id: UUID) -> List[Order]:
-        stmt = (
-            select(Order)
-            .options(selectinload(Order.items))
-            .where(Order.client_id == client_id)
-        )
-        result = await self.db.execute(stmt)
-        return list(result.scalars().all())
+        return OrderBulkResult(
+            created=len(orders_in) - len(errors), order_ids=order_ids, errors=errors
+        )
+
+    async def get_order_json(self, order_id: UUID) -> Optional[str]:
+        """
+        Orden con sus items, ya serializada por Postgres.
+
+        Una sola consulta (los items se agregan con `json_agg`) y sin
+        instancias ORM ni validación de pydantic: el texto se inserta tal cual
+        en la respuesta.
+        """
+        stmt = select(_order_json()).where(Order.order_id == order_id)
+        return await self.db.scalar(stmt)
+
+    async def get_orders_by_client_json(
+        self, client_id: UUID, limit: int, cursor: Optional[str] = None
+    ) -> tuple[str, Optional[str]]:
+        """Página de órdenes del cliente como un arreglo JSON ya serializado."""
+        stmt = keyset_stmt(
+            select(_order_json(), Order.created_at, Order.order_id).where(
+                Order.client_id == client_id
+            ),
+            Order.created_at,
+            Order.order_id,
+            limit,
+            cursor,
+        )
+        rows, next_cursor = keyset_split(
+            (await self.db.execute(stmt)).all(), Order.created_at, Order.order_id, limit
+        )
+        return "[" + ",".join(row[0] for row in rows) + "]", next_cursor
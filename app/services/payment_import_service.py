@@ -0,0 +1,258 @@
+import codecs
+import csv
+import json
+from typing import AsyncIterator, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import column, func, literal, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.balance_service import balance_upsert_from_select
+from app.schemas.payments import (
+    PaymentCreate,
+    PaymentImportError,
+    PaymentImportResult,
+)
+
+IMPORT_FORMATS = ("ndjson", "csv")
+COPY_BATCH_SIZE = 10000
+MAX_LINE_LENGTH = 1024 * 1024
+MAX_REPORTED_ERRORS = 1000
+
+STAGING_TABLE = "payment_import_staging"
+STAGING_COLUMNS = [
+    "line_no",
+    "order_id",
+    "client_id",
+    "amount",
+    "method",
+    "transaction_ref",
+]
+
+CREATE_STAGING = text(f"""
+    CREATE TEMP TABLE {STAGING_TABLE} (
+        line_no integer NOT NULL,
+        order_id uuid,
+        client_id uuid NOT NULL,
+        amount numeric(12, 2) NOT NULL,
+        method varchar(50) NOT NULL,
+        transaction_ref varchar(255)
+    ) ON COMMIT DROP
+    """)
+
+# Temp tables are never auto-analyzed; without stats the duplicate check below
+# would be planned as a nested loop over the whole file
+INDEX_STAGING = text(
+    f"CREATE INDEX ON {STAGING_TABLE} (client_id, transaction_ref, line_no)"
+)
+ANALYZE_STAGING = text(f"ANALYZE {STAGING_TABLE}")
+
+# Filas cuyo order_id no existe: se reportan en lugar de abortar el INSERT
+REJECT_MISSING_ORDERS = text(f"""
+    DELETE FROM {STAGING_TABLE} s
+    WHERE s.order_id IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM gac.orders o WHERE o.order_id = s.order_id)
+    RETURNING s.line_no
+    """)
+
+# Pagos ya registrados (o repetidos dentro del archivo) por (client_id, transaction_ref)
+REJECT_DUPLICATES = text(f"""
+    DELETE FROM {STAGING_TABLE} s
+    WHERE s.transaction_ref IS NOT NULL
+      AND (
+        EXISTS (
+            SELECT 1 FROM gac.payments p
+            WHERE p.client_id = s.client_id AND p.transaction_ref = s.transaction_ref
+        )
+        OR EXISTS (
+            SELECT 1 FROM {STAGING_TABLE} d
+            WHERE d.client_id = s.client_id
+              AND d.transaction_ref = s.transaction_ref
+              AND d.line_no < s.line_no
+        )
+      )
+    RETURNING s.line_no
+    """)
+
+MERGE_PAYMENTS = text(f"""
+    INSERT INTO gac.payments (order_id, client_id, amount, method, transaction_ref, status)
+    SELECT order_id, client_id, amount, method, transaction_ref, 'pending'
+    FROM {STAGING_TABLE}
+    ORDER BY line_no
+    """)
+
+_staging = table(STAGING_TABLE, column("client_id"), column("amount"))
+
+# Suma los pagos importados (todos en estado pending) a client_balances
+ADD_TO_BALANCES = balance_upsert_from_select(
+    select(
+        _staging.c.client_id,
+        literal(0),
+        literal(0),
+        func.sum(_staging.c.amount),
+        literal(0),
+    )
+    .group_by(_staging.c.client_id)
+    .order_by(_staging.c.client_id)
+)
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Divide un flujo de bytes UTF-8 en líneas numeradas sin acumularlo entero."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line.rstrip("\r")
+        if len(buffer) > MAX_LINE_LENGTH:
+            raise ValueError(f"Line {line_no + 1} exceeds {MAX_LINE_LENGTH} bytes")
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield line_no + 1, buffer.rstrip("\r")
+
+
+async def iter_ndjson_records(
+    lines: AsyncIterator[tuple[int, str]],
+) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    async for line_no, line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, record, None
+
+
+async def iter_csv_records(
+    lines: AsyncIterator[tuple[int, str]],
+) -> AsyncIterator[tuple[int, Optional[dict], Optional[str]]]:
+    header: Optional[List[str]] = None
+    pending: List[str] = []
+    quotes = 0
+    start = 0
+    async for line_no, line in lines:
+        if not pending:
+            start = line_no
+        pending.append(line)
+        quotes += line.count('"')
+        # Quoted fields may span lines: wait until quotes are balanced
+        if quotes % 2:
+            continue
+        record_text = "\n".join(pending)
+        pending, quotes = [], 0
+        if not record_text.strip():
+            continue
+
+        try:
+            fields = next(csv.reader([record_text]))
+        except csv.Error as e:
+            yield start, None, f"Invalid CSV: {e}"
+            continue
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+        if len(fields) != len(header):
+            yield start, None, f"Expected {len(header)} fields, got {len(fields)}"
+            continue
+        yield start, {
+            name: value if value != "" else None for name, value in zip(header, fields)
+        }, None
+
+    if pending:
+        yield start, None, "Unterminated quoted field"
+
+
+class PaymentImportService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.errors: List[PaymentImportError] = []
+        self.failed = 0
+
+    def _reject(self, line_no: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(PaymentImportError(line=line_no, error=error))
+
+    async def _copy(self, records: List[tuple]) -> None:
+        connection = await self.db.connection()
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            STAGING_TABLE, records=records, columns=STAGING_COLUMNS
+        )
+
+    async def import_stream(
+        self, chunks: AsyncIterator[bytes], fmt: str
+    ) -> PaymentImportResult:
+        """
+        Importa pagos desde un flujo NDJSON o CSV.
+
+        Las filas se validan con `PaymentCreate` a medida que llegan y se
+        cargan por lotes con `COPY` a una tabla temporal; al final un único
+        `INSERT ... SELECT` las pasa a `gac.payments`. Las filas inválidas,
+        con `order_id` inexistente o con `transaction_ref` ya registrado para
+        el cliente se reportan por número de línea y no detienen la carga.
+        """
+        if fmt not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported import format: {fmt}")
+        parse = iter_ndjson_records if fmt == "ndjson" else iter_csv_records
+
+        await self.db.execute(CREATE_STAGING)
+        received = 0
+        batch: List[tuple] = []
+        async for line_no, record, error in parse(iter_lines(chunks)):
+            received += 1
+            if error is not None:
+                self._reject(line_no, error)
+                continue
+            try:
+                payment = PaymentCreate.model_validate(record)
+            except ValidationError as e:
+                first = e.errors()[0]
+                field = ".".join(str(part) for part in first["loc"])
+                self._reject(
+                    line_no, f"{field}: {first['msg']}" if field else first["msg"]
+                )
+                continue
+            batch.append(
+                (
+                    line_no,
+                    payment.order_id,
+                    payment.client_id,
+                    payment.amount,
+                    payment.method,
+                    payment.transaction_ref,
+                )
+            )
+            if len(batch) >= COPY_BATCH_SIZE:
+                await self._copy(batch)
+                batch = []
+        if batch:
+            await self._copy(batch)
+        await self.db.execute(INDEX_STAGING)
+        await self.db.execute(ANALYZE_STAGING)
+
+        for line_no in (await self.db.execute(REJECT_MISSING_ORDERS)).scalars():
+            self._reject(line_no, "Order not found")
+        for line_no in (await self.db.execute(REJECT_DUPLICATES)).scalars():
+            self._reject(line_no, "Duplicate transaction_ref for client")
+        imported = (await self.db.execute(MERGE_PAYMENTS)).rowcount
+        await self.db.execute(ADD_TO_BALANCES)
+        await self.db.commit()
+
+        self.errors.sort(key=lambda error: error.line)
+        return PaymentImportResult(
+            received=received,
+            imported=imported,
+            failed=self.failed,
+            errors=self.errors,
+            errors_truncated=self.failed > len(self.errors),
+        )
@@ -1,9 +1,13 @@
-from uuid import UUID
+from uuid import UUID, uuid4
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import aliased
 
+from app.core.pagination import keyset_page
 from app.models.payments import Payment
+from app.services.balance_service import balance_upsert_from_select
 from app.schemas.payments import PaymentCreate
 
 
@@ -12,25 +16,49 @@ class PaymentService:
         self.db = db
 
     async def create_payment(self, payment_in: PaymentCreate) -> Payment:
-        db_payment = Payment(
-            order_id=payment_in.order_id,
-            client_id=payment_in.client_id,
-            amount=payment_in.amount,
-            method=payment_in.method,
-            transaction_ref=payment_in.transaction_ref,
-            status="pending",  # Initial status
+        """
+        Inserta el pago y suma su monto a `payments_pending` del cliente en
+        una sola sentencia (`INSERT ... RETURNING` + CTE de `client_balances`).
+        """
+        payments = Payment.__table__
+        new_payment = (
+            pg_insert(payments)
+            .values(
+                payment_id=uuid4(),
+                order_id=payment_in.order_id,
+                client_id=payment_in.client_id,
+                amount=payment_in.amount,
+                method=payment_in.method,
+                transaction_ref=payment_in.transaction_ref,
+                status="pending",  # Initial status
+            )
+            .returning(*payments.c)
+            .cte("new_payment")
         )
-        self.db.add(db_payment)
+        # Delta columns: orders_count, orders_total, payments_pending, payments_confirmed
+        balance = balance_upsert_from_select(
+            select(
+                new_payment.c.client_id,
+                literal(0),
+                literal(0),
+                new_payment.c.amount,
+                literal(0),
+            )
+        ).cte("balance")
+        stmt = select(aliased(Payment, new_payment)).add_cte(balance)
+        payment = (await self.db.scalars(stmt)).one()
         await self.db.commit()
-        await self.db.refresh(db_payment)
-        return db_payment
+        return payment
 
     async def get_payment(self, payment_id: UUID) -> Optional[Payment]:
         stmt = select(Payment).where(Payment.payment_id == payment_id)
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def get_payments_by_client(self, client_id: UUID) -> List[Payment]:
+    async def get_payments_by_client(
+        self, client_id: UUID, limit: int, cursor: Optional[str] = None
+    ) -> tuple[List[Payment], Optional[str]]:
         stmt = select(Payment).where(Payment.client_id == client_id)
-        result = await self.db.execute(stmt)
-        return list(result.scalars().all())
+        return await keyset_page(
+            self.db, stmt, Payment.created_at, Payment.payment_id, limit, cursor
+        )
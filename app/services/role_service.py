@@ -1,10 +1,20 @@
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import String, any_, literal, select, delete
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
 from sqlalchemy.exc import IntegrityError
 
-from app.models.users import Role, UserRole
+from app.core.authz_versions import (
+    authz_versions,
+    bump_authz_version,
+    bump_authz_versions_from,
+)
+from app.core.permissions import permission_mask, permission_table
+from app.core.principal_cache import principal_cache
+from app.core.role_map import role_map
+from app.core.writes import insert_returning
+from app.models.users import Permission, Role, RolePermission, User, UserRole
 from app.schemas.roles import RoleCreate
 
 
@@ -13,15 +23,14 @@ class RoleService:
         self.db = db
 
     async def create_role(self, role_in: RoleCreate) -> Role:
-        role = Role(name=role_in.name)
-        self.db.add(role)
-        try:
-            await self.db.commit()
-            await self.db.refresh(role)
-            return role
-        except IntegrityError:
-            await self.db.rollback()
+        role = await insert_returning(
+            self.db, Role, {"name": role_in.name}, conflict=[Role.name]
+        )
+        if role is None:
             raise ValueError("Role already exists")
+        await self.db.commit()
+        role_map.add(role.name, role.role_id)
+        return role
 
     async def get_roles(self) -> List[Role]:
         stmt = select(Role)
@@ -29,18 +38,20 @@ class RoleService:
         return list(result.scalars().all())
 
     async def assign_role_to_user(self, user_id: UUID, role_id: UUID) -> bool:
-        # Check if exists
-        stmt = select(UserRole).where(
-            UserRole.user_id == user_id, UserRole.role_id == role_id
-        )
-        result = await self.db.execute(stmt)
-        if result.scalar_one_or_none():
-            return True  # Already assigned
-
-        user_role = UserRole(user_id=user_id, role_id=role_id)
-        self.db.add(user_role)
         try:
+            user_role = await insert_returning(
+                self.db,
+                UserRole,
+                {"user_id": user_id, "role_id": role_id},
+                conflict=[UserRole.user_id, UserRole.role_id],
+            )
+            if user_role is None:
+                return True  # Already assigned
+            authz = await bump_authz_version(self.db, user_id)
             await self.db.commit()
+            principal_cache.invalidate(user_id)
+            if authz:
+                authz_versions.record(user_id, *authz)
             return True
         except IntegrityError:
             await self.db.rollback()
@@ -51,5 +62,127 @@ class RoleService:
             UserRole.user_id == user_id, UserRole.role_id == role_id
         )
         result = await self.db.execute(stmt)
+        authz = None
+        if result.rowcount > 0:
+            authz = await bump_authz_version(self.db, user_id)
         await self.db.commit()
+        principal_cache.invalidate(user_id)
+        if authz:
+            authz_versions.record(user_id, *authz)
         return result.rowcount > 0
+
+    async def _apply_bulk(self, changed) -> List[UUID]:
+        # changed: CTE with the user_ids whose roles were modified
+        rows = (await self.db.execute(bump_authz_versions_from(changed))).all()
+        await self.db.commit()
+        for user_id, version, is_active in rows:
+            principal_cache.invalidate(user_id)
+            authz_versions.record(user_id, version, bool(is_active))
+        return [row[0] for row in rows]
+
+    async def grant_role_to_users(
+        self, role_id: UUID, user_ids: List[UUID]
+    ) -> Optional[List[UUID]]:
+        """
+        Asigna el rol a todos los `user_ids` en una sentencia: `INSERT ...
+        SELECT` desde `users` (ignora ids inexistentes) con `ON CONFLICT DO
+        NOTHING`, encadenado al bump de `authz_version` de los que cambiaron.
+        Retorna los usuarios a los que se les agregó el rol, o None si el rol
+        no existe.
+        """
+        if await self.db.get(Role, role_id) is None:
+            return None
+        user_roles = UserRole.__table__
+        granted = (
+            pg_insert(user_roles)
+            .from_select(
+                ["user_id", "role_id"],
+                select(User.user_id, literal(role_id, PG_UUID(as_uuid=True))).where(
+                    User.user_id
+                    == any_(literal(user_ids, ARRAY(PG_UUID(as_uuid=True))))
+                ),
+            )
+            .on_conflict_do_nothing()
+            .returning(user_roles.c.user_id)
+            .cte("granted")
+        )
+        return await self._apply_bulk(granted)
+
+    async def revoke_role_from_users(
+        self, role_id: UUID, user_ids: List[UUID]
+    ) -> Optional[List[UUID]]:
+        """
+        Quita el rol a todos los `user_ids` con un único `DELETE ... WHERE
+        user_id = ANY(...)` encadenado al bump de `authz_version`. Retorna los
+        usuarios que tenían el rol, o None si el rol no existe.
+        """
+        if await self.db.get(Role, role_id) is None:
+            return None
+        user_roles = UserRole.__table__
+        revoked = (
+            user_roles.delete()
+            .where(
+                user_roles.c.role_id == role_id,
+                user_roles.c.user_id
+                == any_(literal(user_ids, ARRAY(PG_UUID(as_uuid=True)))),
+            )
+            .returning(user_roles.c.user_id)
+            .cte("revoked")
+        )
+        return await self._apply_bulk(revoked)
+
+    async def get_permissions(self) -> List[Permission]:
+        result = await self.db.execute(select(Permission).order_by(Permission.name))
+        return list(result.scalars().all())
+
+    async def get_role_permissions(self, role_id: UUID) -> Optional[List[str]]:
+        if await self.db.get(Role, role_id) is None:
+            return None
+        stmt = (
+            select(Permission.name)
+            .join(
+                RolePermission, RolePermission.permission_id == Permission.permission_id
+            )
+            .where(RolePermission.role_id == role_id)
+            .order_by(Permission.name)
+        )
+        return list((await self.db.scalars(stmt)).all())
+
+    async def set_role_permissions(
+        self, role_id: UUID, names: List[str]
+    ) -> Optional[List[str]]:
+        """
+        Reemplaza los permisos del rol por `names` (ValueError si alguno no
+        está registrado) y recompila la tabla de permisos de este worker; los
+        demás la recargan en `PERMISSION_REFRESH_SECONDS`. Los principals
+        cacheados no se invalidan: guardan roles, no permisos.
+        """
+        names = sorted(set(names))
+        permission_mask(names)
+        if await self.db.get(Role, role_id) is None:
+            return None
+
+        await permission_table.sync(self.db)
+        wanted = Permission.name == any_(literal(names, ARRAY(String)))
+        role_permissions = RolePermission.__table__
+        await self.db.execute(
+            role_permissions.delete().where(
+                role_permissions.c.role_id == role_id,
+                role_permissions.c.permission_id.not_in(
+                    select(Permission.permission_id).where(wanted)
+                ),
+            )
+        )
+        await self.db.execute(
+            pg_insert(role_permissions)
+            .from_select(
+                ["role_id", "permission_id"],
+                select(
+                    literal(role_id, PG_UUID(as_uuid=True)), Permission.permission_id
+                ).where(wanted),
+            )
+            .on_conflict_do_nothing()
+        )
+        await self.db.commit()
+        await permission_table.refresh(self.db)
+        return names
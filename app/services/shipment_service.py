@@ -1,10 +1,75 @@
 from uuid import UUID
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import String, column, select, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
+from app.core.pagination import keyset_page
+from app.core.writes import insert_returning
 from app.models.shipments import Shipment
-from app.schemas.shipments import ShipmentCreate
+from app.schemas.shipments import (
+    ShipmentBulkStatusResult,
+    ShipmentCreate,
+    ShipmentStatusUpdateItem,
+)
+
+BULK_STATUS_CHUNK_SIZE = 5000
+
+# Máquina de estados de envíos: estado actual -> estados a los que puede pasar
+SHIPMENT_TRANSITIONS: dict[str, frozenset[str]] = {
+    "pending": frozenset({"packed", "cancelled"}),
+    "packed": frozenset({"shipped", "cancelled"}),
+    "shipped": frozenset({"delivered"}),
+    "delivered": frozenset(),
+    "cancelled": frozenset(),
+}
+ALLOWED_PREDECESSORS: dict[str, frozenset[str]] = {
+    target: frozenset(
+        source for source, targets in SHIPMENT_TRANSITIONS.items() if target in targets
+    )
+    for target in SHIPMENT_TRANSITIONS
+}
+
+
+class InvalidStatusTransition(ValueError):
+    """El envío no puede pasar de su estado actual al solicitado."""
+
+    def __init__(self, current: Optional[str], target: str, expected: Optional[str]):
+        self.current = current
+        self.target = target
+        shown = f"'{current}'" if current is not None else "unset"
+        if expected is not None and current != expected:
+            message = f"Shipment status is {shown}, expected '{expected}'"
+        else:
+            message = f"Cannot change shipment status from {shown} to '{target}'"
+        super().__init__(message)
+
+
+def _bulk_status_stmt(key_column: str, key_type, rows: list[tuple]):
+    shipments = Shipment.__table__
+    changes = values(
+        column("key", key_type), column("status", String(50)), name="changes"
+    ).data(rows)
+    transitions = values(
+        column("from_status", String(50)),
+        column("to_status", String(50)),
+        name="transitions",
+        literal_binds=True,
+    ).data(
+        [
+            (source, target)
+            for source, targets in SHIPMENT_TRANSITIONS.items()
+            for target in sorted(targets)
+        ]
+    )
+    return (
+        update(shipments)
+        .where(shipments.c[key_column] == changes.c.key)
+        .where(shipments.c.status == transitions.c.from_status)
+        .where(transitions.c.to_status == changes.c.status)
+        .values(status=changes.c.status)
+        .returning(shipments.c[key_column])
+    )
 
 
 class ShipmentService:
@@ -12,30 +77,128 @@ class ShipmentService:
         self.db = db
 
     async def create_shipment(self, shipment_in: ShipmentCreate) -> Shipment:
-        db_shipment = Shipment(
-            order_id=shipment_in.order_id,
-            client_id=shipment_in.client_id,
-            shipping_carrier=shipment_in.shipping_carrier,
-            tracking_number=shipment_in.tracking_number,
-            address=shipment_in.address,
-            status="pending",
+        shipment = await insert_returning(
+            self.db,
+            Shipment,
+            dict(
+                order_id=shipment_in.order_id,
+                client_id=shipment_in.client_id,
+                shipping_carrier=shipment_in.shipping_carrier,
+                tracking_number=shipment_in.tracking_number,
+                address=shipment_in.address,
+                status="pending",
+            ),
+        )
+        await self.db.commit()
+        return shipment
+
+    async def update_status(
+        self, shipment_id: UUID, status: str, expected_status: Optional[str] = None
+    ) -> Optional[Shipment]:
+        """
+        Cambia el estado con un único `UPDATE ... WHERE status IN (...)`.
+
+        La transición se valida en la propia sentencia, así que dos callbacks
+        concurrentes no pueden pisarse: el segundo ya no encuentra el estado
+        de origen. Solo si no se actualizó nada se consulta el envío para
+        distinguir entre envío inexistente (None) y transición inválida
+        (`InvalidStatusTransition`, también si su estado actual es NULL).
+        """
+        allowed = ALLOWED_PREDECESSORS[status]
+        if expected_status is not None:
+            allowed = allowed & {expected_status}
+
+        stmt = (
+            update(Shipment)
+            .where(
+                Shipment.shipment_id == shipment_id,
+                Shipment.status.in_(sorted(allowed)),
+            )
+            .values(status=status)
+            .returning(Shipment)
         )
-        self.db.add(db_shipment)
+        shipment = (await self.db.scalars(stmt)).one_or_none()
+        if shipment is None:
+            # Select the id too: a NULL status must not read as a missing row
+            existing = (
+                await self.db.execute(
+                    select(Shipment.shipment_id, Shipment.status).where(
+                        Shipment.shipment_id == shipment_id
+                    )
+                )
+            ).one_or_none()
+            await self.db.rollback()
+            if existing is None:
+                return None
+            raise InvalidStatusTransition(existing.status, status, expected_status)
+
         await self.db.commit()
-        await self.db.refresh(db_shipment)
-        return db_shipment
-
-    async def update_status(self, shipment_id: UUID, status: str) -> Optional[Shipment]:
-        stmt = select(Shipment).where(Shipment.shipment_id == shipment_id)
-        result = await self.db.execute(stmt)
-        shipment = result.scalar_one_or_none()
-        if shipment:
-            shipment.status = status
-            await self.db.commit()
-            await self.db.refresh(shipment)
         return shipment
 
-    async def get_shipments_by_client(self, client_id: UUID) -> List[Shipment]:
+    async def bulk_update_status(
+        self, updates: List[ShipmentStatusUpdateItem]
+    ) -> ShipmentBulkStatusResult:
+        """
+        Aplica un lote de cambios de estado con `UPDATE ... FROM (VALUES ...)`.
+
+        Se emite una sentencia por bloque y por tipo de clave (`shipment_id` o
+        `tracking_number`); si una clave aparece varias veces gana la última.
+        Un `tracking_number` puede corresponder a varios envíos y los
+        actualiza todos. La máquina de estados se aplica en el mismo `UPDATE`
+        uniendo con la tabla de transiciones; las claves que existen pero no
+        admiten el cambio se reportan como rechazadas.
+        """
+        by_id: dict[UUID, str] = {}
+        by_tracking: dict[str, str] = {}
+        for item in updates:
+            if item.shipment_id is not None:
+                by_id[item.shipment_id] = item.status
+            else:
+                by_tracking[item.tracking_number] = item.status
+
+        updated = 0
+        not_found: dict[str, list] = {}
+        rejected: dict[str, list] = {}
+        for key_column, key_type, pending in (
+            ("shipment_id", PG_UUID(as_uuid=True), by_id),
+            ("tracking_number", String(255), by_tracking),
+        ):
+            rows = list(pending.items())
+            found = set()
+            for start in range(0, len(rows), BULK_STATUS_CHUNK_SIZE):
+                chunk = rows[start : start + BULK_STATUS_CHUNK_SIZE]
+                result = await self.db.execute(
+                    _bulk_status_stmt(key_column, key_type, chunk)
+                )
+                keys = result.scalars().all()
+                updated += len(keys)
+                found.update(keys)
+
+            missing = [key for key in pending if key not in found]
+            existing = set()
+            key_col = Shipment.__table__.c[key_column]
+            for start in range(0, len(missing), BULK_STATUS_CHUNK_SIZE):
+                chunk = missing[start : start + BULK_STATUS_CHUNK_SIZE]
+                result = await self.db.execute(
+                    select(key_col).where(key_col.in_(chunk))
+                )
+                existing.update(result.scalars().all())
+            rejected[key_column] = [key for key in missing if key in existing]
+            not_found[key_column] = [key for key in missing if key not in existing]
+
+        await self.db.commit()
+        return ShipmentBulkStatusResult(
+            updated=updated,
+            not_found_shipment_ids=not_found["shipment_id"],
+            not_found_tracking_numbers=not_found["tracking_number"],
+            rejected_shipment_ids=rejected["shipment_id"],
+            rejected_tracking_numbers=rejected["tracking_number"],
+        )
+
+    async def get_shipments_by_client(
+        self, client_id: UUID, limit: int, cursor: Optional[str] = None
+    ) -> tuple[List[Shipment], Optional[str]]:
         stmt = select(Shipment).where(Shipment.client_id == client_id)
-        result = await self.db.execute(stmt)
-        return list(result.scalars().all())
+        return await keyset_page(
+            self.db, stmt, Shipment.created_at, Shipment.shipment_id, limit, cursor
+        )
@@ -1,12 +1,24 @@
-from uuid import UUID
+from uuid import UUID, uuid4
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import String, any_, delete, func, insert, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.users import User, Role, UserRole
-from app.schemas.users import UserCreate, UserUpdate
-from app.core.security import get_password_hash
+from app.schemas.users import (
+    UserBulkOutcome,
+    UserBulkResult,
+    UserCreate,
+    UserUpdate,
+)
+from app.core.pagination import keyset_page
+from app.core.authz_versions import authz_versions, bump_authz_version
+from app.core.principal_cache import principal_cache
+from app.core.role_map import role_map
+from app.core.security import hash_password_async, hash_passwords_async
+from app.core.writes import insert_returning
 
 
 class UserService:
@@ -14,34 +26,125 @@ class UserService:
         self.db = db
 
     async def create_user(self, user_in: UserCreate) -> User:
-        # Check email
-        stmt = select(User).where(User.email == user_in.email)
-        result = await self.db.execute(stmt)
-        if result.scalar_one_or_none():
+        # The unique lower(email) index detects duplicates in the same INSERT
+        user = await insert_returning(
+            self.db,
+            User,
+            dict(
+                email=user_in.email,
+                password_hash=await hash_password_async(user_in.password),
+                full_name=user_in.full_name,
+                is_active=user_in.is_active,
+            ),
+            conflict=[func.lower(User.email)],
+        )
+        if user is None:
             raise ValueError("Email already registered")
 
-        # Create user
-        user = User(
-            email=user_in.email,
-            password_hash=get_password_hash(user_in.password),
-            full_name=user_in.full_name,
-            is_active=user_in.is_active,
-        )
-        self.db.add(user)
-        await self.db.flush()  # Get ID
+        role_ids = await role_map.resolve(self.db, user_in.roles)
+        roles = await self._grant_roles(user.user_id, list(role_ids.values()))
+        set_committed_value(user, "roles", roles)
+        await self.db.commit()
+        return user
 
-        # Assign roles
-        if user_in.roles:
-            await self._sync_roles(user.user_id, user_in.roles)
+    async def create_users_bulk(self, users_in: List[UserCreate]) -> UserBulkResult:
+        """
+        Crea un lote de usuarios en dos sentencias y un commit.
+
+        Las contraseñas se hashean en paralelo en el pool de procesos; los
+        usuarios se insertan con un único `INSERT ... ON CONFLICT (lower(email))
+        DO NOTHING RETURNING` y los roles de los creados con un
+        `INSERT ... SELECT` sobre `unnest` de pares (usuario, rol). Un email ya
+        registrado no falla el lote: se reporta como `exists` (los roles de ese
+        usuario no se tocan). Los nombres de rol desconocidos se ignoran, igual
+        que en `create_user`.
+        """
+        outcomes: List[Optional[UserBulkOutcome]] = []
+        seen: set[str] = set()
+        pending: List[int] = []
+        for index, user_in in enumerate(users_in):
+            key = user_in.email.lower()
+            if key in seen:
+                outcomes.append(
+                    UserBulkOutcome(
+                        index=index, email=user_in.email, status="duplicate"
+                    )
+                )
+                continue
+            seen.add(key)
+            pending.append(index)
+            outcomes.append(None)
+
+        hashes = await hash_passwords_async([users_in[i].password for i in pending])
+        user_ids = {i: uuid4() for i in pending}
+        users = User.__table__
+        stmt = (
+            pg_insert(users)
+            .values(
+                [
+                    dict(
+                        user_id=user_ids[i],
+                        email=users_in[i].email,
+                        password_hash=password_hash,
+                        full_name=users_in[i].full_name,
+                        is_active=users_in[i].is_active,
+                    )
+                    for i, password_hash in zip(pending, hashes)
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=[func.lower(users.c.email)])
+            .returning(users.c.user_id)
+        )
+        created = set((await self.db.execute(stmt)).scalars().all())
 
+        grants = [
+            (user_ids[i], name)
+            for i in pending
+            if user_ids[i] in created
+            for name in dict.fromkeys(users_in[i].roles)
+        ]
+        if grants:
+            pairs = (
+                func.unnest(
+                    literal(
+                        [user_id for user_id, _ in grants], ARRAY(PG_UUID(as_uuid=True))
+                    ),
+                    literal([name for _, name in grants], ARRAY(String(50))),
+                )
+                .table_valued("user_id", "name")
+                .render_derived(name="grants")
+            )
+            await self.db.execute(
+                insert(UserRole.__table__).from_select(
+                    ["user_id", "role_id"],
+                    select(pairs.c.user_id, Role.role_id).join(
+                        Role, Role.name == pairs.c.name
+                    ),
+                )
+            )
         await self.db.commit()
-        await self.db.refresh(user, attribute_names=["roles"])
-        return user
 
-    async def get_users(self, skip: int = 0, limit: int = 100) -> List[User]:
-        stmt = select(User).options(selectinload(User.roles)).offset(skip).limit(limit)
-        result = await self.db.execute(stmt)
-        return list(result.scalars().all())
+        for i in pending:
+            user_id = user_ids[i]
+            outcomes[i] = UserBulkOutcome(
+                index=i,
+                email=users_in[i].email,
+                status="created" if user_id in created else "exists",
+                user_id=user_id if user_id in created else None,
+            )
+        return UserBulkResult(
+            created=len(created),
+            skipped=len(users_in) - len(created),
+            results=outcomes,
+        )
+
+    async def get_users(
+        self, limit: int, cursor: Optional[str] = None
+    ) -> tuple[List[User], Optional[str]]:
+        stmt = select(User).options(selectinload(User.roles))
+        return await keyset_page(
+            self.db, stmt, User.created_at, User.user_id, limit, cursor
+        )
 
     async def get_user(self, user_id: UUID) -> Optional[User]:
         stmt = (
@@ -57,16 +160,24 @@ class UserService:
         if not user:
             return None
 
+        authz_changed = False
         if user_in.full_name is not None:
             user.full_name = user_in.full_name
-        if user_in.is_active is not None:
+        if user_in.is_active is not None and user_in.is_active != user.is_active:
             user.is_active = user_in.is_active
+            authz_changed = True
 
         if user_in.roles is not None:
-            await self._sync_roles(user.user_id, user_in.roles)
+            authz_changed |= await self._sync_roles(user, user_in.roles)
+
+        authz = None
+        if authz_changed:
+            authz = await bump_authz_version(self.db, user_id)
 
         await self.db.commit()
-        await self.db.refresh(user, attribute_names=["roles"])
+        principal_cache.invalidate(user_id)
+        if authz:
+            authz_versions.record(user_id, *authz)
         return user
 
     async def delete_user(self, user_id: UUID) -> bool:
@@ -75,7 +186,11 @@ class UserService:
             return False
 
         user.is_active = False
+        authz = await bump_authz_version(self.db, user_id)
         await self.db.commit()
+        principal_cache.invalidate(user_id)
+        if authz:
+            authz_versions.record(user_id, *authz)
         return True
 
     async def change_password(self, user_id: UUID, new_password: str) -> bool:
@@ -83,24 +198,62 @@ class UserService:
         if not user:
             return False
 
-        user.password_hash = get_password_hash(new_password)
+        user.password_hash = await hash_password_async(new_password)
         await self.db.commit()
+        principal_cache.invalidate(user_id)
         return True
 
-    async def _sync_roles(self, user_id: UUID, role_names: List[str]):
-        # Clear existing roles
-        stmt = delete(UserRole).where(UserRole.user_id == user_id)
-        await self.db.execute(stmt)
+    async def _grant_roles(self, user_id: UUID, role_ids: List[UUID]) -> List[Role]:
+        """
+        Asigna `role_ids` con un `INSERT ... SELECT ... ON CONFLICT DO NOTHING`
+        y devuelve los roles efectivamente agregados, en la misma sentencia.
+        Seleccionar desde `roles` descarta ids que ya no existan.
+        """
+        if not role_ids:
+            return []
+        user_roles = UserRole.__table__
+        granted = (
+            pg_insert(user_roles)
+            .from_select(
+                ["user_id", "role_id"],
+                select(literal(user_id, PG_UUID(as_uuid=True)), Role.role_id).where(
+                    Role.role_id
+                    == any_(literal(role_ids, ARRAY(PG_UUID(as_uuid=True))))
+                ),
+            )
+            .on_conflict_do_nothing()
+            .returning(user_roles.c.role_id)
+            .cte("granted")
+        )
+        stmt = select(Role).join(granted, granted.c.role_id == Role.role_id)
+        return list((await self.db.scalars(stmt)).all())
+
+    async def _sync_roles(self, user: User, role_names: List[str]) -> bool:
+        """
+        Deja a `user` exactamente con `role_names` aplicando solo la diferencia.
 
-        if not role_names:
-            return
+        Compara contra `user.roles` (ya cargado) y emite a lo sumo un
+        `DELETE ... WHERE role_id = ANY(...)` y un `INSERT ... SELECT`; si el
+        conjunto no cambia no se escribe nada. Los nombres se resuelven con
+        `role_map` (los desconocidos se ignoran). Retorna True si hubo cambios.
+        """
+        wanted = set((await role_map.resolve(self.db, role_names)).values())
+        current = {role.role_id: role for role in user.roles}
+        removed = [role_id for role_id in current if role_id not in wanted]
+        added = [role_id for role_id in wanted if role_id not in current]
 
-        # Find role IDs
-        stmt = select(Role).where(Role.name.in_(role_names))
-        result = await self.db.execute(stmt)
-        roles = result.scalars().all()
+        if removed:
+            await self.db.execute(
+                delete(UserRole)
+                .where(
+                    UserRole.user_id == user.user_id,
+                    UserRole.role_id
+                    == any_(literal(removed, ARRAY(PG_UUID(as_uuid=True)))),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        granted = await self._grant_roles(user.user_id, added)
 
-        # Add new roles
-        for role in roles:
-            user_role = UserRole(user_id=user_id, role_id=role.role_id)
-            self.db.add(user_role)
+        kept = [role for role_id, role in current.items() if role_id in wanted]
+        set_committed_value(user, "roles", kept + granted)
+        return bool(removed or added)
@@ -0,0 +1,94 @@
+"""
+Mide el throughput de creación de órdenes: una a una (`create_order`) contra
+la carga masiva (`create_orders_bulk`, la ruta de `POST /orders/bulk`).
+
+Escribe directamente en la base configurada en `.env`; las órdenes creadas
+se borran al terminar salvo que se pase `--keep`.
+
+Uso:
+    python scripts/bench_bulk_orders.py --orders 5000 --items 3
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from decimal import Decimal
+
+from sqlalchemy import delete
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from app.core.database import AsyncSessionLocal  # noqa: E402
+from app.models.client_balances import ClientBalance  # noqa: E402
+from app.models.orders import Order  # noqa: E402
+from app.schemas.orders import OrderCreate, OrderItemCreate  # noqa: E402
+from app.services.order_service import OrderService  # noqa: E402
+
+
+def build_orders(client_id: uuid.UUID, count: int, items: int) -> list[OrderCreate]:
+    return [
+        OrderCreate(
+            client_id=client_id,
+            notes=f"bench order {n}",
+            items=[
+                OrderItemCreate(
+                    device_id=uuid.uuid4(),
+                    product_key="BENCH",
+                    quantity=1 + i % 3,
+                    unit_price=Decimal("19.99"),
+                )
+                for i in range(items)
+            ],
+        )
+        for n in range(count)
+    ]
+
+
+async def run(args):
+    client_id = uuid.uuid4()
+    print(f"bench client_id: {client_id}")
+
+    single = build_orders(client_id, args.single_orders, args.items)
+    async with AsyncSessionLocal() as session:
+        service = OrderService(session)
+        start = time.perf_counter()
+        for order_in in single:
+            await service.create_order(order_in)
+        elapsed = time.perf_counter() - start
+    print(
+        f"{'create_order (one by one)':<28} {len(single) / elapsed:>10,.0f} orders/s "
+        f"({len(single)} orders in {elapsed:.2f}s)"
+    )
+
+    bulk = build_orders(client_id, args.orders, args.items)
+    async with AsyncSessionLocal() as session:
+        service = OrderService(session)
+        start = time.perf_counter()
+        result = await service.create_orders_bulk(bulk, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+    print(
+        f"{'create_orders_bulk':<28} {result.created / elapsed:>10,.0f} orders/s "
+        f"({result.created} orders in {elapsed:.2f}s, {len(result.errors)} errors)"
+    )
+
+    if not args.keep:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(Order).where(Order.client_id == client_id))
+            await session.execute(
+                delete(ClientBalance).where(ClientBalance.client_id == client_id)
+            )
+            await session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--single-orders", type=int, default=500)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--keep", action="store_true")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,93 @@
+"""
+Mide la latencia de endpoints que no son de autenticación mientras se ejecuta
+una ráfaga concurrente de logins contra la API.
+
+Uso:
+    python scripts/bench_login_storm.py --email admin@gac.com --password admin123
+
+Ejecutar una vez contra el código anterior (hash síncrono) y otra con el pool
+de procesos para comparar el p99 de /health durante la ráfaga.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def login_worker(
+    client: httpx.AsyncClient, args, stop: asyncio.Event, counters: dict
+):
+    while not stop.is_set():
+        response = await client.post(
+            f"{args.base_url}/api/v1/auth/login",
+            data={"username": args.email, "password": args.password},
+        )
+        counters[response.status_code] = counters.get(response.status_code, 0) + 1
+
+
+async def probe_worker(
+    client: httpx.AsyncClient, args, stop: asyncio.Event, latencies: list
+):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get(f"{args.base_url}{args.probe_path}")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(args.probe_interval)
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as client:
+        # Línea base sin ráfaga de logins
+        stop = asyncio.Event()
+        baseline: list[float] = []
+        probe = asyncio.create_task(probe_worker(client, args, stop, baseline))
+        await asyncio.sleep(args.duration / 3)
+        stop.set()
+        await probe
+
+        stop = asyncio.Event()
+        storm: list[float] = []
+        counters: dict[int, int] = {}
+        tasks = [
+            asyncio.create_task(login_worker(client, args, stop, counters))
+            for _ in range(args.concurrency)
+        ]
+        tasks.append(asyncio.create_task(probe_worker(client, args, stop, storm)))
+        await asyncio.sleep(args.duration)
+        stop.set()
+        await asyncio.gather(*tasks)
+
+    for label, samples in (("baseline", baseline), ("login storm", storm)):
+        print(
+            f"{label:>12}: n={len(samples)} "
+            f"p50={statistics.median(samples) if samples else 0:.1f}ms "
+            f"p99={percentile(samples, 99):.1f}ms "
+            f"max={max(samples, default=0):.1f}ms"
+        )
+    total = sum(counters.values())
+    print(f"logins: {total} in {args.duration}s ({total / args.duration:.1f}/s)")
+    print(f"status codes: {counters}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--probe-path", default="/health")
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    asyncio.run(run(parser.parse_args()))
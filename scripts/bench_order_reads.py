@@ -0,0 +1,138 @@
+"""
+Compara las dos formas de leer las órdenes de un cliente:
+
+- ORM: orden + `selectinload` de items y validación de cada instancia en
+  `OrderResponse`, como hacía el endpoint antes de servir JSON.
+- JSON: `get_orders_by_client_json`, una sola consulta con `json_agg` cuyo
+  texto se inserta directo en la respuesta (`raw_response`).
+
+Crea un cliente con `--orders` órdenes en la base configurada en `.env` y
+las borra al terminar salvo que se pase `--keep`.
+
+Uso:
+    python scripts/bench_order_reads.py --orders 5000 --items 3 --limit 100
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from decimal import Decimal
+from typing import List
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import selectinload
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from app.core.database import AsyncSessionLocal  # noqa: E402
+from app.core.pagination import keyset_page  # noqa: E402
+from app.models.client_balances import ClientBalance  # noqa: E402
+from app.models.orders import Order  # noqa: E402
+from app.schemas.common import ResponseModel, raw_response  # noqa: E402
+from app.schemas.orders import OrderCreate, OrderItemCreate, OrderResponse  # noqa: E402
+from app.services.order_service import OrderService  # noqa: E402
+
+PageModel = ResponseModel[List[OrderResponse]]
+
+
+async def read_orm(service: OrderService, client_id, limit: int) -> int:
+    pages = 0
+    cursor = None
+    while True:
+        stmt = (
+            select(Order)
+            .options(selectinload(Order.items))
+            .where(Order.client_id == client_id)
+        )
+        orders, cursor = await keyset_page(
+            service.db, stmt, Order.created_at, Order.order_id, limit, cursor
+        )
+        # What FastAPI does with response_model=ResponseModel[List[OrderResponse]]
+        PageModel(message="ok", data=orders, next_cursor=cursor).model_dump_json()
+        service.db.expunge_all()
+        pages += 1
+        if cursor is None:
+            return pages
+
+
+async def read_json(service: OrderService, client_id, limit: int) -> int:
+    pages = 0
+    cursor = None
+    while True:
+        orders, cursor = await service.get_orders_by_client_json(
+            client_id, limit, cursor
+        )
+        raw_response("ok", orders, cursor)
+        pages += 1
+        if cursor is None:
+            return pages
+
+
+async def measure(name: str, func, client_id, args) -> None:
+    async with AsyncSessionLocal() as session:
+        service = OrderService(session)
+        await func(service, client_id, args.limit)  # warm up caches
+        tracemalloc.start()
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        for _ in range(args.repeat):
+            pages = await func(service, client_id, args.limit)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        cpu = (time.process_time() - cpu_start) / args.repeat
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(
+        f"{name:<6} {elapsed * 1000:>9.1f} ms/pass  {cpu * 1000:>9.1f} ms CPU  "
+        f"peak {peak / 1024 / 1024:>6.1f} MiB  ({pages} pages, "
+        f"{args.orders / elapsed:,.0f} orders/s)"
+    )
+
+
+async def run(args):
+    client_id = uuid.uuid4()
+    print(f"bench client_id: {client_id}")
+    orders = [
+        OrderCreate(
+            client_id=client_id,
+            notes=f"bench order {n}",
+            items=[
+                OrderItemCreate(
+                    device_id=uuid.uuid4(),
+                    product_key="BENCH",
+                    quantity=1 + i % 3,
+                    unit_price=Decimal("19.99"),
+                )
+                for i in range(args.items)
+            ],
+        )
+        for n in range(args.orders)
+    ]
+    async with AsyncSessionLocal() as session:
+        await OrderService(session).create_orders_bulk(orders)
+
+    try:
+        await measure("orm", read_orm, client_id, args)
+        await measure("json", read_json, client_id, args)
+    finally:
+        if not args.keep:
+            async with AsyncSessionLocal() as session:
+                await session.execute(delete(Order).where(Order.client_id == client_id))
+                await session.execute(
+                    delete(ClientBalance).where(ClientBalance.client_id == client_id)
+                )
+                await session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=100, help="Page size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--keep", action="store_true")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark de creación y validación de tokens PASETO.
+
+Compara la implementación anterior (derivar la clave y descifrar en cada
+llamada) contra el key ring precalculado y el cache de tokens verificados.
+
+Uso:
+    python scripts/bench_paseto.py --iterations 20000
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+import pyseto
+from pyseto import Key
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from app.core.config import settings  # noqa: E402
+from app.core.paseto import create_app_token, decode_service_token  # noqa: E402
+
+
+def legacy_decode_service_token(token: str) -> dict | None:
+    """Ruta anterior: base64 + Key.new + descifrado + parseo ISO por llamada."""
+    try:
+        secret = base64.b64decode(settings.PASETO_SECRET_KEY)
+        if len(secret) < 32:
+            secret = secret.ljust(32, b"\0")
+        elif len(secret) > 32:
+            secret = secret[:32]
+        key = Key.new(version=4, purpose="local", key=secret)
+        decoded = pyseto.decode(key, token)
+        payload = json.loads(decoded.payload.decode("utf-8"))
+        exp = datetime.fromisoformat(payload["exp"])
+        if datetime.now(timezone.utc) > exp:
+            return None
+        return payload
+    except Exception:
+        return None
+
+
+def measure(label: str, func, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    rate = iterations / elapsed
+    print(f"{label:<38} {rate:>12,.0f} ops/s  ({elapsed * 1e6 / iterations:.1f} us/op)")
+    return rate
+
+
+def main(iterations: int):
+    token = create_app_token(uuid.uuid4())
+    assert legacy_decode_service_token(token) is not None
+    assert decode_service_token(token) is not None
+
+    measure("create_app_token", lambda: create_app_token(uuid.uuid4()), iterations)
+    legacy = measure(
+        "decode (legacy, same token)",
+        lambda: legacy_decode_service_token(token),
+        iterations,
+    )
+    cached = measure(
+        "decode (key ring + cache, same token)",
+        lambda: decode_service_token(token),
+        iterations,
+    )
+
+    distinct = [create_app_token(uuid.uuid4()) for _ in range(iterations)]
+    tokens = iter(distinct)
+    measure(
+        "decode (key ring, distinct tokens)",
+        lambda: decode_service_token(next(tokens)),
+        iterations,
+    )
+
+    print(f"\nspeedup on repeated validation: {cached / legacy:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args().iterations)
@@ -0,0 +1,90 @@
+"""
+Calibra los parámetros de argon2 para la máquina donde se ejecuta.
+
+Mide el tiempo de hash para distintas combinaciones de memoria y tiempo y
+propone la más costosa que se mantiene bajo la latencia objetivo. Debe
+ejecutarse dentro del contenedor de destino (mismo límite de CPU/memoria).
+
+Uso:
+    python scripts/calibrate_argon2.py --target-ms 250 --max-memory-mib 128
+
+Los hashes existentes con otros parámetros se actualizan solos en el
+siguiente login exitoso (rehash transparente), sin forzar cambios de contraseña.
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from passlib.context import CryptContext
+
+MEMORY_STEPS_KIB = [19456, 32768, 47104, 65536, 102400, 131072, 262144, 524288]
+
+
+def measure_ms(
+    time_cost: int, memory_kib: int, parallelism: int, samples: int
+) -> float:
+    context = CryptContext(
+        schemes=["argon2"],
+        argon2__time_cost=time_cost,
+        argon2__memory_cost=memory_kib,
+        argon2__parallelism=parallelism,
+    )
+    context.hash("warm-up-password")
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(args) -> None:
+    best = None
+    print(f"{'memory':>10} {'time':>5} {'p':>3} {'median ms':>10}")
+    for memory_kib in MEMORY_STEPS_KIB:
+        if memory_kib > args.max_memory_mib * 1024:
+            break
+        for time_cost in range(args.min_time_cost, args.max_time_cost + 1):
+            elapsed = measure_ms(time_cost, memory_kib, args.parallelism, args.samples)
+            print(
+                f"{memory_kib // 1024:>7}MiB {time_cost:>5} {args.parallelism:>3} "
+                f"{elapsed:>10.1f}"
+            )
+            if elapsed > args.target_ms:
+                break
+            cost = memory_kib * time_cost
+            if best is None or cost > best[0]:
+                best = (cost, time_cost, memory_kib, elapsed)
+
+    if best is None:
+        print("\nNo configuration meets the target; raise --target-ms.")
+        return
+
+    _, time_cost, memory_kib, elapsed = best
+    workers = args.workers or os.cpu_count() or 1
+    per_worker = 1000 / elapsed
+    print("\n# Suggested settings (.env)")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST={memory_kib}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+    print(f"PASSWORD_HASH_WORKERS={workers}")
+    print(
+        f"\n# ~{elapsed:.0f} ms per hash, ~{per_worker * workers:.0f} logins/s "
+        f"with {workers} workers, {memory_kib * workers // 1024} MiB peak hashing memory"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--max-memory-mib", type=int, default=128)
+    parser.add_argument("--parallelism", type=int, default=1)
+    parser.add_argument("--min-time-cost", type=int, default=2)
+    parser.add_argument("--max-time-cost", type=int, default=8)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument(
+        "--workers", type=int, default=0, help="Process pool size (default: CPUs)"
+    )
+    calibrate(parser.parse_args())
@@ -0,0 +1,363 @@
+"""
+Verifica que las consultas de `app/services/` usen índices.
+
+Siembra datos sintéticos en la base configurada en `.env` (con el esquema
+de `alembic upgrade head`), ejecuta las operaciones reales de cada servicio
+y, por cada sentencia que emiten, corre `EXPLAIN` con los mismos parámetros.
+Falla (código de salida 1) si algún plan contiene un `Seq Scan` o un `Sort`
+sobre una tabla grande. `Incremental Sort` se permite: ordena por grupos de
+filas ya ordenadas sin materializar la entrada completa.
+
+Todo corre dentro de una transacción que se revierte al final: los commits
+de los servicios se convierten en savepoints y no queda nada escrito.
+
+Uso:
+    python scripts/check_query_plans.py
+    python scripts/check_query_plans.py --orders 200000 --verbose
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sys
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from app.api.deps import _load_principal  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.schemas.orders import OrderCreate, OrderItemCreate  # noqa: E402
+from app.schemas.payments import PaymentCreate  # noqa: E402
+from app.schemas.shipments import ShipmentStatusUpdateItem  # noqa: E402
+from app.schemas.users import UserCreate  # noqa: E402
+from app.services.auth_service import AuthService  # noqa: E402
+from app.services.balance_service import BalanceService  # noqa: E402
+from app.services.export_service import ExportService  # noqa: E402
+from app.services.order_service import OrderService  # noqa: E402
+from app.services.payment_import_service import PaymentImportService  # noqa: E402
+from app.services.payment_service import PaymentService  # noqa: E402
+from app.services.role_service import RoleService  # noqa: E402
+from app.services.shipment_service import ShipmentService  # noqa: E402
+from app.services.user_service import UserService  # noqa: E402
+
+LARGE_TABLES = {
+    "users",
+    "user_roles",
+    "orders",
+    "order_items",
+    "payments",
+    "shipments",
+    "client_balances",
+}
+EXPLAINABLE = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+
+# Un orden cada 10 minutos hacia atrás desde ahora; ids derivados de md5
+# para poder calcularlos igual en SQL y en Python
+SEED = [
+    """
+    INSERT INTO gac.users (user_id, email, password_hash, full_name, is_active, created_at)
+    SELECT md5('plan-user' || g)::uuid, 'plan-user-' || g || '@example.com',
+           :password_hash, 'Plan user ' || g, true, now() - g * interval '1 minute'
+    FROM generate_series(1, :users) g
+    """,
+    """
+    INSERT INTO gac.roles (role_id, name)
+    VALUES (md5('plan-role')::uuid, 'plan-check')
+    """,
+    """
+    INSERT INTO gac.user_roles (user_id, role_id)
+    SELECT md5('plan-user' || g)::uuid, md5('plan-role')::uuid
+    FROM generate_series(1, :users, 2) g
+    """,
+    """
+    INSERT INTO gac.orders (order_id, client_id, status, total_amount, created_at, updated_at)
+    SELECT md5('plan-order' || g)::uuid, md5('plan-client' || g % :clients)::uuid,
+           'pending', 30, now() - g * interval '10 minutes', now()
+    FROM generate_series(1, :orders) g
+    """,
+    """
+    INSERT INTO gac.order_items (order_id, product_key, quantity, unit_price, created_at)
+    SELECT md5('plan-order' || g)::uuid, 'PLAN', 1, 10,
+           now() - g * interval '10 minutes' + i * interval '1 second'
+    FROM generate_series(1, :orders) g, generate_series(1, 3) i
+    """,
+    """
+    INSERT INTO gac.payments (payment_id, order_id, client_id, amount, method, status,
+                              transaction_ref, created_at)
+    SELECT md5('plan-payment' || g || '-' || i)::uuid, md5('plan-order' || g)::uuid,
+           md5('plan-client' || g % :clients)::uuid, 15, 'transfer', 'pending',
+           'PLAN-' || g || '-' || i, now() - g * interval '10 minutes'
+    FROM generate_series(1, :orders) g, generate_series(1, 2) i
+    """,
+    """
+    INSERT INTO gac.shipments (shipment_id, order_id, client_id, tracking_number, status,
+                               created_at, updated_at)
+    SELECT md5('plan-shipment' || g)::uuid, md5('plan-order' || g)::uuid,
+           md5('plan-client' || g % :clients)::uuid, 'PLAN-TRACK-' || g, 'pending',
+           now() - g * interval '10 minutes', now()
+    FROM generate_series(1, :orders) g
+    """,
+    """
+    INSERT INTO gac.client_balances (client_id, orders_count, orders_total, payments_pending)
+    SELECT md5('plan-client' || g % :clients)::uuid, count(*), count(*) * 30, count(*) * 60
+    FROM generate_series(1, :orders) g
+    GROUP BY 1
+    """,
+]
+
+
+def seeded_id(prefix: str, n) -> uuid.UUID:
+    return uuid.UUID(hashlib.md5(f"{prefix}{n}".encode()).hexdigest())
+
+
+def plan_problems(plan: dict) -> list[str]:
+    problems = []
+
+    def walk(node: dict) -> set:
+        relations = set()
+        for child in node.get("Plans", []):
+            relations |= walk(child)
+        relation = node.get("Relation Name")
+        if relation:
+            relations.add(relation)
+        if node["Node Type"] == "Seq Scan" and relation in LARGE_TABLES:
+            problems.append(f"Seq Scan on {relation}")
+        large = relations & LARGE_TABLES
+        if node["Node Type"] == "Sort" and large:
+            problems.append(
+                f"Sort by {', '.join(node.get('Sort Key', []))} "
+                f"over {', '.join(sorted(large))}"
+            )
+        return relations
+
+    walk(plan["Plan"])
+    return problems
+
+
+class PlanRecorder:
+    """Corre `EXPLAIN` sobre cada sentencia antes de que se ejecute."""
+
+    def __init__(self):
+        self.label = None
+        self.plans: list[tuple[str, str, dict]] = []
+
+    def before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        if self.label is None or executemany or not EXPLAINABLE.match(statement):
+            return
+        explain = conn.connection.cursor()
+        explain.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+        plan = explain.fetchone()[0]
+        explain.close()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        self.plans.append((self.label, statement, plan[0]))
+
+
+async def exercise_services(db: AsyncSession, recorder: PlanRecorder) -> None:
+    client_id = seeded_id("plan-client", 1)
+    user_id = seeded_id("plan-user", 1)
+    order_id = seeded_id("plan-order", 1)
+    payment_id = seeded_id("plan-payment", "1-1")
+    shipment_id = seeded_id("plan-shipment", 1)
+    day_ago = datetime.utcnow() - timedelta(days=1)
+
+    async def check(label, coro):
+        recorder.label = label
+        try:
+            return await coro
+        finally:
+            recorder.label = None
+
+    await check(
+        "auth.authenticate_user",
+        AuthService(db).authenticate_user("PLAN-USER-1@example.com", "wrong"),
+    )
+    await check("deps._load_principal", _load_principal(db, user_id))
+
+    users = UserService(db)
+    _, cursor = await check("users.get_users", users.get_users(20))
+    await check("users.get_users (cursor)", users.get_users(20, cursor))
+    await check("users.get_user", users.get_user(user_id))
+    try:
+        await check(
+            "users.create_user (duplicate)",
+            users.create_user(
+                UserCreate(email="plan-user-1@example.com", password="x" * 12)
+            ),
+        )
+    except ValueError:
+        pass
+
+    await check(
+        "roles.assign_role_to_user",
+        RoleService(db).assign_role_to_user(
+            seeded_id("plan-user", 2), seeded_id("plan-role", "")
+        ),
+    )
+
+    orders = OrderService(db)
+    await check(
+        "orders.create_order",
+        orders.create_order(
+            OrderCreate(
+                client_id=client_id,
+                items=[OrderItemCreate(product_key="PLAN", unit_price=Decimal("10"))],
+            )
+        ),
+    )
+    await check("orders.get_order_json", orders.get_order_json(order_id))
+    _, cursor = await check(
+        "orders.get_orders_by_client_json",
+        orders.get_orders_by_client_json(client_id, 20),
+    )
+    await check(
+        "orders.get_orders_by_client_json (cursor)",
+        orders.get_orders_by_client_json(client_id, 20, cursor),
+    )
+
+    payments = PaymentService(db)
+    await check(
+        "payments.create_payment",
+        payments.create_payment(
+            PaymentCreate(
+                order_id=order_id,
+                client_id=client_id,
+                amount=Decimal("15"),
+                method="transfer",
+            )
+        ),
+    )
+    await check("payments.get_payment", payments.get_payment(payment_id))
+    _, cursor = await check(
+        "payments.get_payments_by_client",
+        payments.get_payments_by_client(client_id, 20),
+    )
+    await check(
+        "payments.get_payments_by_client (cursor)",
+        payments.get_payments_by_client(client_id, 20, cursor),
+    )
+
+    async def import_chunks():
+        yield json.dumps(
+            {
+                "order_id": str(order_id),
+                "client_id": str(client_id),
+                "amount": "15",
+                "method": "transfer",
+                "transaction_ref": "PLAN-1-1",
+            }
+        ).encode()
+
+    await check(
+        "payment_import.import_stream",
+        PaymentImportService(db).import_stream(import_chunks(), "ndjson"),
+    )
+
+    shipments = ShipmentService(db)
+    await check(
+        "shipments.update_status", shipments.update_status(shipment_id, "packed")
+    )
+    await check(
+        "shipments.bulk_update_status",
+        shipments.bulk_update_status(
+            [
+                ShipmentStatusUpdateItem(
+                    shipment_id=seeded_id("plan-shipment", 2), status="packed"
+                ),
+                ShipmentStatusUpdateItem(
+                    tracking_number="PLAN-TRACK-3", status="packed"
+                ),
+            ]
+        ),
+    )
+    _, cursor = await check(
+        "shipments.get_shipments_by_client",
+        shipments.get_shipments_by_client(client_id, 20),
+    )
+    await check(
+        "shipments.get_shipments_by_client (cursor)",
+        shipments.get_shipments_by_client(client_id, 20, cursor),
+    )
+
+    await check("balances.get_summary", BalanceService(db).get_summary(client_id))
+
+    exports = ExportService(db)
+    for kind in ("orders", "payments", "shipments"):
+        for filters in (
+            {"client_id": client_id},
+            {"created_from": day_ago - timedelta(days=1), "created_to": day_ago},
+        ):
+            recorder.label = f"exports.export_{kind} ({', '.join(filters)})"
+            batches = getattr(exports, f"export_{kind}")("ndjson", **filters)
+            async for _ in batches:
+                break
+            await batches.aclose()
+            recorder.label = None
+
+
+async def run(args) -> int:
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    recorder = PlanRecorder()
+    event.listen(
+        engine.sync_engine, "before_cursor_execute", recorder.before_cursor_execute
+    )
+
+    params = {
+        "users": args.users,
+        "orders": args.orders,
+        "clients": args.clients,
+        "password_hash": get_password_hash("plan-check-password"),
+    }
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            for statement in SEED:
+                await conn.execute(text(statement), params)
+            for table in sorted(LARGE_TABLES):
+                await conn.execute(text(f"ANALYZE gac.{table}"))
+
+            async with AsyncSession(
+                bind=conn,
+                join_transaction_mode="create_savepoint",
+                expire_on_commit=False,
+            ) as db:
+                await exercise_services(db, recorder)
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+    failures = 0
+    for label, statement, plan in recorder.plans:
+        problems = plan_problems(plan)
+        status = "FAIL" if problems else "ok"
+        print(f"{status:<5} {label}")
+        for problem in problems:
+            print(f"        {problem}")
+        if problems or args.verbose:
+            print("        " + " ".join(statement.split())[:300])
+        failures += bool(problems)
+
+    print(f"\n{len(recorder.plans)} statements checked, {failures} with problems")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--orders", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--verbose", action="store_true")
+    sys.exit(asyncio.run(run(parser.parse_args())))
@@ -0,0 +1,93 @@
+"""
+Importa un archivo de conciliación bancaria (NDJSON o CSV) a `gac.payments`.
+
+Usa el mismo servicio que `POST /api/v1/payments/import`: el archivo se lee
+por bloques, se valida fila a fila y se carga con COPY, sin tenerlo completo
+en memoria. Escribe directamente en la base configurada en `.env`.
+
+Uso:
+    python scripts/import_payments.py pagos.csv
+    python scripts/import_payments.py pagos.ndjson --errors errores.ndjson
+    python scripts/import_payments.py --generate 100000 > pagos.ndjson
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from app.core.database import AsyncSessionLocal  # noqa: E402
+from app.services.payment_import_service import PaymentImportService  # noqa: E402
+
+READ_SIZE = 256 * 1024
+
+
+async def read_file(path: str):
+    with open(path, "rb") as f:
+        while chunk := f.read(READ_SIZE):
+            yield chunk
+
+
+def detect_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "ndjson"
+
+
+def generate(rows: int) -> None:
+    """Escribe en stdout un NDJSON sintético para pruebas de throughput."""
+    client_ids = [str(uuid.uuid4()) for _ in range(100)]
+    for n in range(rows):
+        record = {
+            "client_id": client_ids[n % len(client_ids)],
+            "amount": f"{(n % 5000) + 1}.50",
+            "method": "transfer",
+            "transaction_ref": f"BENCH-{uuid.uuid4().hex}",
+        }
+        sys.stdout.write(json.dumps(record) + "\n")
+
+
+async def run(args):
+    fmt = args.format or detect_format(args.path)
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        result = await PaymentImportService(session).import_stream(
+            read_file(args.path), fmt
+        )
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"received={result.received} imported={result.imported} "
+        f"failed={result.failed} in {elapsed:.2f}s "
+        f"({result.received / elapsed:,.0f} rows/s)"
+    )
+    if args.errors and result.errors:
+        with open(args.errors, "w") as f:
+            for error in result.errors:
+                f.write(error.model_dump_json() + "\n")
+        suffix = " (truncated)" if result.errors_truncated else ""
+        print(f"{len(result.errors)} errors written to {args.errors}{suffix}")
+    else:
+        for error in result.errors[:20]:
+            print(f"  line {error.line}: {error.error}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", nargs="?")
+    parser.add_argument("--format", choices=["ndjson", "csv"])
+    parser.add_argument("--errors", help="Write the error report to this file")
+    parser.add_argument(
+        "--generate", type=int, metavar="ROWS", help="Print a synthetic NDJSON file"
+    )
+    args = parser.parse_args()
+    if args.generate:
+        generate(args.generate)
+    elif args.path:
+        asyncio.run(run(args))
+    else:
+        parser.error("path is required")
@@ -0,0 +1,133 @@
+"""
+Da de alta usuarios de consola en lote desde un CSV.
+
+Usa el mismo servicio que `POST /api/v1/users/bulk`: las contraseñas se
+hashean en paralelo en un pool de procesos (`--workers`, por defecto todos
+los cores) y cada bloque de hasta 1000 usuarios se inserta con una sola
+sentencia. Los emails ya registrados se reportan y no se modifican. Escribe
+directamente en la base configurada en `.env`.
+
+Columnas del CSV (con encabezado): `email`, `password`, `full_name`,
+`roles` (separados por `;`). Si falta la contraseña y se pasa
+`--generate-passwords`, se genera una aleatoria y se escribe en `--output`.
+
+Uso:
+    python scripts/provision_users.py usuarios.csv --roles viewer
+    python scripts/provision_users.py usuarios.csv --generate-passwords --output altas.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import os
+import secrets
+import sys
+import time
+
+from pydantic import ValidationError
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from app.core import security  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import AsyncSessionLocal  # noqa: E402
+from app.schemas.users import MAX_BULK_USERS, UserCreate  # noqa: E402
+from app.services.user_service import UserService  # noqa: E402
+
+
+def read_users(args) -> tuple[list[tuple[int, UserCreate]], int]:
+    users = []
+    failed = 0
+    with open(args.path, newline="", encoding="utf-8-sig") as f:
+        for line_no, row in enumerate(csv.DictReader(f), start=2):
+            password = (row.get("password") or "").strip()
+            if not password and args.generate_passwords:
+                password = secrets.token_urlsafe(12)
+            roles = [r.strip() for r in (row.get("roles") or "").split(";")]
+            try:
+                user = UserCreate(
+                    email=(row.get("email") or "").strip(),
+                    password=password,
+                    full_name=(row.get("full_name") or "").strip() or None,
+                    roles=[r for r in roles if r] or args.roles,
+                )
+            except ValidationError as e:
+                failed += 1
+                errors = "; ".join(
+                    f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                    for err in e.errors()
+                )
+                print(f"  line {line_no}: {errors}")
+                continue
+            users.append((line_no, user))
+    return users, failed
+
+
+async def run(args) -> int:
+    settings.PASSWORD_HASH_WORKERS = args.workers
+    settings.PASSWORD_HASH_MAX_PENDING = max(
+        settings.PASSWORD_HASH_MAX_PENDING, 4 * args.workers
+    )
+    users, failed = read_users(args)
+
+    output = output_file = None
+    if args.output:
+        output_file = open(args.output, "w", newline="", encoding="utf-8")
+        output = csv.writer(output_file)
+        output.writerow(["line", "email", "status", "user_id", "password"])
+
+    created = skipped = 0
+    start = time.perf_counter()
+    try:
+        for offset in range(0, len(users), MAX_BULK_USERS):
+            batch = users[offset : offset + MAX_BULK_USERS]
+            async with AsyncSessionLocal() as session:
+                result = await UserService(session).create_users_bulk(
+                    [user for _, user in batch]
+                )
+            created += result.created
+            skipped += result.skipped
+            for (line_no, user), outcome in zip(batch, result.results):
+                if outcome.status != "created":
+                    print(f"  line {line_no}: {outcome.email} {outcome.status}")
+                if output:
+                    output.writerow(
+                        [
+                            line_no,
+                            outcome.email,
+                            outcome.status,
+                            outcome.user_id or "",
+                            user.password if outcome.status == "created" else "",
+                        ]
+                    )
+    finally:
+        security.shutdown_hash_executor()
+        if output_file:
+            output_file.close()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"created={created} skipped={skipped} invalid={failed} in {elapsed:.2f}s "
+        f"({len(users) / elapsed if elapsed else 0:,.0f} users/s, "
+        f"{args.workers} hash workers)"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path")
+    parser.add_argument(
+        "--roles",
+        type=lambda value: [r for r in value.split(",") if r],
+        default=[],
+        help="Comma-separated roles for rows without a roles column",
+    )
+    parser.add_argument("--generate-passwords", action="store_true")
+    parser.add_argument("--output", help="Write per-row outcomes to this CSV")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    if args.generate_passwords and not args.output:
+        parser.error("--generate-passwords requires --output")
+    sys.exit(asyncio.run(run(args)))
@@ -0,0 +1,55 @@
+"""
+Recalcula la tabla `gac.client_balances` desde `orders` y `payments`.
+
+Los agregados se mantienen incrementalmente en cada escritura; este comando
+sirve para poblarlos la primera vez y para reparar desviaciones. Con
+`--check` solo compara y lista los clientes cuyo agregado no coincide
+(código de salida 1 si hay diferencias), sin modificar nada.
+
+Uso:
+    python scripts/rebuild_client_balances.py --check
+    python scripts/rebuild_client_balances.py
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.getcwd())
+
+from app.core.database import AsyncSessionLocal  # noqa: E402
+from app.services.balance_service import BalanceService  # noqa: E402
+
+
+async def run(args) -> int:
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        service = BalanceService(session)
+        if not args.check:
+            await service.rebuild()
+            print(f"client_balances rebuilt in {time.perf_counter() - start:.2f}s")
+            return 0
+
+        mismatches = await service.check()
+
+    for mismatch in mismatches[: args.limit]:
+        print(f"{mismatch.client_id}")
+        print(f"  stored:   {mismatch.stored}")
+        print(f"  expected: {mismatch.expected}")
+    if len(mismatches) > args.limit:
+        print(f"... and {len(mismatches) - args.limit} more")
+    print(
+        f"{len(mismatches)} clients out of sync "
+        f"(checked in {time.perf_counter() - start:.2f}s)"
+    )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--check", action="store_true", help="Only report differences")
+    parser.add_argument("--limit", type=int, default=50, help="Mismatches to print")
+    sys.exit(asyncio.run(run(parser.parse_args())))